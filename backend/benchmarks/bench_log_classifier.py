@@ -0,0 +1,86 @@
+"""
+Microbenchmark: single-pass substring log classifier (each line lowercased once) vs the
+previous per-pattern scans.
+
+Run from backend/:  PYTHONPATH=src python benchmarks/bench_log_classifier.py
+"""
+
+import random
+import timeit
+
+from utils.log_classifier import classify_logs, PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID
+
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5mW"
+
+def legacy_classify(logs):
+    """The classification previously done inline by MempoolMonitorService."""
+    launch_kind = None
+    if any("Instruction: Create" in log for log in logs) and any(PUMP_FUN_PROGRAM_ID in log for log in logs):
+        launch_kind = "pump_create"
+    elif any("Instruction: Initialize2" in log for log in logs) and any(RAYDIUM_LIQUIDITY_POOL_V4_ID in log for log in logs):
+        launch_kind = "raydium_init"
+    elif any("initializemint" in log.lower() for log in logs):
+        launch_kind = "mint_init"
+
+    rug_reason = None
+    for log in logs:
+        if "withdraw liquidity" in log.lower():
+            rug_reason = "Liquidity Withdrawal"
+        elif "burn" in log.lower() and "mint" not in log.lower():
+            rug_reason = "Token Burn"
+        elif "close account" in log.lower():
+            rug_reason = "Account Closed"
+        if rug_reason:
+            break
+    return launch_kind, rug_reason
+
+def _transfer():
+    return [
+        "Program ComputeBudget111111111111111111111111111111 invoke [1]",
+        "Program ComputeBudget111111111111111111111111111111 success",
+        f"Program {TOKEN_PROGRAM} invoke [1]",
+        "Program log: Instruction: TransferChecked",
+        f"Program {TOKEN_PROGRAM} consumed 6200 of 200000 compute units",
+        f"Program {TOKEN_PROGRAM} success",
+    ]
+
+def _pump_create():
+    return [
+        f"Program {PUMP_FUN_PROGRAM_ID} invoke [1]",
+        "Program log: Instruction: Create",
+        f"Program {TOKEN_PROGRAM} invoke [2]",
+        "Program log: Instruction: InitializeMint2",
+        f"Program {TOKEN_PROGRAM} success",
+        "Program log: Instruction: MintTo",
+        f"Program {PUMP_FUN_PROGRAM_ID} consumed 120000 of 200000 compute units",
+        f"Program {PUMP_FUN_PROGRAM_ID} success",
+    ]
+
+def _rug():
+    return [
+        f"Program {RAYDIUM_LIQUIDITY_POOL_V4_ID} invoke [1]",
+        "Program log: Instruction: Withdraw liquidity",
+        f"Program {TOKEN_PROGRAM} invoke [2]",
+        "Program log: Instruction: Burn",
+        "Program log: Instruction: CloseAccount",
+        f"Program {RAYDIUM_LIQUIDITY_POOL_V4_ID} success",
+    ]
+
+def main():
+    random.seed(7)
+    # Mainnet-like mix: mostly token transfers, a few launches and liquidity events
+    events = [random.choices([_transfer, _pump_create, _rug], weights=[90, 5, 5])[0]() for _ in range(10000)]
+
+    mismatches = sum(
+        (classification.launch_kind, classification.rug_reason) != legacy_classify(logs)
+        for logs, classification in ((logs, classify_logs(logs)) for logs in events)
+    )
+
+    legacy = min(timeit.repeat(lambda: [legacy_classify(logs) for logs in events], number=5, repeat=5)) / 5
+    single_pass = min(timeit.repeat(lambda: [classify_logs(logs) for logs in events], number=5, repeat=5)) / 5
+    print(f"events: {len(events)}, result mismatches: {mismatches}")
+    print(f"legacy (per-pattern scans): {legacy * 1e6 / len(events):.2f} us/event")
+    print(f"single-pass:                {single_pass * 1e6 / len(events):.2f} us/event ({legacy / single_pass:.1f}x)")
+
+if __name__ == "__main__":
+    main()
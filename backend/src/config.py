@@ -15,7 +15,146 @@ DEXSCREENER_BASE_URL = "https://api.dexscreener.com/latest/dex"
 BIRDEYE_BASE_URL = "https://public-api.birdeye.so/public"
 LLM7_BASE_URL = "https://api.llm7.io/v1"
 JUPITER_API_BASE_URL = "https://quote-api.jup.ag/v6"
+JUPITER_PRICE_API_URL = "https://api.jup.ag/price/v2"
+
+# Max mints per bulk price request (Birdeye multi_price / Jupiter price v2 ids=)
+PRICE_BATCH_SIZE = int(os.getenv("PRICE_BATCH_SIZE", "100"))
 
 # Solana RPC URL
 SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
 SOLANA_WS_URL = os.getenv("SOLANA_WS_URL", "wss://api.mainnet-beta.solana.com/")
+# Comma-separated websocket endpoints subscribed concurrently by the mempool monitor
+# (first arrival of each signature wins); defaults to SOLANA_WS_URL alone
+SOLANA_WS_URLS = [url.strip() for url in os.getenv("SOLANA_WS_URLS", SOLANA_WS_URL).split(",") if url.strip()]
+
+# Mempool pipeline: worker count and per-lane queue capacity. Launch candidates are never
+# dropped (the websocket reader waits instead); other events drop the oldest when full.
+MEMPOOL_WORKERS = int(os.getenv("MEMPOOL_WORKERS", "4"))
+MEMPOOL_LAUNCH_QUEUE_SIZE = int(os.getenv("MEMPOOL_LAUNCH_QUEUE_SIZE", "1000"))
+MEMPOOL_EVENT_QUEUE_SIZE = int(os.getenv("MEMPOOL_EVENT_QUEUE_SIZE", "5000"))
+
+# Duplicate suppression windows (seconds) and size bounds: one launch transaction
+# mentions several subscribed programs and arrives once per subscription
+MEMPOOL_SIGNATURE_DEDUP_WINDOW = float(os.getenv("MEMPOOL_SIGNATURE_DEDUP_WINDOW", "120"))
+MEMPOOL_MINT_DEDUP_WINDOW = float(os.getenv("MEMPOOL_MINT_DEDUP_WINDOW", "900"))
+MEMPOOL_DEDUP_MAX_ENTRIES = int(os.getenv("MEMPOOL_DEDUP_MAX_ENTRIES", "200000"))
+
+# Gap-fill after every websocket endpoint was down: signatures of the launch programs are
+# paged back to the last processed slot and replayed at a bounded getTransaction rate
+MEMPOOL_BACKFILL_RATE = float(os.getenv("MEMPOOL_BACKFILL_RATE", "5"))
+MEMPOOL_BACKFILL_PAGE_SIZE = int(os.getenv("MEMPOOL_BACKFILL_PAGE_SIZE", "1000"))
+MEMPOOL_BACKFILL_MAX_PAGES = int(os.getenv("MEMPOOL_BACKFILL_MAX_PAGES", "5"))
+# Gap transactions older than this (seconds) are skipped: a launch that old is no snipe
+MEMPOOL_BACKFILL_MAX_AGE = float(os.getenv("MEMPOOL_BACKFILL_MAX_AGE", "120"))
+
+# Event bus defaults per subscriber: queued events (the oldest is dropped when full) and
+# events handled at once. Snipe analysis gets its own, smaller bound: stale launches are
+# worthless and each one runs a full RugCheck/AI/buy pipeline
+EVENT_BUS_QUEUE_SIZE = int(os.getenv("EVENT_BUS_QUEUE_SIZE", "256"))
+EVENT_BUS_CONCURRENCY = int(os.getenv("EVENT_BUS_CONCURRENCY", "2"))
+SNIPE_PIPELINE_QUEUE_SIZE = int(os.getenv("SNIPE_PIPELINE_QUEUE_SIZE", "50"))
+SNIPE_PIPELINE_CONCURRENCY = int(os.getenv("SNIPE_PIPELINE_CONCURRENCY", "4"))
+
+# Pool watcher: fraction of a held Raydium pool's quote reserve (SOL side) that must be
+# withdrawn within LIQUIDITY_DROP_WINDOW_SLOTS (~0.4s each) before a liquidity-drop event
+# fires; slower declines are ordinary selling and are left to the exit rules
+LIQUIDITY_DROP_THRESHOLD = float(os.getenv("LIQUIDITY_DROP_THRESHOLD", "0.3"))
+LIQUIDITY_DROP_WINDOW_SLOTS = int(os.getenv("LIQUIDITY_DROP_WINDOW_SLOTS", "10"))
+
+# Exit engine: bulk price poll period for held positions, and the minimum spacing of the
+# fresh price reads triggered by pool reserve updates
+EXIT_PRICE_POLL_SECONDS = float(os.getenv("EXIT_PRICE_POLL_SECONDS", "2"))
+EXIT_NUDGE_MIN_INTERVAL = float(os.getenv("EXIT_NUDGE_MIN_INTERVAL", "0.5"))
+
+# Positions whose wallet balance is read at once during the auto-trader's monitoring pass
+# (sells do not hold a slot, so a slow confirmation never delays other positions)
+POSITION_MONITOR_CONCURRENCY = int(os.getenv("POSITION_MONITOR_CONCURRENCY", "8"))
+
+# Max seconds to wait for security/OHLCV enrichment on latency-critical token lookups
+SNIPE_ENRICHMENT_DEADLINE = float(os.getenv("SNIPE_ENRICHMENT_DEADLINE", "1.5"))
+
+# Per-source timeouts (seconds) for the token list refresh; sources that miss it are skipped
+TOKEN_LIST_SOURCE_TIMEOUTS = {
+    "dexscreener": float(os.getenv("DEXSCREENER_LIST_TIMEOUT", "4")),
+    "birdeye": float(os.getenv("BIRDEYE_LIST_TIMEOUT", "4")),
+}
+# TTL for a token list merged from only some of its sources, so it is retried sooner
+TOKEN_LIST_PARTIAL_TTL = float(os.getenv("TOKEN_LIST_PARTIAL_TTL", "10"))
+
+# Interval (seconds) of the background token list refresher started in main.start_async_loop
+TOKEN_LIST_REFRESH_SECONDS = float(os.getenv("TOKEN_LIST_REFRESH_SECONDS", "30"))
+
+# Local OHLCV store (utils/ohlcv_store.py): seconds before a series is topped up from
+# Birdeye with the bars newer than its last stored bar, and size bounds
+OHLCV_REFRESH_SECONDS = float(os.getenv("OHLCV_REFRESH_SECONDS", "60"))
+OHLCV_MAX_BARS = int(os.getenv("OHLCV_MAX_BARS", "1500"))
+OHLCV_MAX_SERIES = int(os.getenv("OHLCV_MAX_SERIES", "2000"))
+
+# Shared cache (utils/cache.py): size bound and per-namespace TTLs in seconds
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+CACHE_TTLS = {
+    "token_overview": float(os.getenv("CACHE_TTL_TOKEN_OVERVIEW", "30")),
+    "price": float(os.getenv("CACHE_TTL_PRICE", "3")),
+    "security": float(os.getenv("CACHE_TTL_SECURITY", "300")),
+    "token_list": float(os.getenv("CACHE_TTL_TOKEN_LIST", "60")),
+    "token_metadata": float(os.getenv("CACHE_TTL_TOKEN_METADATA", "3600")),
+    "token_decimals": float(os.getenv("CACHE_TTL_TOKEN_DECIMALS", "86400")),
+    "ai_analysis": float(os.getenv("CACHE_TTL_AI_ANALYSIS", "120")),
+    "rugcheck": float(os.getenv("CACHE_TTL_RUGCHECK", "300")),
+}
+
+# Shared upstream rate limits (utils/rate_limiter.py): requests/second, burst size and
+# maximum concurrency per API. Concurrency adapts (AIMD) to 429s and slow responses.
+RATE_LIMITS = {
+    "birdeye": {
+        "hosts": ["public-api.birdeye.so"],
+        "rate": float(os.getenv("BIRDEYE_RATE_LIMIT", "10")),
+        "burst": float(os.getenv("BIRDEYE_RATE_BURST", "15")),
+        "max_concurrency": int(os.getenv("BIRDEYE_MAX_CONCURRENCY", "8")),
+    },
+    "dexscreener": {
+        "hosts": ["api.dexscreener.com"],
+        "rate": float(os.getenv("DEXSCREENER_RATE_LIMIT", "5")),
+        "burst": float(os.getenv("DEXSCREENER_RATE_BURST", "10")),
+        "max_concurrency": int(os.getenv("DEXSCREENER_MAX_CONCURRENCY", "4")),
+    },
+    "jupiter": {
+        "hosts": ["quote-api.jup.ag", "api.jup.ag"],
+        "rate": float(os.getenv("JUPITER_RATE_LIMIT", "10")),
+        "burst": float(os.getenv("JUPITER_RATE_BURST", "10")),
+        "max_concurrency": int(os.getenv("JUPITER_MAX_CONCURRENCY", "8")),
+    },
+    "rugcheck": {
+        "hosts": ["api.rugcheck.xyz"],
+        "rate": float(os.getenv("RUGCHECK_RATE_LIMIT", "3")),
+        "burst": float(os.getenv("RUGCHECK_RATE_BURST", "5")),
+        "max_concurrency": int(os.getenv("RUGCHECK_MAX_CONCURRENCY", "3")),
+    },
+    "llm7": {
+        "hosts": ["api.llm7.io"],
+        "rate": float(os.getenv("LLM7_RATE_LIMIT", "1")),
+        "burst": float(os.getenv("LLM7_RATE_BURST", "3")),
+        "max_concurrency": int(os.getenv("LLM7_MAX_CONCURRENCY", "2")),
+        "latency_target": 30.0,
+    },
+    "jito": {
+        "hosts": ["mainnet.block-engine.jito.wtf"],
+        "rate": float(os.getenv("JITO_RATE_LIMIT", "1")),
+        "burst": float(os.getenv("JITO_RATE_BURST", "5")),
+        "max_concurrency": int(os.getenv("JITO_MAX_CONCURRENCY", "2")),
+    },
+}
+
+# Shared HTTP connection pools (utils/http_clients.py), one per upstream host
+HTTP_POOLS = {
+    "birdeye": {"base_url": BIRDEYE_BASE_URL, "max_connections": 20, "max_keepalive": 10, "timeout": 10.0},
+    "dexscreener": {"base_url": DEXSCREENER_BASE_URL, "max_connections": 10, "max_keepalive": 5, "timeout": 10.0},
+    "jupiter_quote": {"base_url": JUPITER_API_BASE_URL, "max_connections": 10, "max_keepalive": 5, "timeout": 10.0},
+    "jupiter_price": {"base_url": "https://api.jup.ag", "max_connections": 10, "max_keepalive": 5, "timeout": 10.0},
+    "rugcheck": {"base_url": "https://api.rugcheck.xyz", "max_connections": 5, "max_keepalive": 3, "timeout": 10.0},
+    "llm7": {"base_url": LLM7_BASE_URL, "max_connections": 5, "max_keepalive": 2, "timeout": 30.0},
+    "jito": {"base_url": "https://mainnet.block-engine.jito.wtf", "max_connections": 5, "max_keepalive": 2, "timeout": 5.0},
+}
+# Keep-alive expiry for pooled connections, and how often idle pools are re-warmed (seconds)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "90"))
+HTTP_KEEPWARM_INTERVAL = float(os.getenv("HTTP_KEEPWARM_INTERVAL", "30"))
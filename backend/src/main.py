@@ -19,6 +19,9 @@ from services.trading_service import trading_service
 from services.wallet_service import wallet_service
 from services.ai_analysis import AIAnalysisService, ai_analysis_service
 from services.auto_trader import auto_trader_service
+from services.pool_watcher import pool_watcher_service
+from services.exit_engine import exit_engine
+from services.event_bus import event_bus, LIQUIDITY_DROP
 
 # Import Blueprints
 from routes.tokens import tokens_bp
@@ -31,6 +34,9 @@ from routes.auto_trader import auto_trader_bp
 from routes.analytics import analytics_bp
 from utils.responses import error_response
 from utils.db import init_db
+from utils.http_clients import http_clients
+from utils.lane_queue import BLOCK, DROP_OLDEST
+from config import SNIPE_PIPELINE_QUEUE_SIZE, SNIPE_PIPELINE_CONCURRENCY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -88,14 +94,15 @@ def start_async_loop():
 
     # Schedule background tasks
     # Access properties to initialize them within the loop context
-    _ = data_fetcher_service.http_client
-    _ = ai_analysis_service.http_client
     _ = trading_service.solana_client
-    _ = trading_service.http_client
     _ = wallet_service.solana_client
-    _ = wallet_service.http_client
 
+    # Open pooled upstream connections before the first trade needs them
+    background_loop.create_task(http_clients.start())
     background_loop.create_task(mempool_monitor_service.start_monitoring())
+    background_loop.create_task(pool_watcher_service.start())
+    background_loop.create_task(exit_engine.start())
+    background_loop.create_task(data_fetcher_service.start_background_refresh())
 
     # Start limit order checker
     async def limit_order_loop():
@@ -127,6 +134,8 @@ if __name__ == '__main__':
 
     data_fetcher_service.socketio = socketio
 
+    pool_watcher_service.socketio = socketio
+
     ai_analysis_service.socketio = socketio
     ai_analysis_service.data_fetcher_service = data_fetcher_service
 
@@ -137,9 +146,28 @@ if __name__ == '__main__':
     auto_trader_service.wallet_service = wallet_service
     auto_trader_service.post_init()
 
+    exit_engine.auto_trader = auto_trader_service
+    exit_engine.data_fetcher_service = data_fetcher_service
+
     # Setup callbacks for autonomous action
-    mempool_monitor_service.on_new_token(auto_trader_service.handle_new_token)
-    mempool_monitor_service.on_rugpull(auto_trader_service.handle_rugpull_alert)
+    mempool_monitor_service.on_new_token(
+        auto_trader_service.handle_new_token,
+        name="auto_trader.new_token",
+        max_queue=SNIPE_PIPELINE_QUEUE_SIZE,
+        concurrency=SNIPE_PIPELINE_CONCURRENCY
+    )
+    # Emergency exits for held positions must not be dropped: the publisher waits instead when this
+    # queue is full. Unresolved mempool-wide alerts (rarely ours) may be dropped under load so they
+    # can never back up detection.
+    mempool_monitor_service.on_held_rugpull(auto_trader_service.handle_rugpull_alert, name="auto_trader.held_rugpull", policy=BLOCK)
+    mempool_monitor_service.on_rugpull(auto_trader_service.handle_rugpull_alert, name="auto_trader.rugpull", policy=DROP_OLDEST)
+    # Held mints (and their pools) get dedicated log subscriptions so alerts resolve to a position
+    auto_trader_service.on_positions_changed(mempool_monitor_service.set_held_positions)
+    # Reserve streams of held pools: a liquidity pull exits like a rugpull alert
+    auto_trader_service.on_positions_changed(pool_watcher_service.set_held_positions)
+    event_bus.subscribe(LIQUIDITY_DROP, auto_trader_service.handle_rugpull_alert, name="auto_trader.liquidity_drop", policy=BLOCK)
+    # Reserve moves trigger an immediate exit-rule check at a fresh price
+    pool_watcher_service.on_reserve_update(exit_engine.nudge)
 
     # Update app.services
     app.services.update({
@@ -148,7 +176,9 @@ if __name__ == '__main__':
         "mempool": mempool_monitor_service,
         "data_fetcher": data_fetcher_service,
         "ai_analysis": ai_analysis_service,
-        "auto_trader": auto_trader_service
+        "auto_trader": auto_trader_service,
+        "pool_watcher": pool_watcher_service,
+        "exit_engine": exit_engine
     })
 
     # Start background asyncio services in a dedicated thread
@@ -4,6 +4,8 @@ import logging
 from flask import Blueprint, current_app, request
 from utils.responses import success_response, error_response
 from utils.db import get_recent_trades, get_trade_stats
+from utils.rate_limiter import rate_limiter, priority_context, PRIORITY_BACKGROUND
+from utils.http_clients import http_clients
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -12,59 +14,60 @@ analytics_bp = Blueprint('analytics_bp', __name__, url_prefix='/api/analytics')
 @analytics_bp.route('/dashboard', methods=['GET'])
 async def get_dashboard_data():
     """Get summarized data for the dashboard"""
-    try:
-        auto_trader = current_app.services['auto_trader']
-        wallet_service = current_app.services['wallet']
-        data_fetcher = current_app.services['data_fetcher']
+    with priority_context(PRIORITY_BACKGROUND):
+        try:
+            auto_trader = current_app.services['auto_trader']
+            wallet_service = current_app.services['wallet']
+            data_fetcher = current_app.services['data_fetcher']
 
-        # Get wallet info
-        wallet_info = await wallet_service.get_wallet_info()
+            # Get wallet info
+            wallet_info = await wallet_service.get_wallet_info()
 
-        # Get trending tokens
-        trending_tokens = await data_fetcher.get_all_tokens()
-        top_tokens = trending_tokens[:5] if trending_tokens else []
+            # Get trending tokens (top 5 by 24h volume from the sorted index)
+            token_table = await data_fetcher.get_token_table()
+            top_tokens = token_table.top('volume_24h', 5)
 
-        active_positions = list(auto_trader.owned_tokens.values())
+            active_positions = list(auto_trader.owned_tokens.values())
 
-        # Get real stats from DB
-        db_stats = get_trade_stats()
-        recent_trades = get_recent_trades(limit=10)
+            # Get real stats from DB
+            db_stats = get_trade_stats()
+            recent_trades = get_recent_trades(limit=10)
 
-        # Calculate PnL for active positions (optional/simplified)
-        current_active_pnl = 0.0
-        for pos in active_positions:
-            try:
-                # This could be slow if there are many positions, but usually it's few
-                token_data = await data_fetcher.get_token_by_address(pos['token_address'])
-                if token_data:
-                    current_value_sol = (pos['amount_tokens'] * token_data['price']) / (wallet_info.get('sol_price', 1) or 1)
-                    current_active_pnl += (current_value_sol - pos['buy_amount_sol'])
-            except Exception:
-                continue
+            # Calculate PnL for active positions (optional/simplified)
+            current_active_pnl = 0.0
+            prices = await data_fetcher.get_prices([pos['token_address'] for pos in active_positions])
+            for pos in active_positions:
+                try:
+                    price = prices.get(pos['token_address'])
+                    if price:
+                        current_value_sol = (pos['amount_tokens'] * price) / (wallet_info.get('sol_price', 1) or 1)
+                        current_active_pnl += (current_value_sol - pos['buy_amount_sol'])
+                except Exception:
+                    continue
 
-        stats = {
-            "totalProfit": db_stats.get('totalProfit', 0.0),
-            "totalTrades": db_stats.get('totalTrades', 0),
-            "totalBuys": db_stats.get('totalBuys', 0),
-            "totalSells": db_stats.get('totalSells', 0),
-            "successRate": db_stats.get('successRate', 0.0),
-            "rugsAvoided": db_stats.get('rugsAvoided', 0),
-            "activeTokens": len(active_positions),
-            "currentActivePnL": round(current_active_pnl, 4),
-            "solBalance": wallet_info.get('sol_balance', 0) if wallet_info else 0
-        }
+            stats = {
+                "totalProfit": db_stats.get('totalProfit', 0.0),
+                "totalTrades": db_stats.get('totalTrades', 0),
+                "totalBuys": db_stats.get('totalBuys', 0),
+                "totalSells": db_stats.get('totalSells', 0),
+                "successRate": db_stats.get('successRate', 0.0),
+                "rugsAvoided": db_stats.get('rugsAvoided', 0),
+                "activeTokens": len(active_positions),
+                "currentActivePnL": round(current_active_pnl, 4),
+                "solBalance": wallet_info.get('sol_balance', 0) if wallet_info else 0
+            }
 
-        response_data = {
-            "stats": stats,
-            "topTokens": top_tokens,
-            "recentTrades": recent_trades,
-            "activePositions": active_positions
-        }
+            response_data = {
+                "stats": stats,
+                "topTokens": top_tokens,
+                "recentTrades": recent_trades,
+                "activePositions": active_positions
+            }
 
-        return success_response(data=response_data)
-    except Exception as e:
-        logger.error(f"Error fetching dashboard data: {str(e)}")
-        return error_response('Failed to fetch dashboard data', details=str(e))
+            return success_response(data=response_data)
+        except Exception as e:
+            logger.error(f"Error fetching dashboard data: {str(e)}")
+            return error_response('Failed to fetch dashboard data', details=str(e))
 
 @analytics_bp.route('/transactions', methods=['GET'])
 async def get_transactions():
@@ -93,3 +96,24 @@ async def get_performance_metrics():
     except Exception as e:
         logger.error(f"Error fetching performance metrics: {str(e)}")
         return error_response('Failed to fetch performance metrics', details=str(e))
+
+@analytics_bp.route('/metrics', methods=['GET'])
+def get_system_metrics():
+    """Get internal performance counters (cache, request coalescing, mempool pipeline, event bus, pool watcher, exit engine, position monitoring, rate limits, HTTP pools)"""
+    try:
+        data_fetcher = current_app.services['data_fetcher']
+        mempool = current_app.services['mempool']
+        metrics = {
+            "dataFetcher": data_fetcher.get_stats(),
+            "mempool": mempool.get_stats(),
+            "eventBus": mempool.event_bus.get_stats(),
+            "poolWatcher": current_app.services['pool_watcher'].get_stats() if 'pool_watcher' in current_app.services else None,
+            "exitEngine": current_app.services['exit_engine'].get_stats() if 'exit_engine' in current_app.services else None,
+            "autoTrader": current_app.services['auto_trader'].get_stats(),
+            "rateLimits": rate_limiter.get_stats(),
+            "httpPools": http_clients.get_stats()
+        }
+        return success_response(data=metrics)
+    except Exception as e:
+        logger.error(f"Error fetching system metrics: {str(e)}")
+        return error_response('Failed to fetch system metrics', details=str(e))
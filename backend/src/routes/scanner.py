@@ -3,7 +3,11 @@
 import logging
 from datetime import datetime
 from flask import Blueprint, request, current_app
+import numpy as np
 from utils.responses import success_response, error_response
+from utils.indicators import screen_mask, indicator_rows
+from utils.token_table import INDEXED_COLUMNS
+from utils.rate_limiter import priority_context, PRIORITY_BACKGROUND
 
 logger = logging.getLogger(__name__)
 scanner_bp = Blueprint('scanner_bp', __name__, url_prefix='/api/scanner')
@@ -14,24 +18,57 @@ async def scan_tokens():
     data_fetcher_service = current_app.services['data_fetcher']
     try:
         data = request.get_json() or {}
-        min_liquidity = data.get('minLiquidity', 10000)
-        max_age_hours = data.get('maxAge', 24)
-        min_volume = data.get('minVolume', 50000)
-        
-        all_tokens = await data_fetcher_service.get_all_tokens()
-        filtered_tokens = []
-        for token in all_tokens:
-            if (token.get('liquidity', 0) >= min_liquidity and
-                token.get('age_hours', 0) <= max_age_hours and
-                token.get('volume_24h', 0) >= min_volume):
-                filtered_tokens.append(token)
-        
+        range_criteria = {
+            'min_liquidity': data.get('minLiquidity', 10000),
+            'max_liquidity': data.get('maxLiquidity'),
+            'min_age_hours': data.get('minAge'),
+            'max_age_hours': data.get('maxAge', 24),
+            'min_volume': data.get('minVolume', 50000),
+            'max_volume': data.get('maxVolume'),
+            'min_buy_sell_ratio': data.get('minBuySellRatio'),
+            'max_buy_sell_ratio': data.get('maxBuySellRatio')
+        }
+
+        sort_by = data.get('sortBy')
+        if sort_by is not None and sort_by not in INDEXED_COLUMNS:
+            return error_response(f"Unsupported sortBy column. Use one of: {', '.join(INDEXED_COLUMNS)}", 400)
+        limit = data.get('limit')
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 0):
+            return error_response('limit must be a non-negative integer', 400)
+
+        # Vectorized filter over the columnar snapshot; identical criteria are served from its cache
+        token_table = await data_fetcher_service.get_token_table()
+        filtered_tokens = token_table.select({
+            'liquidity': (range_criteria['min_liquidity'], range_criteria['max_liquidity']),
+            'age_hours': (range_criteria['min_age_hours'], range_criteria['max_age_hours']),
+            'volume_24h': (range_criteria['min_volume'], range_criteria['max_volume']),
+            'buy_sell_ratio': (range_criteria['min_buy_sell_ratio'], range_criteria['max_buy_sell_ratio'])
+        }, sort=sort_by, descending=data.get('sortOrder', 'desc') != 'asc', limit=limit)
+
+        # Optional technical-indicator screening, computed for all matches in one batch
+        indicator_criteria = {
+            'max_vwap_ratio': data.get('maxVwapRatio'),
+            'max_rsi': data.get('maxRsi'),
+            'min_volume_zscore': data.get('minVolumeZScore'),
+            'min_momentum': data.get('minMomentum')
+        }
+        with_indicators = data.get('withIndicators', False)
+        if filtered_tokens and (with_indicators or any(value is not None for value in indicator_criteria.values())):
+            addresses = [token['address'] for token in filtered_tokens]
+            with priority_context(PRIORITY_BACKGROUND):
+                indicators = await data_fetcher_service.get_indicators(addresses)
+            prices = np.fromiter((token.get('price') or np.nan for token in filtered_tokens), dtype=np.float64, count=len(filtered_tokens))
+            mask = screen_mask(prices, indicators, indicator_criteria).tolist()
+            rows = indicator_rows(addresses, indicators) if with_indicators else {}
+            filtered_tokens = [
+                {**token, 'indicators': rows[token['address']]} if with_indicators else token
+                for token, keep in zip(filtered_tokens, mask) if keep
+            ]
+
         response_data = {
             'tokens': filtered_tokens,
             'scan_criteria': {
-                'min_liquidity': min_liquidity,
-                'max_age_hours': max_age_hours,
-                'min_volume': min_volume
+                key: value for key, value in {**range_criteria, **indicator_criteria}.items() if value is not None
             },
             'total_found': len(filtered_tokens)
         }
@@ -4,17 +4,40 @@ import logging
 from datetime import datetime
 from flask import Blueprint, request, current_app
 from utils.responses import success_response, error_response
+from utils.token_table import TokenTable, INDEXED_COLUMNS
 
 logger = logging.getLogger(__name__)
 tokens_bp = Blueprint('tokens_bp', __name__, url_prefix='/api/tokens')
 
 @tokens_bp.route('/', methods=['GET'])
 async def get_tokens():
-    """Get list of tokens"""
+    """
+    Get list of tokens.
+    Optional query params: sort (an indexed column), order (asc/desc), limit, and
+    min_<column>/max_<column> ranges on indexed columns, e.g.
+    ?sort=volume_24h&limit=20&max_age_hours=6
+    """
     data_fetcher_service = current_app.services['data_fetcher']
     try:
-        tokens = await data_fetcher_service.get_all_tokens()
-        return success_response(data=tokens, count=len(tokens))
+        criteria = {
+            column: (request.args.get(f'min_{column}', type=float), request.args.get(f'max_{column}', type=float))
+            for column in INDEXED_COLUMNS
+        }
+        sort = request.args.get('sort')
+        limit = request.args.get('limit')
+        if limit is not None:
+            if not limit.isdecimal():
+                return error_response('limit must be a non-negative integer', 400)
+            limit = int(limit)
+        if sort or limit is not None or TokenTable.criteria_key(criteria):
+            if sort and sort not in INDEXED_COLUMNS:
+                return error_response(f"Unsupported sort column. Use one of: {', '.join(INDEXED_COLUMNS)}", 400)
+            token_table = await data_fetcher_service.get_token_table()
+            tokens = token_table.select(criteria, sort=sort, descending=request.args.get('order', 'desc') != 'asc', limit=limit)
+        else:
+            tokens = await data_fetcher_service.get_all_tokens()
+        snapshot = data_fetcher_service.get_token_snapshot()
+        return success_response(data=tokens, count=len(tokens), snapshot_age_seconds=snapshot['age_seconds'])
     except Exception as e:
         logger.error(f"Error fetching tokens: {str(e)}")
         return error_response('Failed to fetch tokens', details=e)
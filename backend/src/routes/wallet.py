@@ -3,6 +3,7 @@
 import logging
 from flask import Blueprint, current_app
 from utils.responses import success_response, error_response
+from utils.rate_limiter import priority_context, PRIORITY_BACKGROUND
 
 logger = logging.getLogger(__name__)
 wallet_bp = Blueprint('wallet_bp', __name__, url_prefix='/api/wallet')
@@ -12,7 +13,8 @@ async def get_wallet_balance():
     """Get wallet balance"""
     wallet_service = current_app.services['wallet']
     try:
-        balance_data = await wallet_service.get_wallet_balance()
+        with priority_context(PRIORITY_BACKGROUND):
+            balance_data = await wallet_service.get_wallet_balance()
         return success_response(data=balance_data)
     except Exception as e:
         logger.error(f"Error fetching wallet balance: {str(e)}")
@@ -6,6 +6,9 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from config import LLM7_BASE_URL, LLM7_API_KEY
+from utils.cache import shared_cache
+from utils.rate_limiter import rate_limiter
+from utils.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -15,23 +18,26 @@ class AIAnalysisService:
     Integrates with LLM7 API and provides comprehensive token analysis
     """
     
-    def __init__(self, socketio=None, data_fetcher_service=None):
+    def __init__(self, socketio=None, data_fetcher_service=None, cache=None):
         self.llm7_base_url = LLM7_BASE_URL
         self.llm7_api_key = LLM7_API_KEY
         self.socketio = socketio
         self.data_fetcher_service = data_fetcher_service
-        self._http_client = None
+        self.cache = cache if cache is not None else shared_cache
 
     @property
     def http_client(self):
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient()
-        return self._http_client
+        return http_clients.client_for(self.llm7_base_url)
     
     async def analyze_token_with_llm7(self, token_address: str) -> Dict:
         """
         Analyze token using LLM7 API
+        Successful LLM analyses are cached; fallback analyses are not.
         """
+        cached_analysis = self.cache.get("ai_analysis", token_address)
+        if cached_analysis is not None:
+            return cached_analysis
+
         try:
             if self.data_fetcher_service:
                 token_data = await self.data_fetcher_service.get_token_by_address(token_address)
@@ -68,14 +74,19 @@ class AIAnalysisService:
                 "Authorization": f"Bearer {self.llm7_api_key}"
             }
 
-            response = await self.http_client.post(f"{self.llm7_base_url}/chat/completions", json=payload, headers=headers)
+            url = f"{self.llm7_base_url}/chat/completions"
+            async with rate_limiter.limit(url) as slot:
+                response = await self.http_client.post(url, json=payload, headers=headers)
+                slot.record(response.status_code)
             response.raise_for_status()
             llm_response = response.json()
             
             if llm_response and llm_response.get('choices') and llm_response['choices'][0].get('message'):
                 analysis_content = llm_response['choices'][0]['message']['content']
                 logger.info(f"LLM7 analysis successful for {token_address}")
-                return self._parse_llm_analysis(analysis_content)
+                analysis = self._parse_llm_analysis(analysis_content)
+                self.cache.set("ai_analysis", token_address, analysis)
+                return analysis
             else:
                 logger.error(f"Invalid response from LLM7 API: {llm_response}")
                 return self._create_fallback_analysis(token_data)
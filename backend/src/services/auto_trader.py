@@ -1,15 +1,23 @@
 import logging
 import asyncio
-import httpx
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import json
 import os
+import numpy as np
 from utils.db import save_position, remove_position, get_active_positions, increment_rugs_avoided
+from utils.cache import shared_cache
+from utils.rate_limiter import rate_limiter, priority_context, PRIORITY_TRADE
+from utils.http_clients import http_clients
+from utils.indicators import screen_mask
+from utils.histogram import LatencyHistogram
+from config import SNIPE_ENRICHMENT_DEADLINE, POSITION_MONITOR_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
 CONFIG_FILE = 'auto_trader_config.json'
+EMERGENCY_EXIT = "rugpull_emergency_exit"
 
 class AutoTraderService:
     """
@@ -27,14 +35,13 @@ class AutoTraderService:
         self.trade_loop_task = None
         self.background_loop = None
         self.owned_tokens: Dict[str, Dict] = {}
+        self._position_listeners = []
+        self._position_locks: Dict[str, asyncio.Lock] = {}
+        self._monitor_tasks: Dict[str, asyncio.Task] = {} # Position -> evaluation started by a monitoring pass
+        self.position_latency = LatencyHistogram([10, 50, 100, 250, 500, 1000, 2500, 5000, 15000, 60000])
+        self.monitor_stats = {"passes": 0, "evaluated": 0, "skipped_busy": 0, "errors": 0, "unknown_balance": 0}
         self.config = self._load_config()
-        self._http_client = None
-
-    @property
-    def http_client(self):
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient()
-        return self._http_client
+        self.cache = shared_cache
 
     def set_loop(self, loop):
         self.background_loop = loop
@@ -45,6 +52,29 @@ class AutoTraderService:
         db_positions = get_active_positions()
         self.owned_tokens = {p['token_address']: p for p in db_positions}
         logger.info(f"Loaded {len(self.owned_tokens)} active positions from DB.")
+        self._positions_changed()
+
+    def on_positions_changed(self, callback):
+        """
+        Registers `callback({mint: [pool accounts]})`, called with the full held set whenever
+        a position is opened or closed (and once with the current set).
+        """
+        self._position_listeners.append(callback)
+        callback(self.held_positions())
+
+    def held_positions(self) -> Dict[str, List[str]]:
+        return {
+            token_address: [pool for pool in (details.get('metadata', {}).get('pool_address'),) if pool]
+            for token_address, details in self.owned_tokens.items()
+        }
+
+    def _positions_changed(self):
+        held = self.held_positions()
+        for callback in self._position_listeners:
+            try:
+                callback(held)
+            except Exception as e:
+                logger.error(f"AutoTrader: Error in position listener: {e}")
 
     def _load_config(self) -> Dict:
         if os.path.exists(CONFIG_FILE):
@@ -130,140 +160,276 @@ class AutoTraderService:
             logger.info("AutoTrader: Trade loop task cancelled.")
         finally:
             self.trading_enabled = False
+            # Evaluations started by the last pass stop with the loop that started them
+            for task in list(self._monitor_tasks.values()):
+                task.cancel()
 
     async def _scan_and_buy(self):
         logger.info("AutoTrader: Scanning for new tokens...")
         try:
-            all_tokens = await self.data_fetcher_service.get_all_tokens()
-            
+            token_table = await self.data_fetcher_service.get_token_table()
+
             # Robust defaults for filtering if missing from config
             min_liq = self.config.get("min_liquidity", 5000)
             max_liq = self.config.get("max_liquidity", float('inf'))
             max_age = self.config.get("max_age_hours", 24)
 
-            for token in all_tokens:
-                liquidity = token.get('liquidity', 0)
-                age = token.get('age_hours', 0)
-
-                if (liquidity < min_liq or liquidity > max_liq or age > max_age):
-                    logger.debug(f"AutoTrader: Skipping {token.get('symbol')} - Liq: {liquidity}, Age: {age}")
-                    continue
-
-                if token['address'] in self.owned_tokens:
-                    continue
+            matches = token_table.select({
+                'liquidity': (min_liq, max_liq),
+                'age_hours': (None, max_age)
+            })
+            logger.debug(f"AutoTrader: {len(matches)}/{len(token_table)} tokens match liquidity and age filters.")
+            candidates = [token for token in matches if token['address'] not in self.owned_tokens]
 
-                await self._analyze_and_buy(token)
+            for token in await self._screen_candidates(candidates):
+                with priority_context(PRIORITY_TRADE):
+                    await self._analyze_and_buy(token)
 
         except Exception as e:
             logger.error(f"AutoTrader: Error during scan and buy: {e}")
 
+    def _screening_criteria(self) -> Dict[str, Optional[float]]:
+        return {
+            "max_vwap_ratio": 1.5 if self.config.get("use_vwap_filter") else None, # Don't buy if price > 1.5x of 24h VWAP
+            "max_rsi": self.config.get("max_rsi"),
+            "min_volume_zscore": self.config.get("min_volume_zscore"),
+            "min_momentum": self.config.get("min_momentum")
+        }
+
+    async def _screen_candidates(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        Screens all scan candidates against the technical-indicator filters in one
+        batched computation, before any per-token AI analysis.
+        """
+        criteria = self._screening_criteria()
+        if not candidates or all(value is None for value in criteria.values()):
+            return candidates
+
+        addresses = [token['address'] for token in candidates]
+        indicators = await self.data_fetcher_service.get_indicators(addresses)
+        prices = np.fromiter((token.get('price') or np.nan for token in candidates), dtype=np.float64, count=len(candidates))
+        mask = screen_mask(prices, indicators, criteria)
+
+        passed = [token for token, keep in zip(candidates, mask.tolist()) if keep]
+        logger.info(f"AutoTrader: {len(passed)}/{len(candidates)} candidates passed indicator screening.")
+        return passed
+
     async def _monitor_and_sell(self):
-        tokens_to_remove = []
-        for token_address, details in self.owned_tokens.items():
+        """
+        Periodic pass over all positions: reconciles balances with the wallet and applies the
+        exit rules at the latest bulk price. Price-driven exits normally fire earlier from the
+        exit engine; this pass is the reconciliation and fallback path.
+
+        Each position is evaluated in its own tracked task that the pass does not await, so a
+        slow sell confirmation holds up neither the other positions nor the trade loop. Wallet
+        reads share POSITION_MONITOR_CONCURRENCY slots while sells run outside them, and a
+        position that is still being evaluated or sold is skipped.
+        """
+        # One bulk price request for all positions instead of a full enrichment per token
+        prices = await self.data_fetcher_service.get_prices(list(self.owned_tokens))
+        rpc_slots = asyncio.Semaphore(POSITION_MONITOR_CONCURRENCY)
+
+        async def monitor(token_address: str):
+            started_at = time.monotonic()
             try:
+                await self.evaluate_position(token_address, prices.get(token_address),
+                                             refresh_balance=True, wait=False, rpc_slots=rpc_slots)
+                self.monitor_stats["evaluated"] += 1
+            except Exception as e:
+                self.monitor_stats["errors"] += 1
+                logger.error(f"AutoTrader: Error monitoring {token_address}: {e}")
+            finally:
+                self.position_latency.record(time.monotonic() - started_at)
+                self._monitor_tasks.pop(token_address, None)
+
+        for token_address in list(self.owned_tokens):
+            running = self._monitor_tasks.get(token_address)
+            if (running is not None and not running.done()) or self.is_position_busy(token_address):
+                self.monitor_stats["skipped_busy"] += 1
+                continue
+            self._monitor_tasks[token_address] = asyncio.create_task(monitor(token_address))
+        self.monitor_stats["passes"] += 1
+
+    async def _read_balance(self, token_address: str, rpc_slots: Optional[asyncio.Semaphore] = None) -> Optional[float]:
+        """
+        Reads the wallet balance of a position; None if the read failed (unknown, not empty).
+        """
+        if rpc_slots is None:
+            balance = await self.wallet_service.get_token_balance(token_address, default=None)
+        else:
+            async with rpc_slots:
+                balance = await self.wallet_service.get_token_balance(token_address, default=None)
+        if balance is None:
+            self.monitor_stats["unknown_balance"] += 1
+            logger.warning(f"AutoTrader: Could not read the balance of {token_address}; using the recorded amount.")
+        return balance
+
+    def _position_lock(self, token_address: str) -> asyncio.Lock:
+        lock = self._position_locks.get(token_address)
+        if lock is None:
+            lock = self._position_locks[token_address] = asyncio.Lock()
+        return lock
+
+    def is_position_busy(self, token_address: str) -> bool:
+        """
+        True while the position is being evaluated or sold.
+        """
+        lock = self._position_locks.get(token_address)
+        return lock is not None and lock.locked()
+
+    async def _close_position(self, token_address: str):
+        self.owned_tokens.pop(token_address, None)
+        self._position_locks.pop(token_address, None)
+        self._positions_changed()
+        await asyncio.to_thread(remove_position, token_address)
+
+    def _check_exit(self, details: Dict, current_price: float,
+                    current_balance: float) -> Optional[Tuple[str, float, Optional[float]]]:
+        """
+        Applies the exit rules in order (take-profit tiers, trailing stop, fixed stop) and
+        returns (reason, amount to sell, take-profit tier), or None to hold. The tier
+        (target_x, None for stops) is not recorded here; the caller does that once it sold.
+        """
+        # 0. A rugpull emergency sell that failed is retried before anything else
+        if details.get('metadata', {}).get('emergency_exit_pending'):
+            return EMERGENCY_EXIT, current_balance, None
+
+        buy_price = details['buy_price']
+
+        # 1. Check Multiple Take-Profit Tiers
+        tp_tiers = self.config.get("take_profit_tiers", [])
+        hit_tiers = details.get('metadata', {}).get('hit_tp_tiers', [])
+
+        for tier in tp_tiers:
+            target_x = tier['target_x']
+            if target_x not in hit_tiers and current_price >= buy_price * target_x:
+                # Calculate how much of the INITIAL position to sell
+                # For simplicity, we sell the percentage of CURRENT balance if it's the last tier,
+                # otherwise we sell the specified percentage of the INITIAL balance.
+                initial_amount = details.get('initial_amount_tokens', details['amount_tokens'])
+                sell_percentage = tier['sell_percentage']
+
+                if sell_percentage >= 1.0:
+                    sell_amount = current_balance
+                else:
+                    sell_amount = initial_amount * sell_percentage
+                    # Ensure we don't try to sell more than we have
+                    sell_amount = min(sell_amount, current_balance)
+
+                return f"take_profit_{target_x}x", sell_amount, target_x # Only process one tier at a time
+
+        # 2. Check Trailing Stop-Loss
+        tsl_threshold = details.get('highest_price', current_price) * (1 - self.config.get("trailing_stop_loss_percentage", 0.10))
+        if current_price <= tsl_threshold:
+            return "trailing_stop_loss", current_balance, None
+
+        # 3. Check Fixed Stop-Loss
+        sl_threshold = buy_price * (1 - self.config["stop_loss_percentage"])
+        if current_price <= sl_threshold:
+            return "stop_loss", current_balance, None
+        return None
+
+    async def evaluate_position(self, token_address: str, current_price: Optional[float],
+                                refresh_balance: bool = False, wait: bool = True,
+                                rpc_slots: Optional[asyncio.Semaphore] = None) -> Optional[str]:
+        """
+        Applies the exit rules to one position at `current_price` and sells if one fires.
+        Returns the exit reason, or None if the position is held.
+
+        With refresh_balance the wallet balance is read first (and an empty position is
+        closed; a failed read counts as unknown and keeps the recorded balance). Otherwise
+        the recorded balance is used and the wallet is only read once an exit fires, so
+        price ticks cost no RPC calls. Evaluations of one position are serialized; with
+        wait=False a position that is already being evaluated is skipped. `rpc_slots`
+        bounds the wallet reads only, never the sell. A take-profit tier counts as hit only
+        once its sell succeeded; a failed sell raises RuntimeError and leaves the position
+        unchanged. A position whose rugpull emergency sell failed is sold in full on the
+        next evaluation, price or not.
+        """
+        lock = self._position_lock(token_address)
+        if not wait and lock.locked():
+            return None
+        async with lock:
+            details = self.owned_tokens.get(token_address)
+            if details is None:
+                return None
+
+            current_balance = details.get('amount_tokens', 0)
+            if refresh_balance:
                 # Real balance check
-                current_balance = await self.wallet_service.get_token_balance(token_address)
-                if current_balance <= 0:
-                    tokens_to_remove.append(token_address)
-                    continue
-
-                # Sync balance if it changed
-                if abs(current_balance - details.get('amount_tokens', 0)) > 0.000001:
-                    details['amount_tokens'] = current_balance
-                    await asyncio.to_thread(save_position, details)
+                wallet_balance = await self._read_balance(token_address, rpc_slots)
+                if wallet_balance is not None:
+                    if wallet_balance <= 0:
+                        await self._close_position(token_address)
+                        return None
+                    current_balance = wallet_balance
+
+                    # Sync balance if it changed
+                    if abs(current_balance - details.get('amount_tokens', 0)) > 0.000001:
+                        details['amount_tokens'] = current_balance
+                        await asyncio.to_thread(save_position, details)
+
+            emergency = details.get('metadata', {}).get('emergency_exit_pending', False)
+            if not current_price and not emergency:
+                return None
+
+            # Update highest price for trailing stop-loss
+            if current_price and current_price > details.get('highest_price', 0):
+                details['highest_price'] = current_price
+                await asyncio.to_thread(save_position, details)
+                logger.info(f"AutoTrader: New highest price for {details['token_symbol']}: {current_price}")
+
+            decision = self._check_exit(details, current_price, current_balance)
+            if decision is None:
+                return None
+            reason, sell_amount, tier = decision
+
+            if not refresh_balance:
+                # Size the exit against the real balance
+                wallet_balance = await self._read_balance(token_address, rpc_slots)
+                if wallet_balance is not None:
+                    if wallet_balance <= 0:
+                        await self._close_position(token_address)
+                        return None
+                    sell_amount = wallet_balance if sell_amount >= current_balance else min(sell_amount, wallet_balance)
+                    current_balance = wallet_balance
+
+            if sell_amount <= 0:
+                return None
 
-                current_token_data = await self.data_fetcher_service.get_token_by_address(token_address)
-                if not current_token_data: continue
+            jito_tip_lamports = int(self.config.get("jito_tip_sol", 0.001) * 10**9)
+            with priority_context(PRIORITY_TRADE):
+                sell_result = await self.trading_service.execute_sell_order(
+                    token_address=token_address,
+                    amount_tokens=sell_amount,
+                    slippage=100 if emergency else self.config["slippage"],
+                    jito_tip=jito_tip_lamports
+                )
+            if not sell_result.get("success"):
+                raise RuntimeError(f"{reason} sell failed: {sell_result.get('error', 'unknown error')}")
+            if emergency:
+                await asyncio.to_thread(increment_rugs_avoided)
 
-                current_price = current_token_data['price']
-                buy_price = details['buy_price']
+            if tier is not None:
+                details.setdefault('metadata', {}).setdefault('hit_tp_tiers', []).append(tier)
 
-                # Update highest price for trailing stop-loss
-                if current_price > details.get('highest_price', 0):
-                    details['highest_price'] = current_price
-                    await asyncio.to_thread(save_position, details)
-                    logger.info(f"AutoTrader: New highest price for {details['token_symbol']}: {current_price}")
-
-                should_sell = False
-                sell_amount = 0
-                reason = ""
-
-                # 1. Check Multiple Take-Profit Tiers
-                tp_tiers = self.config.get("take_profit_tiers", [])
-                hit_tiers = details.get('metadata', {}).get('hit_tp_tiers', [])
-
-                for tier in tp_tiers:
-                    target_x = tier['target_x']
-                    if target_x not in hit_tiers and current_price >= buy_price * target_x:
-                        should_sell = True
-                        reason = f"take_profit_{target_x}x"
-
-                        # Calculate how much of the INITIAL position to sell
-                        # For simplicity, we sell the percentage of CURRENT balance if it's the last tier,
-                        # otherwise we sell the specified percentage of the INITIAL balance.
-                        initial_amount = details.get('initial_amount_tokens', details['amount_tokens'])
-                        sell_percentage = tier['sell_percentage']
-
-                        if sell_percentage >= 1.0:
-                            sell_amount = current_balance
-                        else:
-                            sell_amount = initial_amount * sell_percentage
-                            # Ensure we don't try to sell more than we have
-                            sell_amount = min(sell_amount, current_balance)
-
-                        hit_tiers.append(target_x)
-                        if 'metadata' not in details: details['metadata'] = {}
-                        details['metadata']['hit_tp_tiers'] = hit_tiers
-                        break # Only process one tier at a time per loop
-
-                # 2. Check Trailing Stop-Loss
-                if not should_sell:
-                    tsl_threshold = details.get('highest_price', current_price) * (1 - self.config.get("trailing_stop_loss_percentage", 0.10))
-                    if current_price <= tsl_threshold:
-                        should_sell = True
-                        sell_amount = current_balance
-                        reason = "trailing_stop_loss"
-
-                # 3. Check Fixed Stop-Loss
-                if not should_sell:
-                    sl_threshold = buy_price * (1 - self.config["stop_loss_percentage"])
-                    if current_price <= sl_threshold:
-                        should_sell = True
-                        sell_amount = current_balance
-                        reason = "stop_loss"
-
-                if should_sell and sell_amount > 0:
-                    jito_tip_lamports = int(self.config.get("jito_tip_sol", 0.001) * 10**9)
-                    sell_result = await self.trading_service.execute_sell_order(
-                        token_address=token_address,
-                        amount_tokens=sell_amount,
-                        slippage=self.config["slippage"],
-                        jito_tip=jito_tip_lamports
-                    )
-                    if sell_result.get("success"):
-                        # If we sold everything, mark for removal
-                        if sell_amount >= current_balance * 0.99: # Account for precision
-                            tokens_to_remove.append(token_address)
-                        else:
-                            # Update remaining position
-                            details['amount_tokens'] = current_balance - sell_amount
-                            await asyncio.to_thread(save_position, details)
-
-                        if self.socketio:
-                            self.socketio.emit('auto_trade_event', {
-                                'type': 'sell',
-                                'token': details['token_symbol'],
-                                'reason': reason,
-                                'status': 'success',
-                                'amount': sell_amount
-                            })
+            # If we sold everything, close the position
+            if sell_amount >= current_balance * 0.99: # Account for precision
+                await self._close_position(token_address)
+            else:
+                # Update remaining position
+                details['amount_tokens'] = current_balance - sell_amount
+                await asyncio.to_thread(save_position, details)
 
-            except Exception as e:
-                logger.error(f"AutoTrader: Error monitoring {token_address}: {e}")
-        
-        for token_address in tokens_to_remove:
-            self.owned_tokens.pop(token_address, None)
-            await asyncio.to_thread(remove_position, token_address)
+            if self.socketio:
+                self.socketio.emit('auto_trade_event', {
+                    'type': 'sell',
+                    'token': details['token_symbol'],
+                    'reason': reason,
+                    'status': 'success',
+                    'amount': sell_amount
+                })
+            return reason
 
     async def handle_new_token(self, token_data: Dict):
         """Callback for newly detected tokens from mempool."""
@@ -292,7 +458,8 @@ class AutoTraderService:
                 return
 
         logger.info(f"AutoTrader: New token detected via mempool, analyzing {token_address}...")
-        await self._analyze_and_buy(token_data)
+        with priority_context(PRIORITY_TRADE):
+            await self._analyze_and_buy(token_data)
 
     async def _analyze_and_buy(self, token: Dict):
         token_address = token['address']
@@ -304,9 +471,8 @@ class AutoTraderService:
         # RugCheck.xyz Full API Integration
         try:
             logger.info(f"AutoTrader: Performing RugCheck for {token_address}...")
-            response = await self.http_client.get(f"https://api.rugcheck.xyz/v1/tokens/{token_address}/report")
-            if response.status_code == 200:
-                rug_report = response.json()
+            rug_report = await self._fetch_rugcheck_report(token_address)
+            if rug_report is not None:
                 score = rug_report.get('score', 0)
                 max_allowed_score = self.config.get("rugcheck_max_score", 5000)
 
@@ -314,8 +480,6 @@ class AutoTraderService:
                     logger.warning(f"AutoTrader: Skipping {token.get('symbol', token_address)} - RugCheck score ({score}) exceeds max allowed ({max_allowed_score}).")
                     return
                 logger.info(f"AutoTrader: RugCheck passed for {token_address} with score: {score}")
-            else:
-                logger.warning(f"AutoTrader: RugCheck API returned status {response.status_code}. Proceeding with caution.")
         except Exception as e:
             logger.error(f"AutoTrader: RugCheck failed for {token_address}: {e}")
 
@@ -384,9 +548,10 @@ class AutoTraderService:
                         "amount_tokens": token_balance,
                         "initial_amount_tokens": token_balance,
                         "purchase_time": datetime.now().isoformat(),
-                        "metadata": {"hit_tp_tiers": []}
+                        "metadata": {"hit_tp_tiers": [], "pool_address": token.get('pair_address')}
                     }
                     self.owned_tokens[token_address] = position_data
+                    self._positions_changed()
                     await asyncio.to_thread(save_position, position_data)
 
                     if self.socketio:
@@ -394,6 +559,27 @@ class AutoTraderService:
                 else:
                     logger.warning(f"AutoTrader: Buy executed for {token_address} but 0 balance detected after retries.")
 
+    async def _fetch_rugcheck_report(self, token_address: str) -> Optional[Dict]:
+        """
+        Fetches the RugCheck.xyz report for a token, using the shared cache.
+        Returns None if the API did not return a report.
+        """
+        cached_report = self.cache.get("rugcheck", token_address)
+        if cached_report is not None:
+            return cached_report
+
+        url = f"https://api.rugcheck.xyz/v1/tokens/{token_address}/report"
+        async with rate_limiter.limit(url) as slot:
+            response = await http_clients.client_for(url).get(url)
+            slot.record(response.status_code)
+        if response.status_code != 200:
+            logger.warning(f"AutoTrader: RugCheck API returned status {response.status_code}. Proceeding with caution.")
+            return None
+
+        rug_report = response.json()
+        self.cache.set("rugcheck", token_address, rug_report)
+        return rug_report
+
     async def _check_contract_risk(self, token_address: str) -> bool:
         """
         Performs basic contract risk analysis by scanning token metadata and on-chain indicators.
@@ -417,7 +603,7 @@ class AutoTraderService:
                     return False
 
             # Check for suspicious patterns in token metadata/details
-            token_details = await self.data_fetcher_service.get_token_by_address(token_address)
+            token_details = await self.data_fetcher_service.get_token_by_address(token_address, deadline=SNIPE_ENRICHMENT_DEADLINE)
             if token_details:
                 if token_details.get('dev_wallet_active'):
                     logger.warning(f"AutoTrader: Dev wallet still active/controlling for {token_address}")
@@ -433,21 +619,41 @@ class AutoTraderService:
         if not token_address or token_address not in self.owned_tokens:
             return
 
-        logger.warning(f"AutoTrader: Rugpull alert for {token_address}. Emergency sell!")
+        # Serialized with exit-rule evaluations so a position is never sold twice at once
+        async with self._position_lock(token_address):
+            if token_address not in self.owned_tokens:
+                return
+            logger.warning(f"AutoTrader: Rugpull alert for {token_address}. Emergency sell!")
 
-        details = self.owned_tokens[token_address]
-        sell_amount = await self.wallet_service.get_token_balance(token_address)
+            sell_amount = await self._read_balance(token_address)
+            if sell_amount is None:
+                # Unknown balance: sell what the position records rather than abandoning it
+                sell_amount = self.owned_tokens[token_address].get('amount_tokens', 0)
 
-        if sell_amount > 0:
-            sell_result = await self.trading_service.execute_sell_order(
-                token_address=token_address,
-                amount_tokens=sell_amount,
-                slippage=100
-            )
-            if sell_result.get("success"):
+            if sell_amount > 0:
+                with priority_context(PRIORITY_TRADE):
+                    sell_result = await self.trading_service.execute_sell_order(
+                        token_address=token_address,
+                        amount_tokens=sell_amount,
+                        slippage=100
+                    )
+                if not sell_result.get("success"):
+                    # Keep the position: the next monitoring pass or exit tick retries the sell
+                    details = self.owned_tokens[token_address]
+                    details.setdefault('metadata', {})['emergency_exit_pending'] = True
+                    await asyncio.to_thread(save_position, details)
+                    raise RuntimeError(f"Emergency sell failed: {sell_result.get('error', 'unknown error')}")
                 await asyncio.to_thread(increment_rugs_avoided)
 
-        self.owned_tokens.pop(token_address, None)
-        await asyncio.to_thread(remove_position, token_address)
+            await self._close_position(token_address)
+
+    def get_stats(self) -> Dict:
+        return {
+            "positions": len(self.owned_tokens),
+            "busy_positions": sum(1 for lock in self._position_locks.values() if lock.locked()),
+            "monitor_tasks": len(self._monitor_tasks),
+            "monitor": dict(self.monitor_stats),
+            "position_latency": self.position_latency.get_stats()
+        }
 
 auto_trader_service = AutoTraderService()
@@ -1,9 +1,18 @@
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
+import time
 import httpx
-from config import DEXSCREENER_BASE_URL, BIRDEYE_BASE_URL, BIRDEYE_API_KEY
+import numpy as np
+from config import DEXSCREENER_BASE_URL, BIRDEYE_BASE_URL, BIRDEYE_API_KEY, JUPITER_PRICE_API_URL, PRICE_BATCH_SIZE, OHLCV_REFRESH_SECONDS, TOKEN_LIST_SOURCE_TIMEOUTS, TOKEN_LIST_PARTIAL_TTL, TOKEN_LIST_REFRESH_SECONDS
+from utils.cache import shared_cache
+from utils.ohlcv_store import OHLCVSeries, OHLCVStore, interval_seconds
+from utils.indicators import OHLCVBatch, compute_indicators
+from utils.token_table import TokenTable
+from utils.single_flight import SingleFlight
+from utils.rate_limiter import rate_limiter, priority_context, PRIORITY_BACKGROUND
+from utils.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -12,38 +21,35 @@ class DataFetcherService:
     Service to fetch token data from various sources.
     """
 
-    def __init__(self, socketio=None):
+    def __init__(self, socketio=None, cache=None, ohlcv_store=None):
         self.socketio = socketio
-        self._http_client = None
-        self._cache = {} # {key: (data, timestamp)}
-        self._cache_ttl = 60 # 60 seconds TTL
-
-    def _get_from_cache(self, key: str) -> Optional[Any]:
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if datetime.now().timestamp() - timestamp < self._cache_ttl:
-                logger.debug(f"Cache hit for {key}")
-                return data
-            else:
-                del self._cache[key]
-        return None
-
-    def _save_to_cache(self, key: str, data: Any):
-        self._cache[key] = (data, datetime.now().timestamp())
-
-    @property
-    def http_client(self):
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=10.0)
-        return self._http_client
-
-    async def _request_with_retry(self, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
-        """Generic request with exponential backoff retry."""
+        self.cache = cache if cache is not None else shared_cache
+        self.ohlcv_store = ohlcv_store if ohlcv_store is not None else OHLCVStore()
+        self._ohlcv_flight = SingleFlight() # Coalesces upstream top-ups of the same OHLCV series
+        self._token_flight = SingleFlight() # Coalesces concurrent get_token_by_address misses
+        self._enrichment_flight = SingleFlight() # Coalesces security/OHLCV enrichment per address
+        self._price_flight = SingleFlight() # Coalesces identical bulk price batches
+        self.price_cache_hits = 0
+        self.price_cache_misses = 0
+        self.token_cache_hits = 0
+        self.token_deadline_loads = 0
+        self.refresh_task = None
+        self._token_snapshot = None # (tokens, refreshed_at_monotonic, refreshed_at_wall)
+        self._token_table: Optional[TokenTable] = None
+
+    async def _request_with_retry(self, method: str, url: str, priority: Optional[int] = None, **kwargs) -> Optional[httpx.Response]:
+        """
+        Generic request with exponential backoff retry.
+        Each attempt goes through the shared upstream rate limiter; `priority` defaults to
+        the lane set by the caller's priority_context.
+        """
         max_retries = 3
         retry_delay = 1
         for i in range(max_retries):
             try:
-                response = await self.http_client.request(method, url, **kwargs)
+                async with rate_limiter.limit(url, priority) as slot:
+                    response = await http_clients.client_for(url).request(method, url, **kwargs)
+                    slot.record(response.status_code)
                 response.raise_for_status()
                 return response
             except (httpx.RequestError, httpx.HTTPStatusError) as e:
@@ -175,7 +181,9 @@ class DataFetcherService:
                     'transactions_24h': transactions_24h,
                     'buy_sell_ratio': round(buy_sell_ratio, 2),
                     'top_holder_percentage': 0,
-                    'dev_wallet_active': False
+                    'dev_wallet_active': False,
+                    'pair_address': pair.get('pairAddress'),
+                    'dex_id': pair.get('dexId')
                 })
             except Exception as e:
                 logger.warning(f"Error processing Dexscreener pair: {e} - {pair}")
@@ -266,35 +274,133 @@ class DataFetcherService:
                     logger.warning(f"Error processing Birdeye token list item: {e} - {token_info}")
         return processed_tokens
 
-    async def fetch_real_time_data(self) -> List[Dict]:
+    async def _fetch_source_with_timeout(self, source: str, fetch) -> Optional[List[Dict]]:
         """
-        Fetches real-time token data from Dexscreener and Birdeye.
+        Awaits a token list source with its configured timeout.
+        Returns None if the source timed out, so callers can tell a slow source from an empty one.
         """
-        cache_key = "real_time_data"
-        cached_data = self._get_from_cache(cache_key)
-        if cached_data:
-            return cached_data
+        timeout = TOKEN_LIST_SOURCE_TIMEOUTS.get(source)
+        try:
+            return await asyncio.wait_for(fetch(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{source} token list did not respond within {timeout}s. Merging without it.")
+            return None
 
+    async def _fetch_token_list(self) -> Tuple[List[Dict], bool]:
+        """
+        Fetches and merges the token list from all sources, bypassing the cache.
+        Returns (tokens, is_partial).
+        """
         logger.info("Fetching real-time token data.")
-        
-        dexscreener_data = await self._fetch_from_dexscreener()
-        birdeye_data = await self._fetch_from_birdeye()
+
+        dexscreener_data, birdeye_data = await asyncio.gather(
+            self._fetch_source_with_timeout("dexscreener", self._fetch_from_dexscreener),
+            self._fetch_source_with_timeout("birdeye", self._fetch_from_birdeye)
+        )
 
         # Simple merge: prioritize Birdeye data if available, then Dexscreener
-        combined_data = {token['address']: token for token in dexscreener_data}
-        for token in birdeye_data:
+        combined_data = {token['address']: token for token in dexscreener_data or []}
+        for token in birdeye_data or []:
             combined_data[token['address']] = {**combined_data.get(token['address'], {}), **token}
-        
-        result = list(combined_data.values())
-        self._save_to_cache(cache_key, result)
+
+        return list(combined_data.values()), dexscreener_data is None or birdeye_data is None
+
+    async def fetch_real_time_data(self) -> List[Dict]:
+        """
+        Fetches real-time token data from Dexscreener and Birdeye concurrently.
+        A source that misses its timeout is left out of the merge, and the partial
+        result is cached with a shorter TTL.
+        """
+        cached_data = self.cache.get("token_list", "real_time_data")
+        if cached_data:
+            return cached_data
+
+        result, is_partial = await self._fetch_token_list()
+        self.cache.set("token_list", "real_time_data", result, ttl=TOKEN_LIST_PARTIAL_TTL if is_partial else None)
         return result
 
+    async def refresh_token_snapshot(self) -> bool:
+        """
+        Refreshes the token universe snapshot from upstream.
+        An empty result keeps the last good snapshot. Returns True if the snapshot was replaced.
+        """
+        tokens, is_partial = await self._fetch_token_list()
+        if not tokens:
+            logger.warning("Token list refresh returned no tokens. Keeping last good snapshot.")
+            return False
+
+        self._token_snapshot = (tokens, time.monotonic(), datetime.now().isoformat())
+        self.cache.set("token_list", "real_time_data", tokens, ttl=TOKEN_LIST_PARTIAL_TTL if is_partial else None)
+        return True
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                with priority_context(PRIORITY_BACKGROUND):
+                    await self.refresh_token_snapshot()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing token snapshot: {e}")
+            await asyncio.sleep(TOKEN_LIST_REFRESH_SECONDS)
+
+    async def start_background_refresh(self):
+        """
+        Starts the background task that keeps the token universe snapshot warm.
+        """
+        if self.refresh_task and not self.refresh_task.done():
+            logger.info("Token list refresher already running.")
+            return
+
+        logger.info(f"Starting token list refresher (every {TOKEN_LIST_REFRESH_SECONDS}s).")
+        self.refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self):
+        if self.refresh_task:
+            self.refresh_task.cancel()
+            try:
+                await self.refresh_task
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self.refresh_task = None
+
+    def get_token_snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the last good token snapshot and its age without touching upstream APIs.
+        """
+        snapshot = self._token_snapshot
+        if snapshot is None:
+            return {'tokens': [], 'age_seconds': None, 'refreshed_at': None}
+        tokens, refreshed_at, refreshed_at_wall = snapshot
+        return {
+            'tokens': tokens,
+            'age_seconds': round(time.monotonic() - refreshed_at, 3),
+            'refreshed_at': refreshed_at_wall
+        }
+
     async def get_all_tokens(self) -> List[Dict]:
         """
-        Returns a list of all available tokens, fetching from real-time source.
+        Returns a list of all available tokens.
+        Served from the background snapshot once the refresher has produced one, so callers
+        never wait on an upstream refresh; until then fetched from the real-time source.
         """
+        if self._token_snapshot is not None:
+            return self.get_token_snapshot()['tokens']
         return await self.fetch_real_time_data()
 
+    async def get_token_table(self) -> TokenTable:
+        """
+        Returns the columnar table for the current token universe.
+        The table is rebuilt only when get_all_tokens() returns a new list, i.e. once per refresh.
+        """
+        tokens = await self.get_all_tokens()
+        table = self._token_table
+        if table is None or table.tokens is not tokens:
+            table = TokenTable(tokens)
+            self._token_table = table
+        return table
+
     def calculate_vwap(self, historical_data: List[Dict]) -> Optional[float]:
         """
         Calculates the Volume-Weighted Average Price (VWAP) from historical OHLCV data.
@@ -303,59 +409,234 @@ class DataFetcherService:
         if not historical_data:
             return None
 
-        total_price_volume = 0
-        total_volume = 0
+        series = OHLCVSeries()
+        series.close = np.fromiter((item.get('price', 0) for item in historical_data), dtype=np.float64, count=len(historical_data))
+        series.volume = np.fromiter((item.get('volume', 0) for item in historical_data), dtype=np.float64, count=len(historical_data))
+        return series.vwap()
 
-        for item in historical_data:
-            volume = item.get('volume', 0)
-            price = item.get('price', 0)
-            if volume > 0:
-                total_price_volume += price * volume
-                total_volume += volume
-
-        if total_volume == 0:
-            return historical_data[-1].get('price') if historical_data else None
-
-        return total_price_volume / total_volume
-
-    async def get_token_by_address(self, token_address: str) -> Optional[Dict]:
+    async def get_token_by_address(self, token_address: str, deadline: Optional[float] = None) -> Optional[Dict]:
         """
         Returns details for a specific token by its address, fetching from real-time source.
         Includes security data and VWAP from Birdeye.
+        Concurrent cache misses for the same address share a single upstream fetch.
+
+        The overview is required; security and OHLCV enrichment run concurrently with it.
+        If `deadline` (seconds) is set, enrichment that has not finished by then is left
+        out and the returned token is partial, as described by its 'enrichment' mask.
+        Late enrichment keeps running in the background and warms the cache.
         """
-        cache_key = f"token_{token_address}"
-        cached_token = self._get_from_cache(cache_key)
+        cached_token = self.cache.get("token_overview", token_address)
         if cached_token:
+            self.token_cache_hits += 1
             return cached_token
 
-        # Fetch basic info from Birdeye overview
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        # Deadline callers share the overview load too; only their enrichment wait is bounded
+        loaded = await self._token_flight.do(token_address, lambda: self._load_token(token_address))
+        if loaded is None:
+            return None
+        token, enrichment = loaded
+
+        timeout = None
+        if deadline is not None:
+            self.token_deadline_loads += 1
+            timeout = max(0.0, deadline - (loop.time() - started_at))
+        return await self._enrich_token(token_address, dict(token), enrichment, timeout)
+
+    async def _fetch_token_overview(self, token_address: str) -> Optional[Dict]:
+        """
+        Fetches the base token overview from Birdeye, falling back to Dexscreener.
+        """
         birdeye_token_list = await self._fetch_from_birdeye(token_address=token_address)
-        token = birdeye_token_list[0] if birdeye_token_list else None
+        if birdeye_token_list:
+            return birdeye_token_list[0]
+
+        dexscreener_token = await self._fetch_from_dexscreener(pair_address=token_address)
+        if dexscreener_token:
+            return dexscreener_token[0]
+        return None
+
+    def _start_enrichment(self, token_address: str) -> Dict[str, asyncio.Task]:
+        """
+        Launches the independent enrichment calls for a token concurrently.
+        Calls are coalesced with any in-flight enrichment for the same address.
+        """
+        tasks = {
+            'security': asyncio.ensure_future(self._enrichment_flight.do(
+                ('security', token_address), lambda: self._fetch_token_security(token_address))),
+            'vwap_24h': asyncio.ensure_future(self._enrichment_flight.do(
+                ('ohlcv', token_address), lambda: self.get_ohlcv(token_address, interval='1h', limit=24))),
+        }
+        for task in tasks.values():
+            # Tasks may outlive a deadline; make sure their errors are still consumed
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return tasks
+
+    async def _load_token(self, token_address: str) -> Optional[Tuple[Dict, Dict[str, asyncio.Task]]]:
+        """
+        Fetches a token's overview from upstream APIs and returns it with its (still running)
+        enrichment tasks, or None if no source knows the token.
+        """
+        enrichment = self._start_enrichment(token_address)
+        token = await self._fetch_token_overview(token_address)
 
         if not token:
-            # Fallback to Dexscreener
-            dexscreener_token = await self._fetch_from_dexscreener(pair_address=token_address)
-            if dexscreener_token:
-                token = dexscreener_token[0]
-
-        if token:
-            # Enrich with security data if possible
-            security_data = await self._fetch_token_security(token['address'])
-            if security_data:
-                token['top_holder_percentage'] = security_data.get('top10HolderPercent', 0)
-                token['dev_wallet_active'] = security_data.get('creatorHasFullControl', False) or (not security_data.get('ownerRenounced', True))
-
-            # Add VWAP analysis (last 24h)
-            history = await self.get_historical_prices(token['address'], interval='1h', limit=24)
-            if history:
-                token['vwap_24h'] = self.calculate_vwap(history)
+            for task in enrichment.values():
+                task.cancel()
+            return None
+
+        if token.get('address') and token['address'] != token_address:
+            # Dexscreener pair fallback resolved to a different mint: enrich that one instead
+            for task in enrichment.values():
+                task.cancel()
+            enrichment = self._start_enrichment(token['address'])
+
+        if token.get('price'):
+            # A fresh overview doubles as a price quote for the price-only API
+            self.cache.set("price", token.get('address') or token_address, token['price'])
+        return token, enrichment
+
+    async def _enrich_token(self, token_address: str, token: Dict, enrichment: Dict[str, asyncio.Task],
+                            timeout: Optional[float]) -> Dict:
+        """
+        Waits up to `timeout` seconds (unbounded if None) for the enrichment tasks and merges
+        what finished into `token`. Only fully enriched tokens are cached.
+        """
+        done, _ = await asyncio.wait(enrichment.values(), timeout=timeout)
+
+        now = datetime.now().timestamp()
+        fields = {'overview': {'complete': True, 'as_of': now}}
+
+        security_task = enrichment['security']
+        security_data = security_task.result() if security_task in done and not security_task.cancelled() else None
+        if security_data:
+            token['top_holder_percentage'] = security_data.get('top10HolderPercent', 0)
+            token['dev_wallet_active'] = security_data.get('creatorHasFullControl', False) or (not security_data.get('ownerRenounced', True))
+        fields['security'] = {
+            'complete': security_task in done,
+            'as_of': self._cached_as_of("security", token['address'], now) if security_data else None
+        }
+
+        # Add VWAP analysis (last 24h)
+        history_task = enrichment['vwap_24h']
+        if history_task in done and not history_task.cancelled():
+            history = history_task.result()
+            if history is not None and len(history):
+                token['vwap_24h'] = history.vwap()
             else:
                 token['vwap_24h'] = token.get('price')
+            fields['vwap_24h'] = {
+                'complete': True,
+                'as_of': history.fetched_at if history is not None and len(history) else None
+            }
+        else:
+            token['vwap_24h'] = None
+            fields['vwap_24h'] = {'complete': False, 'as_of': None}
+
+        complete = all(field['complete'] for field in fields.values())
+        token['enrichment'] = {'complete': complete, 'fields': fields}
+
+        if complete:
+            self.cache.set("token_overview", token_address, token)
+        return token
+
+    def _cached_as_of(self, namespace: str, key: Any, now: float) -> float:
+        """
+        Returns the wall-clock time a cached enrichment value was fetched at.
+        """
+        _, age = self.cache.get_with_age(namespace, key)
+        return now - (age or 0.0)
 
-            self._save_to_cache(cache_key, token)
-            return token
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns cache and request-coalescing counters for token lookups.
+        """
+        return {
+            "token_lookups": {
+                "hits": self.token_cache_hits,
+                "misses": self._token_flight.leaders,
+                "coalesced": self._token_flight.coalesced,
+                "in_flight": self._token_flight.in_flight(),
+                "deadline_loads": self.token_deadline_loads
+            },
+            "enrichment": self._enrichment_flight.get_stats(),
+            "ohlcv": self.ohlcv_store.get_stats(),
+            "token_table": self._token_table.get_stats() if self._token_table is not None else None,
+            "prices": {
+                "hits": self.price_cache_hits,
+                "misses": self.price_cache_misses,
+                "batches": self._price_flight.leaders,
+                "coalesced": self._price_flight.coalesced
+            },
+            "cache": self.cache.get_stats()
+        }
+
+    async def get_price(self, mint: str) -> Optional[float]:
+        """
+        Returns the USD price of one mint, or None if no source prices it.
+        Price-only: no security or OHLCV enrichment, cached under the short-lived "price" namespace.
+        """
+        return (await self.get_prices([mint])).get(mint)
 
-        return None
+    async def get_prices(self, mints: List[str], fresh: bool = False) -> Dict[str, float]:
+        """
+        Returns USD prices for many mints using bulk price endpoints, without the
+        security/OHLCV enrichment of get_token_by_address. Mints without a price are omitted.
+        Prices are cached per mint, so only stale mints are requested upstream;
+        `fresh` skips the cache read (the fetched prices are still cached).
+        """
+        prices = {}
+        missing = []
+        for mint in dict.fromkeys(mint for mint in mints if mint):
+            price = None if fresh else self.cache.get("price", mint)
+            if price is not None:
+                prices[mint] = price
+            else:
+                missing.append(mint)
+        self.price_cache_hits += len(prices)
+        self.price_cache_misses += len(missing)
+
+        batches = [tuple(missing[i:i + PRICE_BATCH_SIZE]) for i in range(0, len(missing), PRICE_BATCH_SIZE)]
+        for batch_prices in await asyncio.gather(*[self._price_flight.do(batch, lambda batch=batch: self._load_prices_batch(batch)) for batch in batches]):
+            prices.update(batch_prices)
+        return prices
+
+    async def _load_prices_batch(self, mints: Tuple[str, ...]) -> Dict[str, float]:
+        prices = await self._fetch_prices_batch(list(mints))
+        for mint, price in prices.items():
+            self.cache.set("price", mint, price)
+        return prices
+
+    async def _fetch_prices_batch(self, mints: List[str]) -> Dict[str, float]:
+        """
+        Fetches prices for one batch from Birdeye multi_price, filling gaps from Jupiter price v2.
+        """
+        prices = {}
+        if BIRDEYE_API_KEY:
+            try:
+                headers = {"X-API-KEY": BIRDEYE_API_KEY, "x-chain": "solana"}
+                url = f"{BIRDEYE_BASE_URL}/multi_price?list_address={','.join(mints)}"
+                response = await self._request_with_retry("GET", url, headers=headers)
+                if response:
+                    for mint, info in (response.json().get('data') or {}).items():
+                        if info and info.get('value') is not None:
+                            prices[mint] = float(info['value'])
+            except Exception as e:
+                logger.error(f"Error fetching bulk prices from Birdeye: {e}")
+
+        missing = [mint for mint in mints if mint not in prices]
+        if missing:
+            try:
+                url = f"{JUPITER_PRICE_API_URL}?ids={','.join(missing)}"
+                response = await self._request_with_retry("GET", url)
+                if response:
+                    for mint, info in (response.json().get('data') or {}).items():
+                        if info and info.get('price') is not None:
+                            prices[mint] = float(info['price'])
+            except Exception as e:
+                logger.error(f"Error fetching bulk prices from Jupiter: {e}")
+        return prices
 
     async def _fetch_token_security(self, token_address: str) -> Optional[Dict]:
         """
@@ -365,6 +646,10 @@ class DataFetcherService:
             logger.warning("BIRDEYE_API_KEY not set. Skipping security analysis.")
             return None
 
+        cached_security = self.cache.get("security", token_address)
+        if cached_security is not None:
+            return cached_security
+
         try:
             headers = {"X-API-KEY": BIRDEYE_API_KEY, "x-chain": "solana"}
             url = f"{BIRDEYE_BASE_URL}/token_security?address={token_address}"
@@ -372,69 +657,110 @@ class DataFetcherService:
             if response:
                 data = response.json()
                 if data.get('success'):
-                    return data.get('data')
+                    security_data = data.get('data')
+                    if security_data is not None:
+                        self.cache.set("security", token_address, security_data)
+                    return security_data
         except Exception as e:
             logger.error(f"Error fetching token security from Birdeye: {e}")
         return None
 
     async def get_historical_prices(self, token_address: str, interval: str = '1h', limit: int = 24) -> List[Dict]:
         """
-        Fetches historical OHLCV data for a given token from Birdeye.
-        Returns a list of price points with timestamps and volume.
+        Returns historical OHLCV data for a given token as a list of price points with
+        timestamps and volume. Served from the local OHLCV store (see get_ohlcv).
         """
-        logger.info(f"Fetching historical data for {token_address} (interval: {interval}, limit: {limit})")
+        history = await self.get_ohlcv(token_address, interval, limit)
+        return history.to_records() if history is not None else []
 
+    async def get_ohlcv(self, token_address: str, interval: str = '1h', limit: int = 24) -> Optional[OHLCVSeries]:
+        """
+        Returns the last `limit` bars for a token (none older than `limit` intervals) as
+        array columns from the local OHLCV store.
+        A series that is older than OHLCV_REFRESH_SECONDS is topped up with only the bars
+        newer than its last stored bar; a full window is fetched only when the store does
+        not cover it yet.
+        """
         if not BIRDEYE_API_KEY:
             logger.warning("BIRDEYE_API_KEY not set. Cannot fetch historical data.")
-            return []
+            return None
 
         try:
-            # Calculate time range
-            now = int(datetime.now().timestamp())
-            lookback_seconds = limit * 3600 if interval.endswith('h') else limit * 86400 if interval.endswith('d') else limit * 60
-            time_from = now - lookback_seconds
+            bar_seconds = interval_seconds(interval)
+        except ValueError:
+            logger.warning(f"Unknown OHLCV interval {interval}; sizing the window in minutes.")
+            bar_seconds = 60
+        window_start = int(datetime.now().timestamp()) - limit * bar_seconds
+        series = self.ohlcv_store.series(token_address, interval)
+        if series.is_fresh(OHLCV_REFRESH_SECONDS) and series.covers(window_start):
+            self.ohlcv_store.record("local_reads")
+            return series.tail(limit, window_start)
+
+        await self._ohlcv_flight.do(
+            (token_address, interval),
+            lambda: self._update_ohlcv(token_address, interval, series, window_start)
+        )
+        return series.tail(limit, window_start) if len(series) else None
+
+    async def get_indicators(self, token_addresses: List[str], interval: str = '1h', bars: int = 24) -> Dict[str, np.ndarray]:
+        """
+        Computes VWAP, EMA, RSI, ATR, volume z-score and momentum for many tokens in one
+        batched pass over their aligned OHLCV arrays. Returns one array per indicator,
+        indexed like `token_addresses`.
+        """
+        series = await asyncio.gather(*[self.get_ohlcv(address, interval, bars) for address in token_addresses])
+        return compute_indicators(OHLCVBatch(series, bars))
 
+    async def _update_ohlcv(self, token_address: str, interval: str, series: OHLCVSeries, window_start: int):
+        """
+        Fetches missing bars from Birdeye into `series`.
+        """
+        now = int(datetime.now().timestamp())
+        if len(series) and series.covers(window_start):
+            # Re-fetch from the last stored bar, which may still have been forming
+            time_from = series.last_timestamp
+            self.ohlcv_store.record("incremental_fetches")
+        else:
+            time_from = window_start
+            self.ohlcv_store.record("full_fetches")
+        logger.info(f"Fetching historical data for {token_address} (interval: {interval}, from: {time_from})")
+
+        headers = {"X-API-KEY": BIRDEYE_API_KEY, "x-chain": "solana"}
+        try:
             # Using OHLCV endpoint for volume data
             url = f"{BIRDEYE_BASE_URL}/history/ohlcv?address={token_address}&type={interval}&time_from={time_from}&time_to={now}"
-            headers = {"X-API-KEY": BIRDEYE_API_KEY, "x-chain": "solana"}
-
             response = await self._request_with_retry("GET", url, headers=headers)
             if not response:
-                return []
+                return
 
             data = response.json()
-            history = []
             if data.get('success') and 'data' in data and 'items' in data['data']:
-                for item in data['data']['items']:
-                    history.append({
-                        'timestamp': datetime.fromtimestamp(item['unixTime']).isoformat(),
-                        'price': item['c'], # Closing price
-                        'volume': item['v'], # Volume
-                        'open': item['o'],
-                        'high': item['h'],
-                        'low': item['l']
-                    })
-            return history
+                items = data['data']['items']
+                series.merge(
+                    [item['unixTime'] for item in items],
+                    [item['o'] for item in items],
+                    [item['h'] for item in items],
+                    [item['l'] for item in items],
+                    [item['c'] for item in items],
+                    [item['v'] for item in items]
+                )
+                series.mark_fetched(time_from)
         except Exception as e:
             logger.error(f"Error fetching historical OHLCV from Birdeye: {e}")
             # Fallback to simple price history if OHLCV fails
             try:
                 url = f"{BIRDEYE_BASE_URL}/history/price?address={token_address}&address_type=token&type={interval}&time_from={time_from}&time_to={now}"
                 response = await self._request_with_retry("GET", url, headers=headers)
-                if not response: return []
+                if not response:
+                    return
                 data = response.json()
-                history = []
                 if 'data' in data and 'items' in data['data']:
-                    for item in data['data']['items']:
-                        history.append({
-                            'timestamp': datetime.fromtimestamp(item['unixTime']).isoformat(),
-                            'price': item['value'],
-                            'volume': 0
-                        })
-                return history
+                    items = data['data']['items']
+                    prices = [item['value'] for item in items]
+                    series.merge([item['unixTime'] for item in items], prices, prices, prices, prices, [0] * len(items))
+                    series.mark_fetched(time_from)
             except Exception as e2:
                 logger.error(f"Error fetching fallback historical prices: {e2}")
-                return []
 
 # Create a singleton instance for easy import
 data_fetcher_service = DataFetcherService()
@@ -0,0 +1,197 @@
+import logging
+import asyncio
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from config import EVENT_BUS_QUEUE_SIZE, EVENT_BUS_CONCURRENCY
+from utils.lane_queue import LaneQueue, BLOCK, DROP_OLDEST
+from utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Event types
+NEW_TOKEN = "new_token"
+RUGPULL_ALERT = "rugpull_alert"             # Any rug indicator seen in the mempool (usually not ours)
+HELD_RUGPULL_ALERT = "held_rugpull_alert"   # Rug indicator resolved to a held position (carries token_address)
+LIQUIDITY_DROP = "liquidity_drop"
+
+EVENT_TYPES = (NEW_TOKEN, RUGPULL_ALERT, HELD_RUGPULL_ALERT, LIQUIDITY_DROP)
+
+class Event:
+    """
+    One published event: its type, the payload handed to subscribers and when it was published.
+    """
+    __slots__ = ("type", "data", "published_at")
+
+    def __init__(self, event_type: str, data: Any):
+        self.type = event_type
+        self.data = data
+        self.published_at = time.monotonic()
+
+class Subscription:
+    """
+    One subscriber: a bounded queue drained by `concurrency` worker tasks.
+    Async handlers are awaited on the bus loop; sync handlers run on the subscription's
+    own thread pool so a blocking handler cannot stall the loop or other subscribers.
+    """
+
+    def __init__(self, name: str, event_type: str, handler: Callable[[Any], Any],
+                 max_queue: int, concurrency: int, policy: str):
+        self.name = name
+        self.event_type = event_type
+        self.handler = handler
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self.policy = policy
+        self.is_async = asyncio.iscoroutinefunction(handler)
+        self.queue: Optional[LaneQueue] = None
+        self.workers: List[asyncio.Task] = []
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.handler_time = LatencyHistogram()
+        self.end_to_end = LatencyHistogram() # Publish to handler completion
+        self.stats = {"processed": 0, "failed": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def start(self):
+        self.queue = LaneQueue({"events": (self.max_queue, self.policy)})
+        if not self.is_async and self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"bus-{self.name}")
+        self.workers = [asyncio.create_task(self._worker_loop()) for _ in range(self.concurrency)]
+
+    async def _worker_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, event = await self.queue.get()
+            self.stats["in_flight"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+            started_at = time.monotonic()
+            try:
+                if self.is_async:
+                    await self.handler(event.data)
+                else:
+                    await loop.run_in_executor(self.executor, functools.partial(self.handler, event.data))
+                self.stats["processed"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Event handler {self.name} failed on {event.type}: {e}")
+            finally:
+                self.stats["in_flight"] -= 1
+                finished_at = time.monotonic()
+                self.handler_time.record(finished_at - started_at)
+                self.end_to_end.record(finished_at - event.published_at)
+
+    async def stop(self):
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.queue = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def get_stats(self) -> Dict:
+        queue = self.queue.get_stats()["events"] if self.queue is not None else None
+        return {
+            "event_type": self.event_type,
+            "concurrency": self.concurrency,
+            "executor": "loop" if self.is_async else "thread_pool",
+            **self.stats,
+            "queue": queue,
+            "handler_time": self.handler_time.get_stats(),
+            "end_to_end": self.end_to_end.get_stats()
+        }
+
+class EventBus:
+    """
+    In-process publish/subscribe for monitor and pool-watcher events.
+
+    publish() only appends to each subscriber's bounded queue, so detection never waits on a
+    handler: a full DROP_OLDEST queue discards its stalest event instead (BLOCK subscribers
+    apply backpressure to the publisher and should be reserved for events that must not be
+    lost). Each subscriber handles at most `concurrency` events at a time. Workers start on
+    the loop of the first publish and stay bound to it.
+
+    The shared `event_bus` is owned by the process: its workers live as long as the
+    background loop, and no service stops it, since the mempool monitor and the pool
+    watcher publish to the same bus. stop() is for embedders and tests that own a bus.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, List[Subscription]] = {event_type: [] for event_type in EVENT_TYPES}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = {event_type: 0 for event_type in EVENT_TYPES}
+
+    def _check_type(self, event_type: str):
+        if event_type not in self._subscriptions:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+    def subscribe(self, event_type: str, handler: Callable[[Any], Any], name: Optional[str] = None,
+                  max_queue: int = EVENT_BUS_QUEUE_SIZE, concurrency: int = EVENT_BUS_CONCURRENCY,
+                  policy: str = DROP_OLDEST) -> Subscription:
+        """
+        Registers `handler(data)` for `event_type`. Sync and async handlers are both accepted.
+        """
+        self._check_type(event_type)
+        if policy not in (BLOCK, DROP_OLDEST):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        name = name or getattr(handler, "__qualname__", repr(handler))
+        taken = {subscription.name for subscriptions in self._subscriptions.values() for subscription in subscriptions}
+        if name in taken:
+            name = f"{name}#{len(taken)}"
+        subscription = Subscription(name, event_type, handler, max(1, max_queue), max(1, concurrency), policy)
+        self._subscriptions[event_type].append(subscription)
+        if self._loop is not None:
+            try:
+                current = asyncio.get_running_loop()
+            except RuntimeError:
+                current = None
+            if current is self._loop:
+                subscription.start()
+            else:
+                self._loop.call_soon_threadsafe(subscription.start)
+        return subscription
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.warning("Event bus restarted on a new event loop; pending events on the old loop are lost.")
+        self._loop = loop
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.start()
+
+    async def publish(self, event_type: str, data: Any):
+        self._check_type(event_type)
+        self._ensure_started()
+        self.published[event_type] += 1
+        event = Event(event_type, data)
+        for subscription in self._subscriptions[event_type]:
+            if subscription.queue is not None: # Subscribed from another thread and not started yet
+                await subscription.queue.put("events", event)
+
+    async def stop(self):
+        """
+        Cancels every subscriber's workers; queued events are dropped. Stop the publishers
+        first. A later publish restarts the workers on its loop.
+        """
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                await subscription.stop()
+        self._loop = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "published": dict(self.published),
+            "subscribers": {
+                subscription.name: subscription.get_stats()
+                for subscriptions in self._subscriptions.values()
+                for subscription in subscriptions
+            }
+        }
+
+# Create a singleton instance
+event_bus = EventBus()
@@ -0,0 +1,160 @@
+import logging
+import asyncio
+import time
+from typing import Dict, Optional, Set
+
+from config import EXIT_PRICE_POLL_SECONDS, EXIT_NUDGE_MIN_INTERVAL
+from utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Exits include sell confirmation, which routinely takes seconds and can take up to a minute
+EXIT_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000)
+
+class ExitEngine:
+    """
+    Event-driven exit evaluation for auto-trader positions, independent of the scan cadence.
+
+    A price poller bulk-fetches fresh prices for the held mints every EXIT_PRICE_POLL_SECONDS
+    (bypassing the price cache, whose TTL would otherwise set the tick rate), and pool
+    reserve updates (from the pool watcher) nudge a fresh price read for that mint, at most
+    once per EXIT_NUDGE_MIN_INTERVAL so busy pools cannot flood the price APIs. Every price
+    that changed is evaluated right away against the take-profit tiers, trailing stop and
+    fixed stop through AutoTraderService.evaluate_position, one task per position so a slow
+    sell never delays the other positions' exits.
+    """
+
+    def __init__(self, auto_trader=None, data_fetcher_service=None, poll_interval: float = EXIT_PRICE_POLL_SECONDS,
+                 nudge_interval: float = EXIT_NUDGE_MIN_INTERVAL):
+        self.auto_trader = auto_trader
+        self.data_fetcher_service = data_fetcher_service
+        self.poll_interval = poll_interval
+        self.nudge_interval = nudge_interval
+        self._last_nudge_fetch = 0.0
+        self.is_running = False
+        self.engine_task = None
+        self.last_prices: Dict[str, float] = {}
+        self._nudged: Set[str] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._evaluations: Dict[str, asyncio.Task] = {}
+        self.tick_to_decision = LatencyHistogram() # Price received to exit rules applied (sell time excluded)
+        # Price received to exit completed, sell confirmation included
+        self.exit_latency = LatencyHistogram(EXIT_LATENCY_BUCKETS_MS)
+        self.stats = {"polls": 0, "nudges": 0, "price_changes": 0, "evaluations": 0, "skipped_busy": 0,
+                      "exits": 0, "errors": 0}
+
+    def nudge(self, token_address: str):
+        """
+        Requests an immediate fresh price read for one mint (e.g. its pool reserves moved).
+        Safe to call from any thread.
+        """
+        if not self.is_running or self._loop is None:
+            return
+        self.stats["nudges"] += 1
+        self._loop.call_soon_threadsafe(self._add_nudge, token_address)
+
+    def _add_nudge(self, token_address: str):
+        self._nudged.add(token_address)
+        self._wake.set()
+
+    async def _run(self):
+        next_poll = 0.0
+        while self.is_running:
+            deadline = next_poll
+            if self._nudged:
+                deadline = min(deadline, self._last_nudge_fetch + self.nudge_interval)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self.auto_trader.trading_enabled:
+                self._nudged.clear()
+                next_poll = time.monotonic() + self.poll_interval
+                continue
+
+            try:
+                now = time.monotonic()
+                if now >= next_poll:
+                    next_poll = now + self.poll_interval
+                    held = list(self.auto_trader.owned_tokens)
+                    if held:
+                        self.stats["polls"] += 1
+                        await self._apply_prices(await self.data_fetcher_service.get_prices(held, fresh=True))
+                if self._nudged and now >= self._last_nudge_fetch + self.nudge_interval:
+                    nudged = [mint for mint in self._nudged if mint in self.auto_trader.owned_tokens]
+                    self._nudged.clear()
+                    self._last_nudge_fetch = now
+                    if nudged:
+                        await self._apply_prices(await self.data_fetcher_service.get_prices(nudged, fresh=True))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"ExitEngine: Price update failed: {e}")
+
+    async def _apply_prices(self, prices: Dict[str, float]):
+        received_at = time.monotonic()
+        for token_address, price in prices.items():
+            if not price or self.last_prices.get(token_address) == price:
+                continue
+            self.stats["price_changes"] += 1
+            running = self._evaluations.get(token_address)
+            if (running is not None and not running.done()) or self.auto_trader.is_position_busy(token_address):
+                # The position is mid-exit or mid-evaluation; the next tick re-checks it
+                self.stats["skipped_busy"] += 1
+                continue
+            self.last_prices[token_address] = price
+            self._evaluations[token_address] = asyncio.create_task(self._evaluate(token_address, price, received_at))
+
+    async def _evaluate(self, token_address: str, price: float, received_at: float):
+        self.stats["evaluations"] += 1
+        try:
+            reason = await self.auto_trader.evaluate_position(token_address, price, wait=False)
+            if reason:
+                self.stats["exits"] += 1
+                self.exit_latency.record(time.monotonic() - received_at)
+                logger.info(f"ExitEngine: {reason} exit for {token_address} at {price}.")
+            else:
+                self.tick_to_decision.record(time.monotonic() - received_at)
+        except Exception as e:
+            self.stats["errors"] += 1
+            # Forget the price so the next tick re-evaluates (and retries the exit) even if unchanged
+            self.last_prices.pop(token_address, None)
+            logger.error(f"ExitEngine: Error evaluating {token_address}: {e}")
+        finally:
+            self._evaluations.pop(token_address, None)
+            if token_address not in self.auto_trader.owned_tokens:
+                self.last_prices.pop(token_address, None)
+
+    async def start(self):
+        if self.engine_task and not self.engine_task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.is_running = True
+        self.engine_task = asyncio.create_task(self._run())
+        logger.info(f"ExitEngine: Started (price poll every {self.poll_interval}s).")
+
+    async def stop(self):
+        self.is_running = False
+        tasks = [task for task in [self.engine_task, *self._evaluations.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.engine_task = None
+        self._evaluations = {}
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "running": self.is_running,
+            "poll_interval": self.poll_interval,
+            "tracked_positions": len(self.last_prices),
+            "tick_to_decision": self.tick_to_decision.get_stats(),
+            "exit_latency": self.exit_latency.get_stats()
+        }
+
+# Create a singleton instance
+exit_engine = ExitEngine()
@@ -1,8 +1,8 @@
 import logging
 import asyncio
+import time
 import json
 from datetime import datetime
-import base58
 from typing import Dict, Optional, List
 from solana.rpc.websocket_api import connect
 from solana.rpc.async_api import AsyncClient
@@ -11,42 +11,115 @@ from solana.rpc.core import RPCException
 from solders.rpc.config import RpcTransactionLogsFilterMentions
 from solders.pubkey import Pubkey
 from solders.signature import Signature
-from solders.transaction import Transaction as SoldersTransaction
+from solders.transaction import Transaction as SoldersTransaction, VersionedTransaction
 from solders.instruction import CompiledInstruction
 from solders.message import Message
 from solders.system_program import ID as SYSTEM_PROGRAM_ID
 
-from config import SOLANA_RPC_URL, SOLANA_WS_URL
+from config import SOLANA_RPC_URL, SOLANA_WS_URLS, SNIPE_ENRICHMENT_DEADLINE, MEMPOOL_WORKERS, MEMPOOL_LAUNCH_QUEUE_SIZE, MEMPOOL_EVENT_QUEUE_SIZE, \
+    MEMPOOL_SIGNATURE_DEDUP_WINDOW, MEMPOOL_MINT_DEDUP_WINDOW, MEMPOOL_DEDUP_MAX_ENTRIES, \
+    MEMPOOL_BACKFILL_RATE, MEMPOOL_BACKFILL_PAGE_SIZE, MEMPOOL_BACKFILL_MAX_PAGES, \
+    MEMPOOL_BACKFILL_MAX_AGE
+from utils.rate_limiter import priority_context, PRIORITY_TRADE, TokenBucket
+from utils.lane_queue import LaneQueue, BLOCK, DROP_OLDEST
+from utils.seen_set import RotatingSeenSet
+from utils.log_classifier import classify_logs, LogClassification, PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID, \
+    LIQUIDITY_WITHDRAW
+from utils.tx_decoder import decode_launch
+from utils.ws_subscriptions import KeyedSubscriptions
+from utils.histogram import LatencyHistogram
+from services.event_bus import event_bus as default_event_bus, EventBus, NEW_TOKEN, RUGPULL_ALERT, HELD_RUGPULL_ALERT
 
 TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5mW")
 
+# `source` of events replayed by the reconnect gap-fill
+BACKFILL_SOURCE = "backfill"
+# `source` of rugpull alerts resolved through the held-mint subscriptions
+HELD_MINT_SOURCE = "held_mint"
+
 logger = logging.getLogger(__name__)
 
-PUMP_FUN_PROGRAM_ID = "6EF8rrecthR5DkZJv9RKzyAXYVqBCTs2Fmb7sK559pwt"
-RAYDIUM_LIQUIDITY_POOL_V4_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
 
 class MempoolMonitorService:
     """
     Service to monitor the Solana mempool for new token launches and potential rugpulls.
     Connects to a Solana RPC WebSocket to listen for new transactions.
+
+    Every endpoint in SOLANA_WS_URLS is subscribed concurrently with its own reconnect
+    loop; signature dedup merges the streams so the earliest arrival wins.
+    The websocket readers only decode and classify frames and hand them to a bounded
+    two-lane queue ("launch" never drops, "events" drops the oldest) drained by
+    MEMPOOL_WORKERS workers, so slow RPC calls never stall reading the socket.
+
+    The slot and signature of the newest processed event are tracked; when an endpoint
+    reconnects while every other one is down, the launch programs' signatures since that
+    slot are paged back and replayed through the same queue (dedup drops what was seen).
+
+    Held positions are pushed in with set_held_positions(); each held mint and pool account
+    gets its own logsSubscribe mentions filter, so rugpull alerts for them arrive already
+    carrying `token_address` without fetching any transaction.
     """
 
-    def __init__(self, socketio=None, data_fetcher_service=None):
+    HELD_RECV_POLL = 1.0 # Seconds between checks for held-set changes while the held socket is idle
+
+    def __init__(self, socketio=None, data_fetcher_service=None, event_bus: Optional[EventBus] = None):
         self.socketio = socketio
         self.data_fetcher_service = data_fetcher_service
+        self.event_bus = event_bus if event_bus is not None else default_event_bus
         self._solana_client = None
         self.monitoring_task = None
+        self.worker_tasks = []
+        self.event_queue = None
         self.is_running = False
-        self.rugpull_callbacks = []
-        self.new_token_callbacks = []
+        self._seen_signatures = RotatingSeenSet(MEMPOOL_SIGNATURE_DEDUP_WINDOW, MEMPOOL_DEDUP_MAX_ENTRIES)
+        self._seen_mints = RotatingSeenSet(MEMPOOL_MINT_DEDUP_WINDOW, MEMPOOL_DEDUP_MAX_ENTRIES)
+        self.ws_urls = list(SOLANA_WS_URLS)
+        self._endpoint_stats: Dict[str, Dict] = {}
+        self.last_slot: Optional[int] = None
+        self.last_signature: Optional[str] = None
+        self.backfill_task = None
+        self._backfill_bucket = TokenBucket(MEMPOOL_BACKFILL_RATE, MEMPOOL_BACKFILL_RATE)
+        self._held_accounts: Dict[str, str] = {} # Subscribed account (mint or pool) -> held mint
+        self._held_version = 0
+        self.held_task = None
+        self._held_subscriptions = KeyedSubscriptions(self._subscribe_held, self._unsubscribe_held, self._on_held_notification)
+        self._seen_held_alerts = RotatingSeenSet(MEMPOOL_SIGNATURE_DEDUP_WINDOW, MEMPOOL_DEDUP_MAX_ENTRIES)
+        self.held_stats = {"resubscribes": 0, "notifications": 0, "alerts": 0, "ignored": 0}
+        self.backfill_stats = {"runs": 0, "signatures": 0, "already_seen": 0, "fetched": 0, "failed": 0,
+                               "stale": 0, "replayed": 0, "truncated": 0, "last_gap_slots": 0}
         self._token_buffer = []
         self._buffer_lock = asyncio.Lock()
+        self.stats = {
+            "logs_received": 0,
+            "launch_candidates": 0,
+            "tx_fetches": 0,
+            "new_tokens": 0,
+            "rug_indicators": 0,
+            # Per-stage drops: duplicate_signature (reader), not_candidate (log prefilter), tx_not_found,
+            # small_sol_transfer, no_mint, error, duplicate_mint (before enrichment and callbacks)
+            "dropped": {"duplicate_signature": 0, "not_candidate": 0, "tx_not_found": 0, "small_sol_transfer": 0,
+                        "no_mint": 0, "error": 0, "duplicate_mint": 0}
+        }
+
+    def on_rugpull(self, callback, **options):
+        """
+        Subscribes `callback(alert_data)` to all mempool rugpull alerts, which mostly concern
+        tokens nobody here holds; `options` go to EventBus.subscribe.
+        """
+        return self.event_bus.subscribe(RUGPULL_ALERT, callback, **options)
 
-    def on_rugpull(self, callback):
-        self.rugpull_callbacks.append(callback)
+    def on_held_rugpull(self, callback, **options):
+        """
+        Subscribes `callback(alert_data)` to rugpull alerts resolved to a held mint (they carry
+        `token_address`); `options` go to EventBus.subscribe.
+        """
+        return self.event_bus.subscribe(HELD_RUGPULL_ALERT, callback, **options)
 
-    def on_new_token(self, callback):
-        self.new_token_callbacks.append(callback)
+    def on_new_token(self, callback, **options):
+        """
+        Subscribes `callback(token_details)` to new tokens; `options` go to EventBus.subscribe.
+        """
+        return self.event_bus.subscribe(NEW_TOKEN, callback, **options)
 
     @property
     def solana_client(self):
@@ -54,40 +127,64 @@ class MempoolMonitorService:
             self._solana_client = AsyncClient(SOLANA_RPC_URL)
         return self._solana_client
 
+    def _new_endpoint_stats(self) -> Dict:
+        return {
+            "connected": False,
+            "connects": 0,
+            "disconnects": 0,
+            "events": 0,
+            "first_arrivals": 0, # Events this endpoint delivered before any other
+            "lag_behind_first": LatencyHistogram(), # How late its duplicates arrived vs the winner
+            "last_event_at": None
+        }
+
     async def _monitor_transactions(self):
         """
         Monitors new transactions on the Solana network for new token launches and potential rugpulls.
-        Uses a reconnection loop with exponential backoff.
+        Subscribes to all configured websocket endpoints at once, so losing one socket does not
+        blind the monitor.
+        """
+        for url in self.ws_urls:
+            self._endpoint_stats.setdefault(url, self._new_endpoint_stats())
+        await asyncio.gather(*[self._read_endpoint(url) for url in self.ws_urls])
+
+    async def _read_endpoint(self, url: str):
+        """
+        Reader for one websocket endpoint. Uses a reconnection loop with exponential backoff.
         """
         retry_delay = 1
         max_retry_delay = 30 # Slightly more aggressive for production
+        stats = self._endpoint_stats[url]
 
         while self.is_running:
             try:
-                async with connect(SOLANA_WS_URL) as ws:
-                    logger.info(f"Connected to Solana WebSocket: {SOLANA_WS_URL}")
+                async with connect(url) as ws:
+                    logger.info(f"Connected to Solana WebSocket: {url}")
                     retry_delay = 1
+                    stats["connected"] = True
+                    stats["connects"] += 1
 
                     # Filter for Pump.fun logs
                     await ws.logs_subscribe(
                         filter_=RpcTransactionLogsFilterMentions(Pubkey.from_string(PUMP_FUN_PROGRAM_ID)),
                         commitment=Commitment('processed')
                     )
-                    logger.info("Subscribed to Pump.fun logs.")
+                    logger.info(f"Subscribed to Pump.fun logs on {url}.")
 
                     # Filter for Raydium logs
                     await ws.logs_subscribe(
                         filter_=RpcTransactionLogsFilterMentions(Pubkey.from_string(RAYDIUM_LIQUIDITY_POOL_V4_ID)),
                         commitment=Commitment('processed')
                     )
-                    logger.info("Subscribed to Raydium logs.")
+                    logger.info(f"Subscribed to Raydium logs on {url}.")
 
                     # Also filter for general SPL Token events if needed, but the above are high priority
                     await ws.logs_subscribe(
                         filter_=RpcTransactionLogsFilterMentions(TOKEN_PROGRAM_ID),
                         commitment=Commitment('processed')
                     )
-                    logger.info("Subscribed to SPL Token logs.")
+                    logger.info(f"Subscribed to SPL Token logs on {url}.")
+                    self._maybe_start_backfill(url)
 
                     async for msg in ws:
                         if not self.is_running:
@@ -100,29 +197,251 @@ class MempoolMonitorService:
                                     value = event.result.value
                                     signature = str(value.signature)
                                     logs = value.logs
-                                    await self._process_mempool_event(signature, logs)
+                                    await self._enqueue_event(signature, logs, source=url, slot=event.result.context.slot)
                                 elif isinstance(event, dict) and 'params' in event:
                                     result = event['params']['result']['value']
                                     signature = result['signature']
                                     logs = result['logs']
-                                    await self._process_mempool_event(signature, logs)
+                                    slot = event['params']['result'].get('context', {}).get('slot')
+                                    await self._enqueue_event(signature, logs, source=url, slot=slot)
                             except (AttributeError, KeyError, TypeError) as e:
                                 continue
 
             except RPCException as e:
                 if self.is_running:
-                    logger.error(f"RPC WebSocket error: {e}. Retrying in {retry_delay}s...")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay = min(retry_delay * 2, max_retry_delay)
+                    logger.error(f"RPC WebSocket error on {url}: {e}. Retrying in {retry_delay}s...")
                 else:
                     break
             except Exception as e:
                 if self.is_running:
-                    logger.error(f"Unexpected WebSocket connection error: {e}. Retrying in {retry_delay}s...")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay = min(retry_delay * 2, max_retry_delay)
+                    logger.error(f"Unexpected WebSocket connection error on {url}: {e}. Retrying in {retry_delay}s...")
                 else:
                     break
+            finally:
+                if stats["connected"]:
+                    stats["connected"] = False
+                    stats["disconnects"] += 1
+
+            if not self.is_running:
+                break
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, max_retry_delay)
+
+    def set_held_positions(self, positions: Dict[str, List[str]]):
+        """
+        Replaces the held set: {mint: [pool accounts]}. The held-mint socket resubscribes
+        when the set of watched accounts changes. Safe to call from any thread.
+        """
+        accounts = {}
+        for mint, pools in positions.items():
+            accounts[mint] = mint
+            for pool in pools or []:
+                accounts.setdefault(pool, mint)
+        if accounts != self._held_accounts:
+            self._held_accounts = accounts
+            self._held_version += 1
+
+    @staticmethod
+    def _held_rug_reason(classification: LogClassification, via_pool: bool) -> Optional[str]:
+        """
+        A liquidity withdrawal mentioning a held mint is always a rug signal. Burns and
+        account closes only count when they touch the pool, so ordinary holders burning
+        tokens or closing their accounts do not trigger emergency exits.
+        """
+        reason = classification.rug_reason
+        if reason == LIQUIDITY_WITHDRAW:
+            return reason
+        if reason and (via_pool or "raydium_program" in classification.labels):
+            return reason
+        return None
+
+    async def _handle_held_logs(self, account: str, signature: str, logs: list):
+        mint = self._held_accounts.get(account)
+        if mint is None:
+            return
+        self.held_stats["notifications"] += 1
+        classification = classify_logs(logs)
+        reason = self._held_rug_reason(classification, via_pool=account != mint)
+        # One transaction can mention both a mint and its pool
+        if not reason or self._seen_held_alerts.check_and_add(signature):
+            self.held_stats["ignored"] += 1
+            return
+
+        self.held_stats["alerts"] += 1
+        logger.warning(f"Rugpull indicator on held token {mint}: {reason} in {signature}")
+        alert_data = {
+            'signature': signature,
+            'reason': reason,
+            'log_message': classification.rug_log,
+            'token_address': mint,
+            'account': account,
+            'source': HELD_MINT_SOURCE
+        }
+        if self.socketio:
+            self.socketio.emit('rugpull_alert', alert_data)
+        await self.event_bus.publish(HELD_RUGPULL_ALERT, alert_data)
+
+    async def _subscribe_held(self, ws, account: str):
+        await ws.logs_subscribe(
+            filter_=RpcTransactionLogsFilterMentions(Pubkey.from_string(account)),
+            commitment=Commitment('processed')
+        )
+
+    async def _unsubscribe_held(self, ws, subscription_id: int):
+        await ws.logs_unsubscribe(subscription_id)
+
+    async def _on_held_notification(self, account: str, event):
+        value = event.result.value
+        if value.err is None:
+            await self._handle_held_logs(account, str(value.signature), value.logs)
+
+    async def _watch_held_accounts(self):
+        """
+        Keeps one mentions subscription per held mint and pool account on the primary endpoint.
+        Held-set changes subscribe/unsubscribe only the accounts that changed on the open socket;
+        everything is resubscribed only after the socket drops.
+        """
+        retry_delay = 1
+        while self.is_running:
+            if not self._held_accounts:
+                await asyncio.sleep(self.HELD_RECV_POLL)
+                continue
+            try:
+                async with connect(self.ws_urls[0]) as ws:
+                    self._held_subscriptions.reset()
+                    version = None
+                    while self.is_running:
+                        if version != self._held_version:
+                            version = self._held_version
+                            if not self._held_accounts:
+                                break # Nothing held: close the socket until something is
+                            added = await self._held_subscriptions.sync(ws, list(self._held_accounts))
+                            self.held_stats["resubscribes"] += 1
+                            retry_delay = 1
+                            logger.info(f"Watching logs of {len(self._held_subscriptions.by_key)} held mint/pool accounts "
+                                        f"({len(added)} newly subscribed).")
+                        try:
+                            msg = await asyncio.wait_for(ws.recv(), timeout=self.HELD_RECV_POLL)
+                        except asyncio.TimeoutError:
+                            continue
+                        await self._held_subscriptions.dispatch(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self.is_running:
+                    break
+                logger.error(f"Held-mint WebSocket error: {e}. Retrying in {retry_delay}s...")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+    def _maybe_start_backfill(self, url: str):
+        """
+        Starts a gap-fill when `url` reconnects while no other endpoint is connected, i.e.
+        nothing was listening since the last processed slot.
+        """
+        if self.last_slot is None:
+            return # First connection: there is no gap to fill
+        if any(stats["connected"] for other, stats in self._endpoint_stats.items() if other != url):
+            return
+        if self.backfill_task and not self.backfill_task.done():
+            return
+        logger.info(f"Reconnected after an outage on all endpoints; backfilling from slot {self.last_slot}.")
+        self.backfill_task = asyncio.create_task(self._backfill_gap(self.last_slot))
+
+    async def _backfill_throttle(self):
+        # Backfill RPC calls share one bucket so a long gap cannot starve live processing
+        while True:
+            wait = self._backfill_bucket.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _gap_signatures(self, program_id: Pubkey, since_slot: int) -> list:
+        """
+        Pages getSignaturesForAddress back from the newest signature until `since_slot`,
+        returning the successful transactions' signature infos (newest first).
+        """
+        collected = []
+        before = None
+        for _ in range(MEMPOOL_BACKFILL_MAX_PAGES):
+            await self._backfill_throttle()
+            response = await self.solana_client.get_signatures_for_address(
+                program_id, before=before, limit=MEMPOOL_BACKFILL_PAGE_SIZE, commitment=Confirmed
+            )
+            page = response.value if response else None
+            if not page:
+                return collected
+            for info in page:
+                # Same-slot signatures are kept; dedup drops the ones already processed
+                if info.slot < since_slot:
+                    return collected
+                if info.err is None:
+                    collected.append(info)
+            before = page[-1].signature
+
+        self.backfill_stats["truncated"] += 1
+        logger.warning(f"Backfill for {program_id} stopped after {MEMPOOL_BACKFILL_MAX_PAGES} pages before reaching slot {since_slot}.")
+        return collected
+
+    async def _fetch_transaction(self, signature: str):
+        await self._backfill_throttle()
+        self.backfill_stats["fetched"] += 1
+        response = await self.solana_client.get_transaction(
+            Signature.from_string(signature),
+            encoding="base64",
+            commitment=Confirmed,
+            max_supported_transaction_version=0
+        )
+        transaction_data = response.value.transaction if response and response.value else None
+        if not transaction_data or not transaction_data.meta:
+            return None
+        return transaction_data
+
+    async def _backfill_gap(self, since_slot: int):
+        """
+        Replays Pump.fun and Raydium transactions that landed from `since_slot` on, oldest
+        first, through the reader stage so they are deduplicated and queued like live events.
+        Each is fetched once and queued with its transaction, so a launch is decoded without
+        a second getTransaction; ones older than MEMPOOL_BACKFILL_MAX_AGE are skipped.
+        """
+        self.backfill_stats["runs"] += 1
+        replayed = 0
+        try:
+            signatures = {} # Signature -> its signature info
+            for program_id in (PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID):
+                for info in await self._gap_signatures(Pubkey.from_string(program_id), since_slot):
+                    signatures.setdefault(str(info.signature), info)
+            self.backfill_stats["signatures"] += len(signatures)
+            if signatures:
+                self.backfill_stats["last_gap_slots"] = max(info.slot for info in signatures.values()) - since_slot
+
+            for signature, info in sorted(signatures.items(), key=lambda item: item[1].slot):
+                if not self.is_running:
+                    break
+                if signature in self._seen_signatures:
+                    self.backfill_stats["already_seen"] += 1
+                    continue
+                # Checked at replay time: the throttle makes a long gap age while it is replayed
+                if info.block_time is not None and time.time() - info.block_time > MEMPOOL_BACKFILL_MAX_AGE:
+                    self.backfill_stats["stale"] += 1
+                    continue
+                try:
+                    transaction_data = await self._fetch_transaction(signature)
+                except Exception as e:
+                    logger.debug(f"Backfill fetch failed for {signature}: {e}")
+                    transaction_data = None
+                if transaction_data is None:
+                    self.backfill_stats["failed"] += 1
+                    continue
+                await self._enqueue_event(signature, transaction_data.meta.log_messages, source=BACKFILL_SOURCE,
+                                          slot=info.slot, transaction=transaction_data)
+                self.backfill_stats["replayed"] += 1
+                replayed += 1
+            logger.info(f"Backfill from slot {since_slot} replayed {replayed} of {len(signatures)} gap transactions.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Mempool backfill from slot {since_slot} failed: {e}")
 
     async def _get_sol_transfer_amount(self, transaction_data) -> float:
         """
@@ -151,130 +470,121 @@ class MempoolMonitorService:
 
         return total_sol_transfer / 1e9 # Convert lamports to SOL
 
-    async def _process_mempool_event(self, signature: str, logs: list):
-        # Optimized filtering based on log content
-        is_new_token = False
-
-        # Filter by SOL transfer amount if possible (optional but recommended for noise reduction)
-        try:
-            sig = Signature.from_string(signature)
-            tx_resp = await self.solana_client.get_transaction(
-                sig,
-                encoding="jsonParsed",
-                max_supported_transaction_version=0
-            )
-            if tx_resp and tx_resp.value:
-                sol_amount = await self._get_sol_transfer_amount(tx_resp.value.transaction)
-                if sol_amount < 0.1:
-                    logger.debug(f"Ignoring transaction {signature} with small SOL transfer: {sol_amount} SOL")
-                    return
-        except Exception as e:
-            logger.warning(f"Could not fetch transaction for pre-filtering: {e}")
-
-        # Pump.fun specific: 'Program log: Instruction: Create'
-        if any("Instruction: Create" in log for log in logs) and any(PUMP_FUN_PROGRAM_ID in log for log in logs):
-            is_new_token = True
-
-        # Raydium specific: 'Program log: Instruction: Initialize2'
-        elif any("Instruction: Initialize2" in log for log in logs) and any(RAYDIUM_LIQUIDITY_POOL_V4_ID in log for log in logs):
-            is_new_token = True
-
-        # Standard SPL Token: 'Program log: Instruction: InitializeMint'
-        elif any("initializeMint" in log.lower() for log in logs):
-            is_new_token = True
-
-        if is_new_token:
-            logger.info(f"Potential new token/pool transaction detected: {signature}")
-            # Run in background to not block the listener
-            asyncio.create_task(self._process_new_token_transaction(signature))
+    async def _enqueue_event(self, signature: str, logs: list, source: Optional[str] = None, slot: Optional[int] = None,
+                             transaction=None):
+        """
+        Reader stage: classifies the frame and queues it. Waits (backpressure) only when
+        the launch lane is full. `source` is the websocket endpoint that delivered it
+        (or BACKFILL_SOURCE) and `slot` the slot it landed in, when known. `transaction` is
+        the already fetched transaction, if any, so the worker does not fetch it again.
+        """
+        self.stats["logs_received"] += 1
+        endpoint = self._endpoint_stats.get(source)
+        if endpoint is not None:
+            endpoint["events"] += 1
+            endpoint["last_event_at"] = time.monotonic()
+
+        # The same transaction arrives once per subscription it mentions and once per
+        # endpoint: the first arrival wins and repeats are dropped before any work
+        if self._seen_signatures.check_and_add(signature, source):
+            self.stats["dropped"]["duplicate_signature"] += 1
+            if endpoint is not None and self._seen_signatures.first_source(signature) != source:
+                endpoint["lag_behind_first"].record(time.monotonic() - self._seen_signatures.first_seen(signature))
+            return
+        if endpoint is not None:
+            endpoint["first_arrivals"] += 1
+        if slot is not None and (self.last_slot is None or slot >= self.last_slot):
+            self.last_slot = slot
+            self.last_signature = signature
+        classification = classify_logs(logs)
+        lane = "launch" if classification.launch_kind else "events"
+        await self.event_queue.put(lane, (signature, logs, classification, transaction))
+
+    async def _worker_loop(self):
+        while True:
+            _, (signature, logs, classification, transaction) = await self.event_queue.get()
+            try:
+                await self._process_mempool_event(signature, logs, classification, transaction)
+            except Exception as e:
+                logger.error(f"Error processing mempool event {signature}: {e}")
+
+    async def _process_mempool_event(self, signature: str, logs: list, classification: Optional[LogClassification] = None,
+                                     transaction=None):
+        # Cheap log-pattern classification first: only launch candidates cost a getTransaction
+        if classification is None:
+            classification = classify_logs(logs)
+        launch_kind = classification.launch_kind
+        if launch_kind:
+            self.stats["launch_candidates"] += 1
+            logger.info(f"Potential new token/pool transaction detected ({launch_kind}): {signature}")
+            # Awaited here; concurrency is bounded by the number of workers
+            await self._process_new_token_transaction(signature, transaction)
+        else:
+            self.stats["dropped"]["not_candidate"] += 1
 
         # Check for rugpull indicators
-        await self._process_rugpull_indicators(signature, logs)
+        await self._process_rugpull_indicators(signature, logs, classification)
 
-    async def _process_new_token_transaction(self, signature: str):
+    async def _process_new_token_transaction(self, signature: str, transaction_data=None):
         """
         Fetches and processes transaction details to identify new token mints.
+        The transaction is fetched once, base64-encoded, and decoded from its instruction
+        bytes (no jsonParsed payload); the same fetch feeds the SOL-transfer noise filter.
+        A `transaction_data` that was already fetched (backfill) is used as is.
         """
         try:
-            sig = Signature.from_string(signature)
-            response = await self.solana_client.get_transaction(
-                sig,
-                encoding="jsonParsed",
-                commitment=Confirmed,
-                max_supported_transaction_version=0
-            )
-            
-            if not response or not response.value:
-                return
+            if transaction_data is None:
+                sig = Signature.from_string(signature)
+                self.stats["tx_fetches"] += 1
+                response = await self.solana_client.get_transaction(
+                    sig,
+                    encoding="base64",
+                    commitment=Confirmed,
+                    max_supported_transaction_version=0
+                )
+
+                if not response or not response.value:
+                    self.stats["dropped"]["tx_not_found"] += 1
+                    return
+                transaction_data = response.value.transaction
 
-            transaction_data = response.value.transaction
             if not transaction_data or not transaction_data.meta:
+                self.stats["dropped"]["tx_not_found"] += 1
                 return
 
-            # Extract deployer (first signer)
-            deployer = None
-            account_keys = transaction_data.transaction.message.account_keys
-            if account_keys and len(account_keys) > 0:
-                first_acc = account_keys[0]
-                deployer = first_acc.get('pubkey') if isinstance(first_acc, dict) else str(first_acc)
-
-            # Look for new mints in instructions
-            for instruction in transaction_data.transaction.message.instructions:
-                program_id = str(instruction.program_id)
-
-                if program_id == str(TOKEN_PROGRAM_ID):
-                    # Handle parsed instructions (jsonParsed)
-                    if hasattr(instruction, 'parsed') and isinstance(instruction.parsed, dict):
-                        if instruction.parsed.get('type') in ['initializeMint', 'initializeMint2']:
-                            mint = instruction.parsed['info']['mint']
-                            await self._emit_new_token(mint, deployer)
-                            return
-
-                    # Handle unparsed CompiledInstruction
-                    elif hasattr(instruction, 'data') and hasattr(instruction, 'accounts'):
-                        data = instruction.data
-                        if isinstance(data, str):
-                            data = base58.b58decode(data)
-
-                        # SPL Token initializeMint is 0, initializeMint2 is 20
-                        if data and data[0] in [0, 20]:
-                            if len(instruction.accounts) > 0:
-                                mint_index = instruction.accounts[0]
-                                mint_pubkey = transaction_data.transaction.message.account_keys[mint_index]
-                                await self._emit_new_token(str(mint_pubkey), deployer)
-                                return
-
-                elif program_id == PUMP_FUN_PROGRAM_ID:
-                    # For Pump.fun 'Create' instruction, the mint is the first account
-                    if hasattr(instruction, 'accounts') and len(instruction.accounts) >= 1:
-                        mint_index = instruction.accounts[0]
-                        account_keys_list = transaction_data.transaction.message.account_keys
-                        mint_pubkey = account_keys_list[mint_index]
-                        mint_str = str(mint_pubkey.pubkey) if hasattr(mint_pubkey, 'pubkey') else str(mint_pubkey)
-                        await self._emit_new_token(mint_str, deployer)
-                        return
-
-                elif program_id == RAYDIUM_LIQUIDITY_POOL_V4_ID:
-                    # Raydium 'Initialize2' usually has mints at index 8 and 9 in accounts
-                    if hasattr(instruction, 'accounts') and len(instruction.accounts) >= 10:
-                        account_keys_list = transaction_data.transaction.message.account_keys
-                        for idx in [8, 9]:
-                            mint_index = instruction.accounts[idx]
-                            mint_pubkey = account_keys_list[mint_index]
-                            mint_str = str(mint_pubkey.pubkey) if hasattr(mint_pubkey, 'pubkey') else str(mint_pubkey)
-                            # Exclude WSOL
-                            if mint_str != "So11111111111111111111111111111111111111112":
-                                await self._emit_new_token(mint_str, deployer)
-                                return
+            # Filter by SOL transfer amount (noise reduction)
+            sol_amount = await self._get_sol_transfer_amount(transaction_data)
+            if sol_amount < 0.1:
+                logger.debug(f"Ignoring transaction {signature} with small SOL transfer: {sol_amount} SOL")
+                self.stats["dropped"]["small_sol_transfer"] += 1
+                return
+
+            # Decode the mint and deployer straight from the instruction bytes
+            if not isinstance(transaction_data.transaction, VersionedTransaction):
+                self.stats["dropped"]["no_mint"] += 1
+                return
+            launch = decode_launch(transaction_data.transaction, getattr(transaction_data.meta, 'loaded_addresses', None))
+            if launch:
+                await self._emit_new_token(launch.mint, launch.deployer)
+                return
+
+            self.stats["dropped"]["no_mint"] += 1
 
         except Exception as tx_e:
+            self.stats["dropped"]["error"] += 1
             logger.error(f"Error processing new token transaction {signature}: {tx_e}")
 
     async def _emit_new_token(self, mint_address: str, deployer: Optional[str] = None):
+        if self._seen_mints.check_and_add(mint_address):
+            self.stats["dropped"]["duplicate_mint"] += 1
+            logger.debug(f"Ignoring already announced mint: {mint_address}")
+            return
+        self.stats["new_tokens"] += 1
         logger.info(f"Confirmed new token mint: {mint_address} (Deployer: {deployer})")
         token_details = None
         if self.data_fetcher_service:
-            token_details = await self.data_fetcher_service.get_token_by_address(mint_address)
+            with priority_context(PRIORITY_TRADE):
+                token_details = await self.data_fetcher_service.get_token_by_address(mint_address, deadline=SNIPE_ENRICHMENT_DEADLINE)
 
         if not token_details:
             token_details = {
@@ -298,47 +608,30 @@ class MempoolMonitorService:
         if self.socketio:
             self.socketio.emit('new_token', token_details)
 
-        for callback in self.new_token_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    asyncio.create_task(callback(token_details))
-                else:
-                    callback(token_details)
-            except Exception as e:
-                logger.error(f"Error in new token callback: {e}")
+        # Queued per subscriber; handlers run off the detection path with bounded concurrency
+        await self.event_bus.publish(NEW_TOKEN, token_details)
 
-    async def _process_rugpull_indicators(self, signature: str, logs: list):
+    async def _process_rugpull_indicators(self, signature: str, logs: list, classification: Optional[LogClassification] = None):
         """
         Analyzes transaction logs for potential rugpull indicators.
         """
-        for log in logs:
-            reason = None
-            if "withdraw liquidity" in log.lower():
-                reason = "Liquidity Withdrawal"
-            elif "burn" in log.lower() and "mint" not in log.lower():
-                reason = "Token Burn"
-            elif "close account" in log.lower():
-                reason = "Account Closed"
-
-            if reason:
-                logger.warning(f"Potential rugpull indicator: {reason} in {signature}")
-                alert_data = {
-                    'signature': signature,
-                    'reason': reason,
-                    'log_message': log
-                }
-                if self.socketio:
-                    self.socketio.emit('rugpull_alert', alert_data)
-
-                for callback in self.rugpull_callbacks:
-                    try:
-                        if asyncio.iscoroutinefunction(callback):
-                            asyncio.create_task(callback(alert_data))
-                        else:
-                            callback(alert_data)
-                    except Exception as e:
-                        logger.error(f"Error in rugpull callback: {e}")
-                return
+        if classification is None:
+            classification = classify_logs(logs)
+        reason = classification.rug_reason
+        if not reason:
+            return
+
+        self.stats["rug_indicators"] += 1
+        logger.warning(f"Potential rugpull indicator: {reason} in {signature}")
+        alert_data = {
+            'signature': signature,
+            'reason': reason,
+            'log_message': classification.rug_log
+        }
+        if self.socketio:
+            self.socketio.emit('rugpull_alert', alert_data)
+
+        await self.event_bus.publish(RUGPULL_ALERT, alert_data)
 
     async def start_monitoring(self):
         """
@@ -352,8 +645,14 @@ class MempoolMonitorService:
         _ = self.solana_client
 
         self.is_running = True
-        logger.info("Starting mempool monitoring task.")
+        self.event_queue = LaneQueue({
+            "launch": (MEMPOOL_LAUNCH_QUEUE_SIZE, BLOCK),
+            "events": (MEMPOOL_EVENT_QUEUE_SIZE, DROP_OLDEST)
+        })
+        self.worker_tasks = [asyncio.create_task(self._worker_loop()) for _ in range(MEMPOOL_WORKERS)]
+        logger.info(f"Starting mempool monitoring task with {MEMPOOL_WORKERS} workers.")
         self.monitoring_task = asyncio.create_task(self._monitor_transactions())
+        self.held_task = asyncio.create_task(self._watch_held_accounts())
 
     async def stop_monitoring(self):
         """
@@ -368,8 +667,53 @@ class MempoolMonitorService:
                 pass
             finally:
                 self.monitoring_task = None
+        if self.held_task:
+            self.held_task.cancel()
+            await asyncio.gather(self.held_task, return_exceptions=True)
+            self.held_task = None
+        if self.backfill_task:
+            self.backfill_task.cancel()
+            await asyncio.gather(self.backfill_task, return_exceptions=True)
+            self.backfill_task = None
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
         logger.info("Mempool monitoring stopped.")
 
+    def get_stats(self) -> Dict:
+        """
+        Returns pipeline counters, including how many events each stage dropped.
+        """
+        return {
+            **self.stats,
+            "dropped": dict(self.stats["dropped"]),
+            "workers": len(self.worker_tasks),
+            "endpoints": {
+                url: {
+                    **{key: value for key, value in stats.items() if key not in ("lag_behind_first", "last_event_at")},
+                    "lag_behind_first": stats["lag_behind_first"].get_stats(),
+                    "idle_seconds": round(time.monotonic() - stats["last_event_at"], 1) if stats["last_event_at"] is not None else None
+                }
+                for url, stats in self._endpoint_stats.items()
+            },
+            "held": {
+                **self.held_stats,
+                "subscribes": self._held_subscriptions.subscribes,
+                "unsubscribes": self._held_subscriptions.unsubscribes,
+                "mints": len(set(self._held_accounts.values())),
+                "accounts": len(self._held_accounts)
+            },
+            "backfill": {
+                **self.backfill_stats,
+                "running": bool(self.backfill_task and not self.backfill_task.done()),
+                "last_slot": self.last_slot,
+                "last_signature": self.last_signature
+            },
+            "dedup": {"signatures": self._seen_signatures.get_stats(), "mints": self._seen_mints.get_stats()},
+            "queue": self.event_queue.get_stats() if self.event_queue is not None else None
+        }
+
     async def monitor_new_tokens(self) -> Optional[Dict]:
         """
         Synchronous-style polling method for compatibility with REST routes.
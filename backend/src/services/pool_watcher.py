@@ -0,0 +1,304 @@
+import logging
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+from solana.rpc.websocket_api import connect
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment, Confirmed
+from solders.pubkey import Pubkey
+
+from config import SOLANA_RPC_URL, SOLANA_WS_URLS, LIQUIDITY_DROP_THRESHOLD, LIQUIDITY_DROP_WINDOW_SLOTS
+from services.event_bus import event_bus as default_event_bus, EventBus, LIQUIDITY_DROP
+from utils.pool_decoder import RaydiumPool, bonding_curve_address, decode_bonding_curve, decode_raydium_pool, \
+    decode_token_amount, is_raydium_pool
+from utils.ws_subscriptions import KeyedSubscriptions
+
+logger = logging.getLogger(__name__)
+
+# Watched account roles
+BONDING_CURVE = "bonding_curve" # Pump.fun curve; liquidity is real_sol_reserves
+QUOTE_VAULT = "quote_vault"     # Raydium AMM v4 vault on the non-held side of the pair
+
+class ReserveState:
+    """
+    Liquidity of one held token's pool: latest and peak quote reserve since it was first seen,
+    plus the readings of the last few slots that sudden drops are measured against.
+    """
+    __slots__ = ("mint", "account", "role", "peak", "current", "slot", "updated_at", "alerted", "recent")
+
+    def __init__(self, mint: str, account: str, role: str):
+        self.mint = mint
+        self.account = account
+        self.role = role
+        self.peak = 0
+        self.current = 0
+        self.slot = None
+        self.updated_at = None
+        self.alerted = False
+        self.recent: List[Tuple[int, int]] = [] # (slot, reserve) readings inside the drop window
+
+    def update(self, reserve: int, slot: Optional[int], window_slots: int) -> Tuple[float, int]:
+        """
+        Records a reserve reading and returns (drop, reference): the fractional drop from the
+        highest of the previous reading and the readings of the last `window_slots` slots.
+        """
+        previous = self.current if self.updated_at is not None else 0
+        if slot is None:
+            self.recent = []
+        else:
+            self.recent = [(seen, value) for seen, value in self.recent if seen >= slot - window_slots]
+        reference = max([previous, *(value for _, value in self.recent)])
+        if slot is not None:
+            self.recent.append((slot, reserve))
+        self.current = reserve
+        self.peak = max(self.peak, reserve)
+        self.slot = slot
+        self.updated_at = time.monotonic()
+        return (1 - reserve / reference if reference else 0.0), reference
+
+class PoolWatcherService:
+    """
+    Streams the pool accounts of held positions with accountSubscribe and decodes their
+    reserves from the raw account data: the Pump.fun bonding curve of every held mint, and
+    the quote vault of each Raydium AMM v4 pool recorded on the position. When a Raydium
+    pool's quote reserve falls LIQUIDITY_DROP_THRESHOLD within `window_slots` slots, a
+    liquidity_drop event (carrying token_address) is published once for that position.
+
+    Bonding curves never raise liquidity_drop: sells drain a curve's SOL by design and its
+    liquidity cannot be withdrawn, so their reserve changes only nudge the reserve listeners
+    (the exit engine re-prices the position against the normal exit rules).
+    """
+
+    RECV_POLL = 1.0 # Seconds between checks for held-set changes while the socket is idle
+    MAX_ACCOUNTS_PER_REQUEST = 100 # getMultipleAccounts limit
+
+    def __init__(self, socketio=None, event_bus: Optional[EventBus] = None, threshold: float = LIQUIDITY_DROP_THRESHOLD,
+                 window_slots: int = LIQUIDITY_DROP_WINDOW_SLOTS):
+        self.socketio = socketio
+        self.event_bus = event_bus if event_bus is not None else default_event_bus
+        self.threshold = threshold
+        self.window_slots = window_slots
+        self._solana_client = None
+        self.watch_task = None
+        self.is_running = False
+        self._positions: Dict[str, List[str]] = {}
+        self._version = 0
+        self._raydium_pools: Dict[str, Optional[RaydiumPool]] = {} # Pool account -> decoded layout (None if not Raydium)
+        self._watches: Dict[str, Tuple[str, str]] = {} # Subscribed account -> (mint, role)
+        self.reserves: Dict[str, ReserveState] = {} # Subscribed account -> reserve state
+        self._reserve_listeners = []
+        self._subscriptions = KeyedSubscriptions(self._subscribe_account, self._unsubscribe_account, self._on_notification)
+        self.stats = {"resubscribes": 0, "updates": 0, "decode_errors": 0, "unsupported_pools": 0,
+                      "migrations": 0, "liquidity_drops": 0}
+
+    @property
+    def solana_client(self):
+        if self._solana_client is None:
+            self._solana_client = AsyncClient(SOLANA_RPC_URL)
+        return self._solana_client
+
+    def on_reserve_update(self, callback):
+        """
+        Registers `callback(token_address)`, called whenever a held pool's reserve changes.
+        """
+        self._reserve_listeners.append(callback)
+
+    def set_held_positions(self, positions: Dict[str, List[str]]):
+        """
+        Replaces the held set: {mint: [pool accounts]}. Safe to call from any thread.
+        """
+        positions = {mint: list(pools or []) for mint, pools in positions.items()}
+        if positions != self._positions:
+            self._positions = positions
+            self._version += 1
+
+    async def _raydium_pool(self, pool: str) -> Optional[RaydiumPool]:
+        # Pool layouts never change, so each pool account is fetched once
+        if pool not in self._raydium_pools:
+            response = await self.solana_client.get_account_info(Pubkey.from_string(pool), commitment=Confirmed)
+            account = response.value if response else None
+            self._raydium_pools[pool] = decode_raydium_pool(bytes(account.data)) if account and is_raydium_pool(account.owner) else None
+            if self._raydium_pools[pool] is None:
+                self.stats["unsupported_pools"] += 1
+        return self._raydium_pools[pool]
+
+    async def _resolve_watches(self, positions: Dict[str, List[str]]) -> Dict[str, Tuple[str, str]]:
+        watches = {}
+        for mint, pools in positions.items():
+            try:
+                watches[bonding_curve_address(mint)] = (mint, BONDING_CURVE)
+                for pool in pools:
+                    raydium = await self._raydium_pool(pool)
+                    if raydium is not None:
+                        watches[raydium.quote_vault(mint)] = (mint, QUOTE_VAULT)
+            except Exception as e:
+                logger.error(f"PoolWatcher: Could not resolve pool accounts for {mint}: {e}")
+        return watches
+
+    async def _seed_reserves(self, accounts: Optional[List[str]] = None):
+        """
+        Reads the current state of the given (default: every) watched account, so the first
+        streamed change is measured against the pre-change reserve rather than becoming the
+        baseline itself.
+        """
+        accounts = list(self._watches) if accounts is None else accounts
+        for start in range(0, len(accounts), self.MAX_ACCOUNTS_PER_REQUEST):
+            chunk = accounts[start:start + self.MAX_ACCOUNTS_PER_REQUEST]
+            response = await self.solana_client.get_multiple_accounts(
+                [Pubkey.from_string(account) for account in chunk], commitment=Confirmed, encoding="base64"
+            )
+            if not response or not response.value:
+                continue
+            for account, info in zip(chunk, response.value):
+                if info is not None:
+                    await self._on_account_update(account, bytes(info.data), response.context.slot)
+
+    async def _on_account_update(self, account: str, data: bytes, slot: Optional[int] = None):
+        watch = self._watches.get(account)
+        if watch is None:
+            return
+        mint, role = watch
+        self.stats["updates"] += 1
+
+        if role == BONDING_CURVE:
+            curve = decode_bonding_curve(data)
+            if curve is None:
+                self.stats["decode_errors"] += 1
+                return
+            if curve.complete:
+                # Migrated to a DEX: the curve is emptied by design, not by a rug
+                if account in self.reserves:
+                    self.stats["migrations"] += 1
+                self.reserves.pop(account, None)
+                return
+            reserve = curve.real_sol_reserves
+        else:
+            reserve = decode_token_amount(data)
+            if reserve is None:
+                self.stats["decode_errors"] += 1
+                return
+
+        state = self.reserves.get(account)
+        if state is None:
+            state = self.reserves[account] = ReserveState(mint, account, role)
+        changed = reserve != state.current
+        drop, reference = state.update(reserve, slot, self.window_slots)
+        if changed:
+            for callback in self._reserve_listeners:
+                try:
+                    callback(mint)
+                except Exception as e:
+                    logger.error(f"PoolWatcher: Error in reserve listener: {e}")
+        if role == QUOTE_VAULT and drop >= self.threshold and not state.alerted:
+            state.alerted = True
+            self.stats["liquidity_drops"] += 1
+            logger.warning(f"PoolWatcher: Liquidity of {mint} fell {drop:.0%} ({reference} -> {reserve}) at slot {slot}.")
+            event_data = {
+                'token_address': mint,
+                'reason': 'Liquidity Drop',
+                'account': account,
+                'pool_type': role,
+                'peak_reserve': state.peak,
+                'reference_reserve': reference,
+                'reserve': reserve,
+                'drop_percentage': round(drop * 100, 2),
+                'slot': slot
+            }
+            if self.socketio:
+                self.socketio.emit('liquidity_drop', event_data)
+            await self.event_bus.publish(LIQUIDITY_DROP, event_data)
+
+    async def _subscribe_account(self, ws, account: str):
+        await ws.account_subscribe(Pubkey.from_string(account), commitment=Commitment('processed'), encoding="base64")
+
+    async def _unsubscribe_account(self, ws, subscription_id: int):
+        await ws.account_unsubscribe(subscription_id)
+
+    async def _on_notification(self, account: str, event):
+        result = event.result
+        await self._on_account_update(account, bytes(result.value.data), result.context.slot)
+
+    async def _watch_pools(self):
+        """
+        Holds one accountSubscribe per watched account on the primary endpoint. Held-set
+        changes subscribe/unsubscribe (and seed) only the accounts that changed on the open
+        socket; everything is resubscribed only after the socket drops.
+        """
+        retry_delay = 1
+        while self.is_running:
+            if not self._positions:
+                self._watches = {}
+                self.reserves = {}
+                await asyncio.sleep(self.RECV_POLL)
+                continue
+            try:
+                async with connect(SOLANA_WS_URLS[0]) as ws:
+                    self._subscriptions.reset()
+                    version = None
+                    while self.is_running:
+                        if version != self._version:
+                            version = self._version
+                            positions = dict(self._positions)
+                            if not positions:
+                                break # Nothing held: close the socket until something is
+                            self._watches = await self._resolve_watches(positions)
+                            # Forget reserves of positions that were closed
+                            self.reserves = {account: state for account, state in self.reserves.items() if account in self._watches}
+                            added = await self._subscriptions.sync(ws, list(self._watches))
+                            self.stats["resubscribes"] += 1
+                            retry_delay = 1
+                            await self._seed_reserves(added)
+                            logger.info(f"PoolWatcher: Watching {len(self._subscriptions.by_key)} pool accounts for "
+                                        f"{len(positions)} positions ({len(added)} newly subscribed).")
+                        try:
+                            msg = await asyncio.wait_for(ws.recv(), timeout=self.RECV_POLL)
+                        except asyncio.TimeoutError:
+                            continue
+                        await self._subscriptions.dispatch(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self.is_running:
+                    break
+                logger.error(f"PoolWatcher: WebSocket error: {e}. Retrying in {retry_delay}s...")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+    async def start(self):
+        if self.watch_task and not self.watch_task.done():
+            return
+        self.is_running = True
+        self.watch_task = asyncio.create_task(self._watch_pools())
+        logger.info("PoolWatcher: Started.")
+
+    async def stop(self):
+        self.is_running = False
+        if self.watch_task:
+            self.watch_task.cancel()
+            await asyncio.gather(self.watch_task, return_exceptions=True)
+            self.watch_task = None
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "subscribes": self._subscriptions.subscribes,
+            "unsubscribes": self._subscriptions.unsubscribes,
+            "positions": len(self._positions),
+            "accounts": len(self._watches),
+            "threshold": self.threshold,
+            "window_slots": self.window_slots,
+            "pools": {
+                state.account: {
+                    "token_address": state.mint,
+                    "type": state.role,
+                    "reserve": state.current,
+                    "peak_reserve": state.peak,
+                    "slot": state.slot,
+                    "alerted": state.alerted
+                }
+                for state in self.reserves.values()
+            }
+        }
+
+# Create a singleton instance
+pool_watcher_service = PoolWatcherService()
@@ -15,6 +15,8 @@ from solders.message import Message
 
 from config import SOLANA_RPC_URL, JUPITER_API_BASE_URL
 from services.wallet_service import wallet_service
+from utils.rate_limiter import rate_limiter, PRIORITY_TRADE
+from utils.http_clients import http_clients
 from utils.db import record_trade, save_limit_order, get_pending_limit_orders, update_limit_order_status
 
 logger = logging.getLogger(__name__)
@@ -28,7 +30,6 @@ class TradingService:
         self.socketio = socketio
         self.data_fetcher_service = data_fetcher_service
         self._solana_client = None
-        self._http_client = None
 
     @property
     def solana_client(self):
@@ -36,12 +37,6 @@ class TradingService:
             self._solana_client = AsyncClient(SOLANA_RPC_URL)
         return self._solana_client
 
-    @property
-    def http_client(self):
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient()
-        return self._http_client
-
     async def _get_jito_tip_estimate(self) -> int:
         """
         Fetches the current JITO tip floor estimate from the Block Engine API.
@@ -55,7 +50,10 @@ class TradingService:
                 "params": []
             }
             # Use the global JITO Block Engine endpoint
-            response = await self.http_client.post("https://mainnet.block-engine.jito.wtf/api/v1/bundles", json=payload)
+            url = "https://mainnet.block-engine.jito.wtf/api/v1/bundles"
+            async with rate_limiter.limit(url, PRIORITY_TRADE) as slot:
+                response = await http_clients.client_for(url).post(url, json=payload)
+                slot.record(response.status_code)
             if response.status_code == 200:
                 data = response.json()
                 if "result" in data and data["result"]:
@@ -115,7 +113,10 @@ class TradingService:
 
         try:
             logger.info(f"Fetching Jupiter swap quote with params: {params}")
-            response = await self.http_client.get(f"{JUPITER_API_BASE_URL}/quote", params=params)
+            quote_url = f"{JUPITER_API_BASE_URL}/quote"
+            async with rate_limiter.limit(quote_url, PRIORITY_TRADE) as slot:
+                response = await http_clients.client_for(quote_url).get(quote_url, params=params)
+                slot.record(response.status_code)
             response.raise_for_status()
             quote_data = response.json()
 
@@ -144,7 +145,10 @@ class TradingService:
                 "wrapAndUnwrapSol": True,
                 "prioritizationFeeLamports": priority_fee
             }
-            response = await self.http_client.post(f"{JUPITER_API_BASE_URL}/swap", json=swap_payload)
+            swap_url = f"{JUPITER_API_BASE_URL}/swap"
+            async with rate_limiter.limit(swap_url, PRIORITY_TRADE) as slot:
+                response = await http_clients.client_for(swap_url).post(swap_url, json=swap_payload)
+                slot.record(response.status_code)
             response.raise_for_status()
             swap_data = response.json()
 
@@ -176,9 +180,7 @@ class TradingService:
             # Fetch current price for recording
             current_price = 0.0
             if self.data_fetcher_service:
-                token_data = await self.data_fetcher_service.get_token_by_address(token_address)
-                if token_data:
-                    current_price = token_data.get('price', 0.0)
+                current_price = await self.data_fetcher_service.get_price(token_address) or 0.0
 
             amount_lamports = int(amount_sol * 10**9)
             slippage_bps = int(slippage * 100)
@@ -243,9 +245,7 @@ class TradingService:
             # Fetch current price for recording
             current_price = 0.0
             if self.data_fetcher_service:
-                token_data = await self.data_fetcher_service.get_token_by_address(token_address)
-                if token_data:
-                    current_price = token_data.get('price', 0.0)
+                current_price = await self.data_fetcher_service.get_price(token_address) or 0.0
 
             token_decimals = await self._get_token_decimals(token_address)
             if token_decimals is None:
@@ -349,13 +349,16 @@ class TradingService:
         Checks all pending limit orders and executes them if price targets are met.
         """
         pending_orders = await asyncio.to_thread(get_pending_limit_orders)
+        if not pending_orders:
+            return
+
+        prices = await self.data_fetcher_service.get_prices([order['token_address'] for order in pending_orders])
         for order in pending_orders:
             try:
-                token_data = await self.data_fetcher_service.get_token_by_address(order['token_address'])
-                if not token_data:
+                current_price = prices.get(order['token_address'])
+                if not current_price:
                     continue
 
-                current_price = token_data['price']
                 target_price = order['target_price']
                 side = order['side']
 
@@ -8,9 +8,11 @@ from solders.keypair import Keypair as SoldersKeypair
 import base58
 import asyncio
 from datetime import datetime
-import httpx
 
-from config import SOLANA_PRIVATE_KEY, SOLANA_RPC_URL
+from config import SOLANA_PRIVATE_KEY, SOLANA_RPC_URL, JUPITER_PRICE_API_URL
+from utils.cache import shared_cache
+from utils.rate_limiter import rate_limiter
+from utils.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +21,13 @@ class WalletService:
     Service to handle actual Solana wallet management using a private key.
     """
 
-    def __init__(self, socketio=None, data_fetcher_service=None):
+    def __init__(self, socketio=None, data_fetcher_service=None, cache=None):
         self.socketio = socketio
         self.data_fetcher_service = data_fetcher_service
         self._solana_client = None
-        self._http_client = None
         self.wallet_keypair: Optional[SoldersKeypair] = None
         self.wallet_address: Optional[Pubkey] = None
-        self.token_decimals_cache = {}
-        self.token_metadata_cache = {}
+        self.cache = cache if cache is not None else shared_cache
         self._initialize_wallet()
 
     @property
@@ -36,12 +36,6 @@ class WalletService:
             self._solana_client = AsyncClient(SOLANA_RPC_URL)
         return self._solana_client
 
-    @property
-    def http_client(self):
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=10.0)
-        return self._http_client
-
     def _initialize_wallet(self):
         if not SOLANA_PRIVATE_KEY:
             logger.error("SOLANA_PRIVATE_KEY environment variable not set. Wallet service will not function.")
@@ -59,8 +53,9 @@ class WalletService:
 
     async def _get_token_decimals(self, mint_address: str) -> int:
         """Fetch and cache token decimals."""
-        if mint_address in self.token_decimals_cache:
-            return self.token_decimals_cache[mint_address]
+        cached_decimals = self.cache.get("token_decimals", mint_address)
+        if cached_decimals is not None:
+            return cached_decimals
 
         try:
             mint_pubkey = Pubkey.from_string(mint_address)
@@ -69,7 +64,7 @@ class WalletService:
                 data = response.value.data
                 if len(data) >= 45:
                     decimals = data[44]
-                    self.token_decimals_cache[mint_address] = decimals
+                    self.cache.set("token_decimals", mint_address, decimals)
                     return decimals
         except Exception as e:
             logger.error(f"Error fetching decimals for {mint_address}: {e}")
@@ -119,7 +114,7 @@ class WalletService:
 
                     # Enrich with metadata if available
                     if self.data_fetcher_service:
-                        cached_meta = self.token_metadata_cache.get(mint)
+                        cached_meta = self.cache.get("token_metadata", mint)
                         if cached_meta:
                             token_info.update(cached_meta)
                         else:
@@ -128,7 +123,7 @@ class WalletService:
                             if meta:
                                 meta_data = {"symbol": meta.get('symbol', 'TOKEN'), "name": meta.get('name', 'Unknown')}
                                 token_info.update(meta_data)
-                                self.token_metadata_cache[mint] = meta_data
+                                self.cache.set("token_metadata", mint, meta_data)
 
                     tokens.append(token_info)
                 except Exception as e:
@@ -140,7 +135,10 @@ class WalletService:
 
             try:
                 # Jupiter Price API v2 supports bulk lookups
-                price_response = await self.http_client.get(f"https://api.jup.ag/price/v2?ids={','.join(mints)}")
+                price_url = f"{JUPITER_PRICE_API_URL}?ids={','.join(mints)}"
+                async with rate_limiter.limit(price_url) as slot:
+                    price_response = await http_clients.client_for(price_url).get(price_url)
+                    slot.record(price_response.status_code)
                 if price_response.status_code == 200:
                     price_data = price_response.json().get('data', {})
 
@@ -188,12 +186,14 @@ class WalletService:
             }
         return {'sol_balance': 0, 'usd_value': 0, 'tokens': [], 'total_value_usd': 0, 'last_updated': datetime.now().isoformat()}
 
-    async def get_token_balance(self, mint_address: str) -> float:
+    async def get_token_balance(self, mint_address: str, default: Optional[float] = 0.0) -> Optional[float]:
         """
         Retrieves the human-readable balance for a specific token mint address.
+        Returns `default` when the balance cannot be read (no wallet or an RPC error), so
+        callers that must not mistake a failed read for an empty account can pass None.
         """
         if not self.wallet_address:
-            return 0.0
+            return default
 
         try:
             opts = TokenAccountOpts(mint=Pubkey.from_string(mint_address))
@@ -215,7 +215,7 @@ class WalletService:
             return total_balance_raw / (10 ** decimals)
         except Exception as e:
             logger.error(f"Error fetching token balance for {mint_address}: {e}")
-            return 0.0
+            return default
 
 # Create a singleton instance
 wallet_service = WalletService()
@@ -0,0 +1,116 @@
+# backend/src/utils/cache.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config import CACHE_MAX_ENTRIES, CACHE_TTLS
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-namespace TTLs.
+    Entries are keyed by (namespace, key) and stored in a single OrderedDict, so lookups,
+    inserts and least-recently-used eviction are all O(1). Expiry is measured with a
+    monotonic clock and expired entries are dropped when read or when they reach the
+    LRU end. Thread-safe, since services are shared by Flask request threads and the
+    background asyncio loop.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, float, float]]" = OrderedDict() # {(ns, key): (value, stored_at, expires_at)}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _ns_stats(self, namespace: str) -> Dict[str, int]:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = {"hits": 0, "misses": 0, "sets": 0, "expired": 0, "evicted": 0}
+            self._stats[namespace] = stats
+        return stats
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def get_with_age(self, namespace: str, key: Hashable) -> Tuple[Any, Optional[float]]:
+        """
+        Returns (value, age_seconds) for a live entry, or (None, None) on a miss.
+        """
+        now = self._clock()
+        with self._lock:
+            stats = self._ns_stats(namespace)
+            entry = self._entries.get((namespace, key), _MISSING)
+            if entry is _MISSING:
+                stats["misses"] += 1
+                return None, None
+            value, stored_at, expires_at = entry
+            if now >= expires_at:
+                del self._entries[(namespace, key)]
+                stats["expired"] += 1
+                stats["misses"] += 1
+                return None, None
+            self._entries.move_to_end((namespace, key))
+            stats["hits"] += 1
+            return value, now - stored_at
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        value, _ = self.get_with_age(namespace, key)
+        return value
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None):
+        now = self._clock()
+        expires_at = now + (self.ttl_for(namespace) if ttl is None else ttl)
+        with self._lock:
+            self._entries[(namespace, key)] = (value, now, expires_at)
+            self._entries.move_to_end((namespace, key))
+            self._ns_stats(namespace)["sets"] += 1
+            while len(self._entries) > self.max_entries:
+                (old_ns, _), (_, _, old_expires_at) = self._entries.popitem(last=False)
+                old_stats = self._ns_stats(old_ns)
+                if now >= old_expires_at:
+                    old_stats["expired"] += 1
+                else:
+                    old_stats["evicted"] += 1
+
+    def delete(self, namespace: str, key: Hashable):
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes: Dict[str, int] = {}
+            for namespace, _ in self._entries:
+                sizes[namespace] = sizes.get(namespace, 0) + 1
+            namespaces = {
+                ns: {**stats, "size": sizes.get(ns, 0), "ttl": self.ttl_for(ns)}
+                for ns, stats in self._stats.items()
+            }
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "namespaces": namespaces
+            }
+
+# Shared cache used by all services
+shared_cache = TTLCache(max_entries=CACHE_MAX_ENTRIES, ttls=CACHE_TTLS)
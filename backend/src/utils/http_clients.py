@@ -0,0 +1,216 @@
+# backend/src/utils/http_clients.py
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import HTTP_POOLS, HTTP_KEEPALIVE_EXPIRY, HTTP_KEEPWARM_INTERVAL
+from utils.rate_limiter import rate_limiter, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (installed with httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps an httpx transport to track requests, in-flight count and time to response headers.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self._transport = transport
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_latency = 0.0
+        self.last_used = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started_at = time.monotonic()
+        try:
+            return await self._transport.handle_async_request(request)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            now = time.monotonic()
+            with self._lock:
+                self.in_flight -= 1
+                self.total_latency += now - started_at
+                self.last_used = now
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    def pool_connections(self) -> Dict[str, int]:
+        # httpcore keeps its connection list on the transport's private pool; best effort only
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = 0
+        http2 = 0
+        for connection in connections:
+            try:
+                if connection.is_idle():
+                    idle += 1
+                if "HTTP/2" in repr(connection):
+                    http2 += 1
+            except Exception:
+                continue
+        return {"open": len(connections), "idle": idle, "http2": http2}
+
+class HttpClientRegistry:
+    """
+    Owns one pooled httpx.AsyncClient per upstream host, shared by all services.
+    Pools are tuned per API (connection limits, keep-alive, timeouts), negotiate HTTP/2
+    where the server supports it, and can be pre-warmed so the first trade after
+    startup or an idle period does not pay for DNS, TCP and TLS setup.
+
+    Pooled connections belong to the event loop that opened them. Once start() has run,
+    the shared pools are owned by its (background) loop, and callers on any other loop
+    (e.g. Flask's per-request loops) get plain clients of their own for that loop, so a
+    pre-warmed connection is never handed to a loop it was not opened on.
+    """
+
+    def __init__(self, pools: Dict[str, Dict]):
+        self._pools = pools
+        self._pool_by_host = {urlsplit(spec["base_url"]).hostname: name for name, spec in pools.items()}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _MeteredTransport] = {}
+        self._home_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.keepwarm_task = None
+
+    def _build_client(self, name: str, spec: Dict, metered: bool = True) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=spec.get("max_connections", 20),
+            max_keepalive_connections=spec.get("max_keepalive", 10),
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+        transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE and spec.get("http2", True), limits=limits)
+        if metered:
+            transport = self._transports[name] = _MeteredTransport(transport)
+        return httpx.AsyncClient(transport=transport, timeout=spec.get("timeout", 10.0))
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """
+        Returns the shared client for the host in `url`. Unknown hosts share a default pool.
+        """
+        name = self._pool_by_host.get(urlsplit(url).hostname or "", "default")
+        if self._home_loop is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None and loop is not self._home_loop:
+                return self._loop_client(loop, name)
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._build_client(name, self._pools.get(name, {}))
+                    self._clients[name] = client
+        return client
+
+    def _loop_client(self, loop: asyncio.AbstractEventLoop, name: str) -> httpx.AsyncClient:
+        # Clients of a non-home loop live (unmetered) only as long as that loop
+        with self._lock:
+            clients = self._loop_clients.setdefault(loop, {})
+            client = clients.get(name)
+            if client is None:
+                client = clients[name] = self._build_client(name, self._pools.get(name, {}), metered=False)
+            return client
+
+    async def _warm(self, name: str, spec: Dict):
+        url = spec["base_url"]
+        try:
+            # Pre-warm requests count against the host's rate limit like any other background call
+            async with rate_limiter.limit(url, PRIORITY_BACKGROUND) as slot:
+                # Any response (even 4xx) means DNS, TCP and TLS are done and the connection is pooled
+                response = await self.client_for(url).head(url, timeout=5.0)
+                slot.record(response.status_code)
+        except httpx.HTTPError as e:
+            logger.debug(f"Pre-warm of {name} pool failed: {e}")
+
+    async def prewarm(self, idle_only: bool = False):
+        """
+        Opens a pooled connection to every configured upstream host.
+        With idle_only, only pools unused for HTTP_KEEPWARM_INTERVAL are touched.
+        """
+        now = time.monotonic()
+        targets = []
+        for name, spec in self._pools.items():
+            transport = self._transports.get(name)
+            last_used = transport.last_used if transport else None
+            if idle_only and last_used is not None and now - last_used < HTTP_KEEPWARM_INTERVAL:
+                continue
+            targets.append(self._warm(name, spec))
+        if targets:
+            await asyncio.gather(*targets)
+
+    async def _keepwarm_loop(self):
+        while True:
+            await asyncio.sleep(HTTP_KEEPWARM_INTERVAL)
+            try:
+                await self.prewarm(idle_only=True)
+            except Exception as e:
+                logger.error(f"Error keeping HTTP pools warm: {e}")
+
+    async def start(self):
+        """
+        Makes the running loop the owner of the shared pools, pre-warms them and keeps
+        idle ones warm in the background.
+        """
+        self._home_loop = asyncio.get_running_loop()
+        logger.info(f"Pre-warming HTTP pools (HTTP/2 {'enabled' if HTTP2_AVAILABLE else 'unavailable'}).")
+        await self.prewarm()
+        if self.keepwarm_task is None or self.keepwarm_task.done():
+            self.keepwarm_task = asyncio.create_task(self._keepwarm_loop())
+
+    async def aclose(self):
+        if self.keepwarm_task:
+            self.keepwarm_task.cancel()
+            self.keepwarm_task = None
+        for client in list(self._clients.values()):
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+        self._home_loop = None
+
+    def get_stats(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        stats = {}
+        for name, transport in list(self._transports.items()):
+            max_connections = self._pools.get(name, {}).get("max_connections", 20)
+            connections = transport.pool_connections()
+            stats[name] = {
+                "requests": transport.requests,
+                "errors": transport.errors,
+                "in_flight": transport.in_flight,
+                "peak_in_flight": transport.peak_in_flight,
+                "utilization": round((connections["open"] - connections["idle"]) / max_connections, 3) if max_connections else None,
+                "connections": connections,
+                "max_connections": max_connections,
+                "avg_latency_ms": round(transport.total_latency / transport.requests * 1000, 2) if transport.requests else 0.0,
+                "idle_seconds": round(now - transport.last_used, 1) if transport.last_used is not None else None
+            }
+        return stats
+
+# Shared client registry used by all services
+http_clients = HttpClientRegistry(HTTP_POOLS)
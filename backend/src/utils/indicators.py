@@ -0,0 +1,165 @@
+# backend/src/utils/indicators.py
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.ohlcv_store import OHLCVSeries
+
+logger = logging.getLogger(__name__)
+
+class OHLCVBatch:
+    """
+    OHLCV bars for many tokens aligned into 2D float64 arrays of shape (tokens, bars).
+    Series are right-aligned on their latest bar; tokens with fewer bars are padded
+    with NaN on the left, so every indicator below works row-wise in one pass.
+    """
+
+    def __init__(self, series: Sequence[Optional[OHLCVSeries]], bars: int):
+        self.bars = bars
+        shape = (len(series), bars)
+        self.open = np.full(shape, np.nan)
+        self.high = np.full(shape, np.nan)
+        self.low = np.full(shape, np.nan)
+        self.close = np.full(shape, np.nan)
+        self.volume = np.full(shape, np.nan)
+        self.lengths = np.zeros(len(series), dtype=np.int64)
+        for row, item in enumerate(series):
+            if item is None or not len(item):
+                continue
+            window = item.tail(bars)
+            count = len(window)
+            self.lengths[row] = count
+            self.open[row, bars - count:] = window.open
+            self.high[row, bars - count:] = window.high
+            self.low[row, bars - count:] = window.low
+            self.close[row, bars - count:] = window.close
+            self.volume[row, bars - count:] = window.volume
+
+    def __len__(self) -> int:
+        return self.close.shape[0]
+
+def _last(values: np.ndarray) -> np.ndarray:
+    return values[:, -1] if values.shape[1] else np.full(values.shape[0], np.nan)
+
+def vwap(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    Row-wise VWAP of the closing prices; the last close for rows without volume.
+    """
+    weights = np.where(np.isnan(close) | ~(volume > 0), 0.0, volume)
+    total = weights.sum(axis=1)
+    weighted = np.nansum(np.where(weights > 0, close, 0.0) * weights, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, weighted / total, _last(close))
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Row-wise exponential moving average (alpha = 2 / (span + 1)), seeded with each row's
+    first value. Loops over bars once, vectorized over tokens. Leading NaNs stay NaN.
+    """
+    alpha = 2.0 / (span + 1)
+    out = np.full(values.shape, np.nan)
+    current = np.full(values.shape[0], np.nan)
+    for i in range(values.shape[1]):
+        column = values[:, i]
+        current = np.where(np.isnan(current), column, np.where(np.isnan(column), current, alpha * column + (1 - alpha) * current))
+        out[:, i] = current
+    return out
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (alpha = 1 / period) of the last value, ignoring NaNs.
+    """
+    current = np.full(values.shape[0], np.nan)
+    for i in range(values.shape[1]):
+        column = values[:, i]
+        current = np.where(np.isnan(current), column, np.where(np.isnan(column), current, current + (column - current) / period))
+    return current
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Latest Relative Strength Index per row (0-100), NaN with fewer than two bars.
+    """
+    delta = np.diff(close, axis=1)
+    gains = _wilder(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), period)
+    losses = _wilder(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = gains / losses
+        return np.where(losses == 0, np.where(gains > 0, 100.0, 50.0), 100.0 - 100.0 / (1.0 + rs))
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Latest Average True Range per row.
+    """
+    previous_close = np.concatenate((np.full((close.shape[0], 1), np.nan), close[:, :-1]), axis=1)
+    # fmax ignores the NaN previous close on each row's first bar
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+    return _wilder(true_range, period)
+
+def volume_zscore(volume: np.ndarray) -> np.ndarray:
+    """
+    How unusual the latest bar's volume is versus the earlier bars in the row.
+    """
+    history = volume[:, :-1]
+    counts = np.sum(~np.isnan(history), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(history, axis=1) / counts
+        std = np.sqrt(np.nansum((history - mean[:, None]) ** 2, axis=1) / counts)
+        return np.where((counts > 1) & (std > 0), (_last(volume) - mean) / std, 0.0)
+
+def momentum(close: np.ndarray, period: int = 6) -> np.ndarray:
+    """
+    Fractional change of the latest close versus the close `period` bars earlier.
+    """
+    if close.shape[1] <= period:
+        return np.full(close.shape[0], np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _last(close) / close[:, -1 - period] - 1.0
+
+def compute_indicators(batch: OHLCVBatch, ema_span: int = 12, rsi_period: int = 14,
+                       atr_period: int = 14, momentum_period: int = 6) -> Dict[str, np.ndarray]:
+    """
+    Computes the latest value of every indicator for all tokens in the batch.
+    Returns one 1D array per indicator, indexed like the batch rows.
+    """
+    return {
+        "close": _last(batch.close),
+        "vwap": vwap(batch.close, batch.volume),
+        "ema": _last(ema(batch.close, ema_span)),
+        "rsi": rsi(batch.close, rsi_period),
+        "atr": atr(batch.high, batch.low, batch.close, atr_period),
+        "volume_zscore": volume_zscore(batch.volume),
+        "momentum": momentum(batch.close, momentum_period),
+        "bars": batch.lengths.astype(np.float64)
+    }
+
+def indicator_rows(addresses: List[str], indicators: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Converts batched indicator arrays into per-address dicts (NaN becomes None).
+    """
+    columns = {name: values.tolist() for name, values in indicators.items()}
+    rows = {}
+    for row, address in enumerate(addresses):
+        # NaN != NaN: missing indicators are reported as None
+        rows[address] = {name: (values[row] if values[row] == values[row] else None) for name, values in columns.items()}
+    return rows
+
+def screen_mask(prices: np.ndarray, indicators: Dict[str, np.ndarray], criteria: Dict[str, Optional[float]]) -> np.ndarray:
+    """
+    Boolean mask of rows passing the indicator criteria. Supported keys (None disables):
+    max_vwap_ratio (price / VWAP), max_rsi, min_volume_zscore, min_momentum.
+    Rows without enough history for an indicator pass that criterion.
+    """
+    mask = np.ones(len(prices), dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Comparisons against NaN are False, so rows lacking history are never rejected
+        if criteria.get("max_vwap_ratio") is not None:
+            mask &= ~(prices > indicators["vwap"] * criteria["max_vwap_ratio"])
+        if criteria.get("max_rsi") is not None:
+            mask &= ~(indicators["rsi"] > criteria["max_rsi"])
+        if criteria.get("min_volume_zscore") is not None:
+            mask &= ~(indicators["volume_zscore"] < criteria["min_volume_zscore"])
+        if criteria.get("min_momentum") is not None:
+            mask &= ~(indicators["momentum"] < criteria["min_momentum"])
+    return mask
@@ -0,0 +1,87 @@
+# backend/src/utils/lane_queue.py
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Full-lane policies
+BLOCK = "block"             # Producer waits for space (backpressure); nothing is dropped
+DROP_OLDEST = "drop_oldest" # Oldest queued item is discarded to make room
+
+class LaneQueue:
+    """
+    Bounded asyncio queue with several priority lanes, each with its own capacity and
+    full-lane policy. get() always serves the first non-empty lane in declaration order.
+    Tracks depth, peak depth, drops, producer waits and queueing lag per lane.
+    Must be created and used on a single event loop.
+    """
+
+    def __init__(self, lanes: Dict[str, Tuple[int, str]]):
+        self._lanes = {name: deque() for name in lanes}
+        self._limits = {name: maxsize for name, (maxsize, _) in lanes.items()}
+        self._policies = {name: policy for name, (_, policy) in lanes.items()}
+        self._changed = asyncio.Condition()
+        self._stats = {
+            name: {"enqueued": 0, "dequeued": 0, "dropped": 0, "blocked_puts": 0,
+                   "peak_depth": 0, "total_lag": 0.0, "max_lag": 0.0}
+            for name in lanes
+        }
+
+    async def put(self, lane: str, item: Any):
+        loop = asyncio.get_running_loop()
+        queue = self._lanes[lane]
+        stats = self._stats[lane]
+        async with self._changed:
+            if len(queue) >= self._limits[lane]:
+                if self._policies[lane] == BLOCK:
+                    stats["blocked_puts"] += 1
+                    await self._changed.wait_for(lambda: len(queue) < self._limits[lane])
+                else:
+                    queue.popleft()
+                    stats["dropped"] += 1
+            queue.append((item, loop.time()))
+            stats["enqueued"] += 1
+            stats["peak_depth"] = max(stats["peak_depth"], len(queue))
+            self._changed.notify_all()
+
+    async def get(self) -> Tuple[str, Any]:
+        """
+        Waits for an item and returns (lane, item) from the highest-priority non-empty lane.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._changed:
+            await self._changed.wait_for(lambda: any(self._lanes.values()))
+            for lane, queue in self._lanes.items():
+                if queue:
+                    item, enqueued_at = queue.popleft()
+                    lag = loop.time() - enqueued_at
+                    stats = self._stats[lane]
+                    stats["dequeued"] += 1
+                    stats["total_lag"] += lag
+                    stats["max_lag"] = max(stats["max_lag"], lag)
+                    # Wake producers blocked on a full lane
+                    self._changed.notify_all()
+                    return lane, item
+
+    def qsize(self) -> int:
+        return sum(len(queue) for queue in self._lanes.values())
+
+    def get_stats(self) -> Dict[str, Dict]:
+        return {
+            lane: {
+                "depth": len(self._lanes[lane]),
+                "capacity": self._limits[lane],
+                "policy": self._policies[lane],
+                "enqueued": stats["enqueued"],
+                "dequeued": stats["dequeued"],
+                "dropped": stats["dropped"],
+                "blocked_puts": stats["blocked_puts"],
+                "peak_depth": stats["peak_depth"],
+                "avg_lag_ms": round(stats["total_lag"] / stats["dequeued"] * 1000, 2) if stats["dequeued"] else 0.0,
+                "max_lag_ms": round(stats["max_lag"] * 1000, 2)
+            }
+            for lane, stats in self._stats.items()
+        }
@@ -0,0 +1,96 @@
+# backend/src/utils/log_classifier.py
+
+import logging
+from typing import FrozenSet, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PUMP_FUN_PROGRAM_ID = "6EF8rrecthR5DkZJv9RKzyAXYVqBCTs2Fmb7sK559pwt"
+RAYDIUM_LIQUIDITY_POOL_V4_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+
+# Launch kinds
+PUMP_CREATE = "pump_create"
+RAYDIUM_INIT = "raydium_init"
+MINT_INIT = "mint_init"
+
+# Rug indicator reasons, in per-line precedence order
+LIQUIDITY_WITHDRAW = "Liquidity Withdrawal"
+TOKEN_BURN = "Token Burn"
+ACCOUNT_CLOSED = "Account Closed"
+
+class LogClassification:
+    """
+    Result of classifying one transaction's logs.
+    `labels` holds every pattern seen; `launch_kind` and `rug_reason` apply the monitor's rules.
+    """
+    __slots__ = ("labels", "launch_kind", "rug_reason", "rug_log")
+
+    def __init__(self, labels: FrozenSet[str], launch_kind: Optional[str] = None,
+                 rug_reason: Optional[str] = None, rug_log: Optional[str] = None):
+        self.labels = labels
+        self.launch_kind = launch_kind
+        self.rug_reason = rug_reason
+        self.rug_log = rug_log
+
+_EMPTY = LogClassification(frozenset())
+
+def _rug_reason(lowered_log: str) -> Optional[str]:
+    if "withdraw liquidity" in lowered_log:
+        return LIQUIDITY_WITHDRAW
+    if "burn" in lowered_log and "mint" not in lowered_log:
+        return TOKEN_BURN
+    if "close account" in lowered_log:
+        return ACCOUNT_CLOSED
+    return None
+
+def classify_logs(logs: List[str]) -> LogClassification:
+    """
+    Labels an event (pump create, raydium init, mint init, liquidity withdraw, burn,
+    close account) from one joined, once-lowercased copy of its logs. Only events that
+    contain a rug keyword are revisited line by line to find the reason's log line.
+    """
+    if not logs:
+        return _EMPTY
+    text = "\n".join(logs)
+    lowered = text.lower()
+    # One C-level substring search per pattern over a single buffer; program ids and
+    # instruction names are case-sensitive, the rest are matched on the lowercased copy
+    create = "Instruction: Create" in text
+    initialize2 = "Instruction: Initialize2" in text
+    mint_init = "initializemint" in lowered
+    withdraw = "withdraw liquidity" in lowered
+    burn = "burn" in lowered
+    close = "close account" in lowered
+    if not (create or initialize2 or mint_init or withdraw or burn or close):
+        return _EMPTY
+
+    labels = frozenset(label for label, present in (
+        ("pump_program", PUMP_FUN_PROGRAM_ID in text),
+        ("raydium_program", RAYDIUM_LIQUIDITY_POOL_V4_ID in text),
+        ("create", create),
+        ("initialize2", initialize2),
+        ("mint_init", mint_init),
+        ("withdraw", withdraw),
+        ("burn", burn),
+        ("close", close),
+    ) if present)
+
+    launch_kind = None
+    if "create" in labels and "pump_program" in labels:
+        launch_kind = PUMP_CREATE
+    elif "initialize2" in labels and "raydium_program" in labels:
+        launch_kind = RAYDIUM_INIT
+    elif "mint_init" in labels:
+        launch_kind = MINT_INIT
+
+    rug_reason = None
+    rug_log = None
+    if withdraw or burn or close:
+        # Rug rules are per line: the first line with a reason wins
+        for log in logs:
+            rug_reason = _rug_reason(log.lower())
+            if rug_reason:
+                rug_log = log
+                break
+
+    return LogClassification(labels, launch_kind, rug_reason, rug_log)
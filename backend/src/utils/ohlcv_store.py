@@ -0,0 +1,196 @@
+# backend/src/utils/ohlcv_store.py
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import OHLCV_MAX_BARS, OHLCV_MAX_SERIES
+
+logger = logging.getLogger(__name__)
+
+# 'm' is a minute and 'M' a (30-day) month; the other units are case-insensitive
+_INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800, "M": 2592000}
+
+def interval_seconds(interval: str) -> int:
+    """
+    Converts a Birdeye interval ('1m', '15m', '1H', '4h', '1D', '1W', '1M') to seconds.
+    """
+    match = re.fullmatch(r"(\d*)([a-zA-Z])", interval.strip())
+    unit = match.group(2) if match else None
+    if unit is not None and unit != "M":
+        unit = unit.lower()
+    if unit not in _INTERVAL_UNITS:
+        raise ValueError(f"Unsupported OHLCV interval: {interval}")
+    return int(match.group(1) or 1) * _INTERVAL_UNITS[unit]
+
+class OHLCVSeries:
+    """
+    Array-backed OHLCV bars for one (mint, interval), sorted by timestamp.
+    Columns are numpy arrays: epoch-second int64 timestamps and float64 open, high,
+    low, close and volume. `covered_from` is the earliest time the upstream has been
+    asked for, so a caller can tell whether a window is complete locally or needs a
+    backfill rather than an incremental fetch.
+    """
+
+    def __init__(self, max_bars: int = OHLCV_MAX_BARS):
+        self.max_bars = max_bars
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.open = np.empty(0, dtype=np.float64)
+        self.high = np.empty(0, dtype=np.float64)
+        self.low = np.empty(0, dtype=np.float64)
+        self.close = np.empty(0, dtype=np.float64)
+        self.volume = np.empty(0, dtype=np.float64)
+        self.covered_from: Optional[int] = None
+        self.fetched_at: Optional[float] = None # Wall-clock time of the last upstream fetch
+        self._fetched_monotonic: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.timestamps[-1]) if len(self.timestamps) else None
+
+    def merge(self, timestamps, open_, high, low, close, volume):
+        """
+        Merges bars into the series. Bars at an existing timestamp replace the stored
+        bar (the latest bar keeps changing until its interval closes).
+        """
+        new_ts = np.asarray(timestamps, dtype=np.int64)
+        if not len(new_ts):
+            return
+        ts = np.concatenate((self.timestamps, new_ts))
+        # Stable sort keeps the incoming bar after the stored one, so the last of each timestamp wins
+        order = np.argsort(ts, kind="stable")
+        sorted_ts = ts[order]
+        keep = np.append(sorted_ts[1:] != sorted_ts[:-1], True)
+        index = order[keep][-self.max_bars:]
+
+        self.timestamps = ts[index]
+        self.open = np.concatenate((self.open, np.asarray(open_, dtype=np.float64)))[index]
+        self.high = np.concatenate((self.high, np.asarray(high, dtype=np.float64)))[index]
+        self.low = np.concatenate((self.low, np.asarray(low, dtype=np.float64)))[index]
+        self.close = np.concatenate((self.close, np.asarray(close, dtype=np.float64)))[index]
+        self.volume = np.concatenate((self.volume, np.asarray(volume, dtype=np.float64)))[index]
+        if self.covered_from is not None and len(self.timestamps) == self.max_bars:
+            # Trimmed bars are no longer held locally
+            self.covered_from = max(self.covered_from, int(self.timestamps[0]))
+
+    def mark_fetched(self, time_from: int):
+        self.covered_from = time_from if self.covered_from is None else min(self.covered_from, time_from)
+        self.fetched_at = time.time()
+        self._fetched_monotonic = time.monotonic()
+
+    def covers(self, time_from: int) -> bool:
+        return self.covered_from is not None and self.covered_from <= time_from
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self._fetched_monotonic is not None and time.monotonic() - self._fetched_monotonic < max_age
+
+    def tail(self, limit: Optional[int] = None, time_from: Optional[int] = None) -> "OHLCVSeries":
+        """
+        Returns the last `limit` bars, leaving out bars older than `time_from`, as a series
+        of array views (no copy).
+        """
+        window = OHLCVSeries(self.max_bars)
+        start = 0 if limit is None else max(0, len(self.timestamps) - limit)
+        if time_from is not None:
+            start = max(start, int(np.searchsorted(self.timestamps, time_from, side="left")))
+        window.timestamps = self.timestamps[start:]
+        window.open = self.open[start:]
+        window.high = self.high[start:]
+        window.low = self.low[start:]
+        window.close = self.close[start:]
+        window.volume = self.volume[start:]
+        window.covered_from = self.covered_from
+        window.fetched_at = self.fetched_at
+        return window
+
+    def vwap(self) -> Optional[float]:
+        """
+        Volume-weighted average of the closing prices; the last close if there is no volume.
+        """
+        if not len(self.close):
+            return None
+        volume = np.where(self.volume > 0, self.volume, 0.0)
+        total_volume = volume.sum()
+        if total_volume == 0:
+            return float(self.close[-1])
+        return float(np.dot(self.close, volume) / total_volume)
+
+    def to_records(self) -> List[Dict]:
+        """
+        Returns the bars in the list-of-dicts shape served by the history API.
+        """
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(ts).isoformat(),
+                'price': c, # Closing price
+                'volume': v,
+                'open': o,
+                'high': h,
+                'low': l
+            }
+            for ts, o, h, l, c, v in zip(self.timestamps.tolist(), self.open.tolist(), self.high.tolist(),
+                                         self.low.tolist(), self.close.tolist(), self.volume.tolist())
+        ]
+
+class OHLCVStore:
+    """
+    Local store of OHLCV series keyed by (mint, interval), bounded to the most recently
+    used `max_series` series. Thread-safe lookups; series are replaced column-wise on
+    merge, so readers holding a tail() keep a consistent view.
+    """
+
+    def __init__(self, max_series: int = OHLCV_MAX_SERIES, max_bars: int = OHLCV_MAX_BARS):
+        self.max_series = max_series
+        self.max_bars = max_bars
+        self._series: "OrderedDict[tuple[str, str], OHLCVSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_reads": 0, "incremental_fetches": 0, "full_fetches": 0}
+
+    def get(self, mint: str, interval: str) -> Optional[OHLCVSeries]:
+        with self._lock:
+            series = self._series.get((mint, interval))
+            if series is not None:
+                self._series.move_to_end((mint, interval))
+            return series
+
+    def series(self, mint: str, interval: str) -> OHLCVSeries:
+        """
+        Returns the series for (mint, interval), creating an empty one if needed.
+        """
+        with self._lock:
+            key = (mint, interval)
+            series = self._series.get(key)
+            if series is None:
+                series = OHLCVSeries(self.max_bars)
+                self._series[key] = series
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._series.move_to_end(key)
+            return series
+
+    def record(self, event: str):
+        with self._lock:
+            self._stats[event] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "series": len(self._series),
+                "bars": sum(len(series) for series in self._series.values()),
+                "max_series": self.max_series
+            }
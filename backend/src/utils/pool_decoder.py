@@ -0,0 +1,95 @@
+# backend/src/utils/pool_decoder.py
+
+import logging
+import struct
+from typing import Optional
+
+from solders.pubkey import Pubkey
+
+from utils.log_classifier import PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID
+
+logger = logging.getLogger(__name__)
+
+# Raydium AMM v4 AmmInfo: vault and mint pubkeys follow the u64 params, fees and output data
+RAYDIUM_AMM_SIZE = 752
+RAYDIUM_COIN_VAULT_OFFSET = 336
+RAYDIUM_PC_VAULT_OFFSET = 368
+RAYDIUM_COIN_MINT_OFFSET = 400
+RAYDIUM_PC_MINT_OFFSET = 432
+
+# SPL token account: mint (32), owner (32), amount (u64)
+TOKEN_ACCOUNT_AMOUNT_OFFSET = 64
+
+# Pump.fun bonding curve: 8-byte anchor discriminator, five u64 reserves/supply fields, `complete` flag
+BONDING_CURVE_SEED = b"bonding-curve"
+_BONDING_CURVE = struct.Struct("<8x5Q?")
+
+class RaydiumPool:
+    """
+    Vault and mint accounts of a Raydium AMM v4 pool.
+    """
+    __slots__ = ("coin_vault", "pc_vault", "coin_mint", "pc_mint")
+
+    def __init__(self, coin_vault: str, pc_vault: str, coin_mint: str, pc_mint: str):
+        self.coin_vault = coin_vault
+        self.pc_vault = pc_vault
+        self.coin_mint = coin_mint
+        self.pc_mint = pc_mint
+
+    def quote_vault(self, mint: str) -> str:
+        """
+        Vault holding the other side of the pair (usually WSOL): its balance is the pool's liquidity.
+        """
+        return self.pc_vault if self.coin_mint == mint else self.coin_vault
+
+class BondingCurve:
+    """
+    Reserves of a Pump.fun bonding curve (token units and lamports).
+    """
+    __slots__ = ("virtual_token_reserves", "virtual_sol_reserves", "real_token_reserves",
+                 "real_sol_reserves", "token_total_supply", "complete")
+
+    def __init__(self, virtual_token_reserves: int, virtual_sol_reserves: int, real_token_reserves: int,
+                 real_sol_reserves: int, token_total_supply: int, complete: bool):
+        self.virtual_token_reserves = virtual_token_reserves
+        self.virtual_sol_reserves = virtual_sol_reserves
+        self.real_token_reserves = real_token_reserves
+        self.real_sol_reserves = real_sol_reserves
+        self.token_total_supply = token_total_supply
+        self.complete = complete
+
+def _pubkey(data: bytes, offset: int) -> str:
+    return str(Pubkey.from_bytes(data[offset:offset + 32]))
+
+def decode_raydium_pool(data: bytes) -> Optional[RaydiumPool]:
+    if len(data) < RAYDIUM_AMM_SIZE:
+        return None
+    return RaydiumPool(
+        _pubkey(data, RAYDIUM_COIN_VAULT_OFFSET),
+        _pubkey(data, RAYDIUM_PC_VAULT_OFFSET),
+        _pubkey(data, RAYDIUM_COIN_MINT_OFFSET),
+        _pubkey(data, RAYDIUM_PC_MINT_OFFSET)
+    )
+
+def decode_token_amount(data: bytes) -> Optional[int]:
+    """
+    Raw balance of an SPL token account.
+    """
+    if len(data) < TOKEN_ACCOUNT_AMOUNT_OFFSET + 8:
+        return None
+    return struct.unpack_from("<Q", data, TOKEN_ACCOUNT_AMOUNT_OFFSET)[0]
+
+def decode_bonding_curve(data: bytes) -> Optional[BondingCurve]:
+    if len(data) < _BONDING_CURVE.size:
+        return None
+    return BondingCurve(*_BONDING_CURVE.unpack_from(data))
+
+def bonding_curve_address(mint: str) -> str:
+    address, _ = Pubkey.find_program_address(
+        [BONDING_CURVE_SEED, bytes(Pubkey.from_string(mint))],
+        Pubkey.from_string(PUMP_FUN_PROGRAM_ID)
+    )
+    return str(address)
+
+def is_raydium_pool(owner) -> bool:
+    return str(owner) == RAYDIUM_LIQUIDITY_POOL_V4_ID
@@ -0,0 +1,288 @@
+# backend/src/utils/rate_limiter.py
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import RATE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower value is served first
+PRIORITY_TRADE = 0       # Snipe analysis, buys, sells, emergency exits
+PRIORITY_MONITOR = 1     # Position monitoring, limit orders (default)
+PRIORITY_BACKGROUND = 2  # Dashboard, token list refresh, wallet overview
+
+PRIORITY_NAMES = {PRIORITY_TRADE: "trade", PRIORITY_MONITOR: "monitor", PRIORITY_BACKGROUND: "background"}
+
+_current_priority = contextvars.ContextVar("upstream_request_priority", default=PRIORITY_MONITOR)
+
+@contextmanager
+def priority_context(priority: int):
+    """
+    Sets the priority lane for upstream calls made in this context (and tasks created from it).
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `burst` tokens.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if one is available and returns 0, otherwise returns the seconds until one is.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def drain(self):
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+class _Waiter:
+    __slots__ = ("priority", "loop", "future", "granted", "abandoned", "enqueued_at")
+
+    def __init__(self, priority: int, loop: asyncio.AbstractEventLoop, enqueued_at: float):
+        self.priority = priority
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+        self.abandoned = False
+        self.enqueued_at = enqueued_at
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+class _Slot:
+    """
+    Handle for one admitted request; call record() with the HTTP status once it is known.
+    """
+    __slots__ = ("status_code",)
+
+    def __init__(self):
+        self.status_code: Optional[int] = None
+
+    def record(self, status_code: int):
+        self.status_code = status_code
+
+class HostLimiter:
+    """
+    Rate and concurrency limiter for one upstream API.
+
+    Admission needs both a token from the bucket (rate/burst) and a free concurrency slot.
+    The concurrency limit adapts with AIMD: it grows additively on fast successful
+    responses and is cut multiplicatively on 429s (which also drain the bucket) or on
+    responses slower than `latency_target`. Waiting requests are admitted strictly by
+    priority lane, FIFO within a lane. State is guarded by a thread lock and waiters are
+    woken on their own event loop, so one limiter can be shared by the Flask request loops
+    and the background loop.
+    """
+
+    POLL_INTERVAL = 0.25 # Upper bound on how long a waiter sleeps before re-checking the bucket
+
+    def __init__(self, name: str, rate: float, burst: float, max_concurrency: int,
+                 min_concurrency: int = 1, latency_target: float = 2.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_target = latency_target
+        self._clock = clock
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._limit = float(max_concurrency)
+        self._inflight = 0
+        self._waiters: List[Tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"admitted": 0, "throttled_429": 0, "slow_responses": 0, "total_wait_seconds": 0.0}
+
+    def _dispatch(self) -> float:
+        """
+        Admits waiters while tokens and slots allow. Returns the bucket wait hint in seconds.
+        """
+        granted = []
+        wait_hint = 0.0
+        with self._lock:
+            while self._waiters and self._inflight < max(self.min_concurrency, int(self._limit)):
+                waiter = self._waiters[0][2]
+                if waiter.abandoned:
+                    heapq.heappop(self._waiters)
+                    continue
+                wait_hint = self._bucket.try_acquire()
+                if wait_hint > 0:
+                    break
+                heapq.heappop(self._waiters)
+                waiter.granted = True
+                self._inflight += 1
+                self._stats["admitted"] += 1
+                self._stats["total_wait_seconds"] += self._clock() - waiter.enqueued_at
+                granted.append(waiter)
+
+        for waiter in granted:
+            try:
+                waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            except RuntimeError:
+                # The waiter's loop is gone; give the slot back
+                self._release_slot()
+        return wait_hint
+
+    def _release_slot(self):
+        with self._lock:
+            self._inflight -= 1
+
+    async def acquire(self, priority: int = PRIORITY_MONITOR):
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, loop, self._clock())
+        with self._lock:
+            heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+
+        try:
+            while True:
+                wait_hint = self._dispatch()
+                if waiter.future.done():
+                    return
+                timeout = min(self.POLL_INTERVAL, wait_hint) if wait_hint > 0 else self.POLL_INTERVAL
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), timeout=timeout)
+                    return
+                except asyncio.TimeoutError:
+                    continue
+        except BaseException:
+            with self._lock:
+                waiter.abandoned = True
+                granted = waiter.granted
+            if granted:
+                self._release_slot()
+                self._dispatch()
+            raise
+
+    def release(self, status_code: Optional[int], latency: float):
+        """
+        Returns a slot and feeds the response into the AIMD concurrency controller.
+        """
+        with self._lock:
+            self._inflight -= 1
+            if status_code == 429:
+                self._limit = max(self.min_concurrency, self._limit * 0.5)
+                self._bucket.drain()
+                self._stats["throttled_429"] += 1
+            elif status_code is not None and latency > self.latency_target:
+                self._limit = max(self.min_concurrency, self._limit * 0.9)
+                self._stats["slow_responses"] += 1
+            elif status_code is not None and status_code < 500:
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[int] = None):
+        await self.acquire(current_priority() if priority is None else priority)
+        slot = _Slot()
+        started_at = self._clock()
+        try:
+            yield slot
+        finally:
+            self.release(slot.status_code, self._clock() - started_at)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, waiter in self._waiters:
+                if not waiter.abandoned:
+                    name = PRIORITY_NAMES.get(priority, str(priority))
+                    queued[name] = queued.get(name, 0) + 1
+            admitted = self._stats["admitted"]
+            return {
+                "concurrency_limit": round(self._limit, 2),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._inflight,
+                "tokens": round(self._bucket.tokens, 2),
+                "rate": self._bucket.rate,
+                "burst": self._bucket.burst,
+                "queued": queued,
+                "admitted": admitted,
+                "throttled_429": self._stats["throttled_429"],
+                "slow_responses": self._stats["slow_responses"],
+                "avg_wait_ms": round(self._stats["total_wait_seconds"] / admitted * 1000, 2) if admitted else 0.0
+            }
+
+class UpstreamRateLimiter:
+    """
+    Registry of HostLimiters shared by all services, keyed by upstream host.
+    Hosts without a configured limit are not throttled.
+    """
+
+    def __init__(self, limits: Dict[str, Dict]):
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._by_host: Dict[str, HostLimiter] = {}
+        for name, spec in limits.items():
+            limiter = HostLimiter(
+                name,
+                rate=spec["rate"],
+                burst=spec["burst"],
+                max_concurrency=spec["max_concurrency"],
+                latency_target=spec.get("latency_target", 2.0)
+            )
+            self._limiters[name] = limiter
+            for host in spec["hosts"]:
+                self._by_host[host] = limiter
+
+    def limiter_for(self, url: str) -> Optional[HostLimiter]:
+        return self._by_host.get(urlsplit(url).hostname or "")
+
+    @asynccontextmanager
+    async def limit(self, url: str, priority: Optional[int] = None):
+        """
+        Waits for admission to the upstream behind `url`. Usage:
+
+            async with rate_limiter.limit(url) as slot:
+                response = await client.get(url)
+                slot.record(response.status_code)
+        """
+        limiter = self.limiter_for(url)
+        if limiter is None:
+            yield _Slot()
+            return
+        async with limiter.slot(priority) as slot:
+            yield slot
+
+    def get_stats(self) -> Dict[str, Dict]:
+        return {name: limiter.get_stats() for name, limiter in self._limiters.items()}
+
+# Shared limiter used by all services
+rate_limiter = UpstreamRateLimiter(RATE_LIMITS)
@@ -0,0 +1,85 @@
+# backend/src/utils/seen_set.py
+
+import logging
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RotatingSeenSet:
+    """
+    Memory-bounded, time-windowed set for dropping duplicate events in O(1).
+    Keys live in two generations of dicts (key -> (first-seen time, source)). When the current
+    generation is older than `window` seconds or holds `max_entries` keys, it becomes the
+    previous generation and the old previous one is discarded wholesale. A key is
+    therefore remembered for at least `window` seconds (unless evicted early by the size
+    bound) and at most twice that, with no per-key expiry work.
+    """
+
+    def __init__(self, window: float, max_entries: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.max_entries = max_entries
+        self._clock = clock
+        self._current: Dict[Hashable, Tuple[float, Any]] = {}
+        self._previous: Dict[Hashable, Tuple[float, Any]] = {}
+        self._generation_started_at = clock()
+        self.checks = 0
+        self.duplicates = 0
+        self.rotations = 0
+
+    def _maybe_rotate(self, now: float):
+        if now - self._generation_started_at >= 2 * self.window:
+            # Idle for two windows: the current generation has expired as well
+            self._previous = {}
+            self._current = {}
+            self._generation_started_at = now
+            self.rotations += 1
+        elif now - self._generation_started_at >= self.window or len(self._current) >= self.max_entries:
+            self._previous = self._current
+            self._current = {}
+            self._generation_started_at = now
+            self.rotations += 1
+
+    def _entry(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        entry = self._current.get(key)
+        return entry if entry is not None else self._previous.get(key)
+
+    def first_seen(self, key: Hashable) -> Optional[float]:
+        entry = self._entry(key)
+        return entry[0] if entry is not None else None
+
+    def first_source(self, key: Hashable) -> Any:
+        """
+        Returns the `source` passed when the key was first seen (e.g. the endpoint that won).
+        """
+        entry = self._entry(key)
+        return entry[1] if entry is not None else None
+
+    def check_and_add(self, key: Hashable, source: Any = None) -> bool:
+        """
+        Records `key` and returns True if it was already seen within the window.
+        """
+        now = self._clock()
+        self._maybe_rotate(now)
+        self.checks += 1
+        if key in self._current or key in self._previous:
+            self.duplicates += 1
+            return True
+        self._current[key] = (now, source)
+        return False
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._current or key in self._previous
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+    def get_stats(self) -> Dict:
+        return {
+            "checks": self.checks,
+            "duplicates": self.duplicates,
+            "duplicate_rate": round(self.duplicates / self.checks, 4) if self.checks else 0.0,
+            "size": len(self),
+            "rotations": self.rotations,
+            "window_seconds": self.window
+        }
@@ -0,0 +1,170 @@
+# backend/src/utils/token_table.py
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numeric token fields held as float64 columns; missing values count as 0 like token.get(field, 0)
+TABLE_COLUMNS = ('liquidity', 'age_hours', 'volume_24h', 'buy_sell_ratio', 'price', 'market_cap', 'price_change_24h')
+
+# Columns with a sorted secondary index for range and top-N queries
+INDEXED_COLUMNS = ('liquidity', 'volume_24h', 'price_change_24h', 'age_hours', 'market_cap')
+
+Range = Tuple[Optional[float], Optional[float]]
+
+def _as_float(value) -> float:
+    # Upstream fields are occasionally strings or junk; anything non-numeric counts as missing
+    try:
+        number = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if number != number else number # NaN
+
+class TokenTable:
+    """
+    Immutable columnar view of one token universe snapshot.
+    Built once per refresh; filters run as vectorized masks over the columns and the
+    selected rows are cached per normalized criteria, so identical scanner requests
+    against the same snapshot are served from memory.
+
+    INDEXED_COLUMNS also get a sorted index (argsort order), so a range on one of them
+    is two binary searches and ordering by one walks the presorted rows instead of
+    sorting the matches.
+    """
+
+    MAX_CACHED_QUERIES = 256
+
+    def __init__(self, tokens: List[Dict]):
+        self.tokens = tokens
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.fromiter((_as_float(token.get(name)) for token in tokens), dtype=np.float64, count=len(tokens))
+            for name in TABLE_COLUMNS
+        }
+        self._order: Dict[str, np.ndarray] = {}
+        self._order_desc: Dict[str, np.ndarray] = {} # Ties keep snapshot order in both directions
+        self._sorted: Dict[str, np.ndarray] = {}
+        for name in INDEXED_COLUMNS:
+            order = np.argsort(self.columns[name], kind="stable")
+            self._order[name] = order
+            self._order_desc[name] = np.argsort(-self.columns[name], kind="stable")
+            self._sorted[name] = self.columns[name][order]
+        self._results: "OrderedDict[Hashable, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.query_hits = 0
+        self.query_misses = 0
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @staticmethod
+    def criteria_key(criteria: Dict[str, Range]) -> Tuple:
+        return tuple(sorted(
+            (name, bounds[0], bounds[1]) for name, bounds in criteria.items()
+            if bounds is not None and (bounds[0] is not None or bounds[1] is not None)
+        ))
+
+    def mask(self, criteria: Dict[str, Range]) -> np.ndarray:
+        """
+        Boolean row mask for inclusive (min, max) ranges per column; None leaves a side open.
+        """
+        mask = np.ones(len(self.tokens), dtype=bool)
+        for name, low, high in self.criteria_key(criteria):
+            column = self._column(name)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return mask
+
+    def _column(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            raise ValueError(f"Unknown token column: {name}")
+        return self.columns[name]
+
+    def range_rows(self, name: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """
+        Rows with low <= column <= high, found by binary search on the column's sorted index.
+        """
+        if name not in self._sorted:
+            raise ValueError(f"Column is not indexed: {name}")
+        values = self._sorted[name]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        end = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return self._order[name][start:end]
+
+    def _rows(self, key: Tuple) -> np.ndarray:
+        # Seed from the narrowest indexed range, then mask the remaining ranges over those rows only
+        indexed = [(name, low, high) for name, low, high in key if name in self._sorted]
+        if indexed:
+            candidates = [self.range_rows(name, low, high) for name, low, high in indexed]
+            seed = min(range(len(candidates)), key=lambda i: len(candidates[i]))
+            rows = np.sort(candidates[seed])
+            remaining = [criterion for i, criterion in enumerate(indexed) if i != seed]
+            remaining += [criterion for criterion in key if criterion[0] not in self._sorted]
+        else:
+            rows = np.arange(len(self.tokens))
+            remaining = list(key)
+
+        for name, low, high in remaining:
+            values = self._column(name)[rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            rows = rows[keep]
+        return rows
+
+    def select(self, criteria: Dict[str, Range], sort: Optional[str] = None,
+               descending: bool = True, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Returns the tokens matching all ranges in `criteria`, in snapshot order or ordered
+        by the indexed column `sort`, truncated to `limit`.
+        Callers must treat the returned token dicts as read-only.
+        """
+        if sort is not None and sort not in self._order:
+            raise ValueError(f"Column is not indexed: {sort}")
+        key = (self.criteria_key(criteria), sort, descending if sort else None, limit)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.query_hits += 1
+                return cached
+
+        rows = self._rows(key[0])
+        if sort is not None:
+            # Walk the presorted index keeping selected rows: O(n) with no per-query sort
+            selected = np.zeros(len(self.tokens), dtype=bool)
+            selected[rows] = True
+            order = self._order_desc[sort] if descending else self._order[sort]
+            rows = order[selected[order]]
+        if limit is not None:
+            rows = rows[:max(0, limit)]
+        result = [self.tokens[row] for row in rows.tolist()]
+        with self._lock:
+            self.query_misses += 1
+            self._results[key] = result
+            while len(self._results) > self.MAX_CACHED_QUERIES:
+                self._results.popitem(last=False)
+        return result
+
+    def top(self, sort: str, limit: int, criteria: Optional[Dict[str, Range]] = None, descending: bool = True) -> List[Dict]:
+        """
+        Top `limit` tokens by `sort`, e.g. top('volume_24h', 20, {'age_hours': (None, 6)}).
+        """
+        return self.select(criteria or {}, sort=sort, descending=descending, limit=limit)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rows": len(self.tokens),
+                "cached_queries": len(self._results),
+                "query_hits": self.query_hits,
+                "query_misses": self.query_misses
+            }
@@ -0,0 +1,102 @@
+# backend/src/utils/tx_decoder.py
+
+import base64
+import hashlib
+import logging
+from typing import List, Optional, Sequence, Union
+
+from solders.transaction import VersionedTransaction
+
+from utils.log_classifier import PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID, PUMP_CREATE, RAYDIUM_INIT, MINT_INIT
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5mW"
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+
+# SPL Token instruction tags: InitializeMint = 0, InitializeMint2 = 20 (mint is account 0)
+SPL_INITIALIZE_MINT_TAGS = (0, 20)
+# Anchor discriminator of the Pump.fun `create` instruction: sha256("global:create")[:8] (mint is account 0)
+PUMP_CREATE_DISCRIMINATOR = hashlib.sha256(b"global:create").digest()[:8]
+# Raydium AMM v4 Initialize2 tag; coin and pc mints are accounts 8 and 9
+RAYDIUM_INITIALIZE2_TAG = 1
+RAYDIUM_MINT_ACCOUNT_INDEXES = (8, 9)
+
+class LaunchInfo:
+    """
+    A token launch decoded from a transaction: the new mint, the fee payer and the layout it matched.
+    """
+    __slots__ = ("mint", "deployer", "kind")
+
+    def __init__(self, mint: str, deployer: Optional[str], kind: str):
+        self.mint = mint
+        self.deployer = deployer
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        return f"LaunchInfo(mint={self.mint!r}, deployer={self.deployer!r}, kind={self.kind!r})"
+
+def _account_keys(transaction: VersionedTransaction, loaded_addresses=None) -> List[str]:
+    """
+    Static account keys followed by any addresses loaded from lookup tables
+    (writable, then readonly), which is how v0 instruction account indexes are resolved.
+    """
+    keys = [str(key) for key in transaction.message.account_keys]
+    if loaded_addresses is not None:
+        keys.extend(str(key) for key in (loaded_addresses.writable or []))
+        keys.extend(str(key) for key in (loaded_addresses.readonly or []))
+    return keys
+
+def _account(keys: Sequence[str], accounts: bytes, position: int) -> Optional[str]:
+    if position >= len(accounts) or accounts[position] >= len(keys):
+        return None
+    return keys[accounts[position]]
+
+def decode_launch(transaction: VersionedTransaction, loaded_addresses=None) -> Optional[LaunchInfo]:
+    """
+    Finds the first top-level instruction that creates a token (SPL InitializeMint/2,
+    Pump.fun create, Raydium AMM v4 Initialize2) by matching raw instruction bytes.
+    `loaded_addresses` is the transaction meta's loaded address list, needed for v0
+    transactions whose instruction accounts reference lookup tables.
+    """
+    keys = _account_keys(transaction, loaded_addresses)
+    if not keys:
+        return None
+    deployer = keys[0]
+
+    for instruction in transaction.message.instructions:
+        if instruction.program_id_index >= len(keys):
+            continue
+        program_id = keys[instruction.program_id_index]
+        data = bytes(instruction.data)
+        accounts = bytes(instruction.accounts)
+
+        if program_id == TOKEN_PROGRAM_ID:
+            if data and data[0] in SPL_INITIALIZE_MINT_TAGS:
+                mint = _account(keys, accounts, 0)
+                if mint:
+                    return LaunchInfo(mint, deployer, MINT_INIT)
+
+        elif program_id == PUMP_FUN_PROGRAM_ID:
+            if data[:8] == PUMP_CREATE_DISCRIMINATOR:
+                mint = _account(keys, accounts, 0)
+                if mint:
+                    return LaunchInfo(mint, deployer, PUMP_CREATE)
+
+        elif program_id == RAYDIUM_LIQUIDITY_POOL_V4_ID:
+            if data and data[0] == RAYDIUM_INITIALIZE2_TAG:
+                for position in RAYDIUM_MINT_ACCOUNT_INDEXES:
+                    mint = _account(keys, accounts, position)
+                    # The quote side is usually WSOL; the launched token is the other mint
+                    if mint and mint != WSOL_MINT:
+                        return LaunchInfo(mint, deployer, RAYDIUM_INIT)
+    return None
+
+def decode_launch_from_bytes(raw: Union[bytes, str], loaded_addresses=None) -> Optional[LaunchInfo]:
+    """
+    Same as decode_launch for a serialized transaction, raw or base64-encoded
+    (as delivered by base64 getTransaction responses and transaction streams).
+    """
+    if isinstance(raw, str):
+        raw = base64.b64decode(raw)
+    return decode_launch(VersionedTransaction.from_bytes(raw), loaded_addresses)
@@ -0,0 +1,91 @@
+# backend/src/utils/ws_subscriptions.py
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from solders.rpc.responses import SubscriptionResult
+
+logger = logging.getLogger(__name__)
+
+class KeyedSubscriptions:
+    """
+    One websocket subscription per key (e.g. an account) on a single solana-py socket.
+
+    sync() subscribes only the keys that were added and unsubscribes the ones removed.
+    Each subscribe waits for the SubscriptionResult carrying the id of the request it
+    sent, so notifications of already confirmed subscriptions that arrive in between are
+    dispatched to `on_notification(key, event)` instead of being taken for a confirmation.
+    """
+
+    def __init__(self, subscribe: Callable[[Any, str], Awaitable[None]],
+                 unsubscribe: Callable[[Any, int], Awaitable[None]],
+                 on_notification: Callable[[str, Any], Awaitable[None]]):
+        self._subscribe = subscribe
+        self._unsubscribe = unsubscribe
+        self._on_notification = on_notification
+        self.by_key: Dict[str, int] = {}
+        self.by_subscription: Dict[int, str] = {}
+        self.subscribes = 0
+        self.unsubscribes = 0
+
+    def reset(self):
+        """
+        Forgets all subscriptions (the socket they lived on is gone).
+        """
+        self.by_key = {}
+        self.by_subscription = {}
+
+    async def sync(self, ws, keys: Iterable[str]) -> List[str]:
+        """
+        Makes the subscribed keys equal to `keys` and returns the newly subscribed ones.
+        """
+        keys = list(dict.fromkeys(keys))
+        wanted = set(keys)
+        for key in [key for key in self.by_key if key not in wanted]:
+            subscription_id = self.by_key.pop(key)
+            self.by_subscription.pop(subscription_id, None)
+            await self._unsubscribe(ws, subscription_id)
+            self.unsubscribes += 1
+
+        added = []
+        for key in keys:
+            if key in self.by_key:
+                continue
+            await self._subscribe(ws, key)
+            # solana-py numbers requests from an increasing counter: the newest is ours
+            request_id = max(ws.sent_subscriptions)
+            subscription_id = await self._confirm(ws, request_id)
+            self.by_key[key] = subscription_id
+            self.by_subscription[subscription_id] = key
+            self.subscribes += 1
+            added.append(key)
+        return added
+
+    async def _confirm(self, ws, request_id: int) -> int:
+        while True:
+            msg = await ws.recv()
+            subscription_id = None
+            pending = []
+            for item in (msg if isinstance(msg, list) else [msg]):
+                if isinstance(item, SubscriptionResult):
+                    if item.id == request_id:
+                        subscription_id = item.result
+                else:
+                    pending.append(item)
+            await self.dispatch(pending)
+            if subscription_id is not None:
+                return subscription_id
+
+    async def dispatch(self, msg):
+        """
+        Hands each notification in a received message to on_notification with its key;
+        confirmations and notifications of unknown subscriptions are ignored.
+        """
+        for event in (msg if isinstance(msg, list) else [msg]):
+            key = self.by_subscription.get(getattr(event, "subscription", None))
+            if key is None:
+                continue
+            try:
+                await self._on_notification(key, event)
+            except (AttributeError, KeyError, TypeError):
+                continue
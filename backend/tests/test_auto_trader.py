@@ -0,0 +1,127 @@
+import pytest
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+from services import auto_trader as auto_trader_module
+from services.auto_trader import AutoTraderService
+
+MINT = "mint1"
+
+@pytest.fixture
+def trader(monkeypatch):
+    monkeypatch.setattr(auto_trader_module, "save_position", MagicMock())
+    monkeypatch.setattr(auto_trader_module, "remove_position", MagicMock())
+    service = AutoTraderService()
+    service.config.update({
+        "take_profit_tiers": [{"target_x": 2.0, "sell_percentage": 0.5}],
+        "stop_loss_percentage": 0.2,
+        "trailing_stop_loss_percentage": 0.3,
+        "slippage": 1.5
+    })
+    service.wallet_service = MagicMock(get_token_balance=AsyncMock(return_value=100.0))
+    service.trading_service = MagicMock(execute_sell_order=AsyncMock(return_value={"success": True}))
+    service.owned_tokens = {MINT: {
+        "token_address": MINT, "token_symbol": "TKN", "buy_price": 1.0, "highest_price": 1.0,
+        "amount_tokens": 100.0, "initial_amount_tokens": 100.0, "metadata": {"hit_tp_tiers": []}
+    }}
+    return service
+
+@pytest.mark.asyncio
+async def test_price_tick_holds_without_touching_the_wallet(trader):
+    assert await trader.evaluate_position(MINT, 1.2) is None
+    trader.wallet_service.get_token_balance.assert_not_awaited()
+    assert trader.owned_tokens[MINT]["highest_price"] == 1.2
+
+@pytest.mark.asyncio
+async def test_take_profit_tier_sells_part_once(trader):
+    assert await trader.evaluate_position(MINT, 2.5) == "take_profit_2.0x"
+    assert trader.trading_service.execute_sell_order.await_args.kwargs["amount_tokens"] == 50.0
+    assert trader.owned_tokens[MINT]["amount_tokens"] == 50.0
+    # The tier is not hit twice; 2.5 is the new high, so 2.4 holds
+    assert await trader.evaluate_position(MINT, 2.4) is None
+
+@pytest.mark.asyncio
+async def test_failed_take_profit_sell_raises_and_keeps_the_tier(trader):
+    trader.trading_service.execute_sell_order = AsyncMock(return_value={"success": False, "error": "slippage"})
+    with pytest.raises(RuntimeError):
+        await trader.evaluate_position(MINT, 2.5)
+    assert trader.owned_tokens[MINT]["metadata"]["hit_tp_tiers"] == []
+    assert trader.owned_tokens[MINT]["amount_tokens"] == 100.0
+
+@pytest.mark.asyncio
+async def test_take_profit_with_nothing_to_sell_keeps_the_tier(trader):
+    trader.owned_tokens[MINT]["initial_amount_tokens"] = 0.0
+    assert await trader.evaluate_position(MINT, 2.5) is None
+    trader.trading_service.execute_sell_order.assert_not_awaited()
+    assert trader.owned_tokens[MINT]["metadata"]["hit_tp_tiers"] == []
+
+@pytest.mark.asyncio
+async def test_stop_loss_sells_real_balance_and_closes(trader):
+    trader.wallet_service.get_token_balance = AsyncMock(return_value=80.0)
+    assert await trader.evaluate_position(MINT, 0.7) == "trailing_stop_loss"
+    assert trader.trading_service.execute_sell_order.await_args.kwargs["amount_tokens"] == 80.0
+    assert MINT not in trader.owned_tokens
+
+@pytest.mark.asyncio
+async def test_busy_position_is_skipped_without_waiting(trader):
+    async with trader._position_lock(MINT):
+        assert trader.is_position_busy(MINT)
+        assert await trader.evaluate_position(MINT, 0.1, wait=False) is None
+    trader.trading_service.execute_sell_order.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_monitor_pass_is_not_blocked_by_a_slow_sell(trader):
+    template = trader.owned_tokens[MINT]
+    trader.owned_tokens = {mint: {**template, "token_address": mint, "metadata": {"hit_tp_tiers": []}}
+                           for mint in ("slow", "fast1", "fast2")}
+    trader.data_fetcher_service = MagicMock(get_prices=AsyncMock(return_value={"slow": 0.5, "fast1": 0.5, "fast2": 0.5}))
+    release = asyncio.Event()
+    sold = []
+
+    async def sell(token_address, **kwargs):
+        if token_address == "slow":
+            await release.wait() # Confirmation polling
+        sold.append(token_address)
+        return {"success": True}
+
+    trader.trading_service.execute_sell_order = AsyncMock(side_effect=sell)
+    # The pass returns without waiting for any sell
+    await asyncio.wait_for(trader._monitor_and_sell(), timeout=0.1)
+    await asyncio.sleep(0.01)
+
+    assert sorted(sold) == ["fast1", "fast2"]
+    assert trader.is_position_busy("slow")
+    # The next pass skips the position that is still selling
+    await trader._monitor_and_sell()
+    assert trader.get_stats()["monitor"]["skipped_busy"] == 1
+
+    release.set()
+    await asyncio.gather(*trader._monitor_tasks.values())
+    assert trader.owned_tokens == {}
+    assert trader.get_stats()["monitor_tasks"] == 0
+
+@pytest.mark.asyncio
+async def test_failed_balance_read_never_closes_a_position(trader):
+    trader.wallet_service.get_token_balance = AsyncMock(return_value=None) # RPC error
+
+    assert await trader.evaluate_position(MINT, 1.1, refresh_balance=True) is None
+    assert MINT in trader.owned_tokens and trader.owned_tokens[MINT]["amount_tokens"] == 100.0
+    # An exit that fires meanwhile is sized from the recorded balance
+    assert await trader.evaluate_position(MINT, 0.5) == "trailing_stop_loss"
+    assert trader.trading_service.execute_sell_order.await_args.kwargs["amount_tokens"] == 100.0
+    assert trader.get_stats()["monitor"]["unknown_balance"] == 2
+
+@pytest.mark.asyncio
+async def test_failed_emergency_sell_keeps_the_position_for_a_retry(trader, monkeypatch):
+    monkeypatch.setattr(auto_trader_module, "increment_rugs_avoided", MagicMock())
+    trader.trading_service.execute_sell_order = AsyncMock(return_value={"success": False, "error": "no route"})
+    with pytest.raises(RuntimeError):
+        await trader.handle_rugpull_alert({"token_address": MINT})
+    assert trader.owned_tokens[MINT]["metadata"]["emergency_exit_pending"]
+    auto_trader_module.increment_rugs_avoided.assert_not_called()
+
+    # The next monitoring pass retries the full sell even without a price
+    trader.trading_service.execute_sell_order = AsyncMock(return_value={"success": True})
+    assert await trader.evaluate_position(MINT, None, refresh_balance=True) == auto_trader_module.EMERGENCY_EXIT
+    assert trader.trading_service.execute_sell_order.await_args.kwargs["slippage"] == 100
+    assert MINT not in trader.owned_tokens
+    auto_trader_module.increment_rugs_avoided.assert_called_once()
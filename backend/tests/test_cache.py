@@ -0,0 +1,38 @@
+from utils.cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_per_namespace_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttls={"fast": 5, "slow": 60}, clock=clock)
+    cache.set("fast", "a", 1)
+    cache.set("slow", "a", 2)
+
+    clock.now = 10
+    assert cache.get("fast", "a") is None
+    assert cache.get("slow", "a") == 2
+
+    value, age = cache.get_with_age("slow", "a")
+    assert value == 2
+    assert age == 10
+
+def test_lru_eviction_is_bounded():
+    cache = TTLCache(max_entries=2, clock=FakeClock())
+    cache.set("ns", "a", 1)
+    cache.set("ns", "b", 2)
+    assert cache.get("ns", "a") == 1 # 'a' is now most recently used
+
+    cache.set("ns", "c", 3)
+    assert len(cache) == 2
+    assert cache.get("ns", "b") is None
+    assert cache.get("ns", "a") == 1
+    assert cache.get("ns", "c") == 3
+
+    stats = cache.get_stats()["namespaces"]["ns"]
+    assert stats["evicted"] == 1
+    assert stats["size"] == 2
@@ -0,0 +1,77 @@
+import pytest
+import asyncio
+import threading
+from services.event_bus import EventBus, NEW_TOKEN, RUGPULL_ALERT
+from utils.lane_queue import BLOCK
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_bounded_and_never_blocks_publisher():
+    bus = EventBus()
+    release = asyncio.Event()
+    running = []
+
+    async def slow_handler(data):
+        running.append(data)
+        await release.wait()
+
+    bus.subscribe(NEW_TOKEN, slow_handler, name="slow", max_queue=5, concurrency=2)
+    for i in range(200):
+        await asyncio.wait_for(bus.publish(NEW_TOKEN, i), timeout=0.1)
+    await asyncio.sleep(0.01)
+
+    stats = bus.get_stats()["subscribers"]["slow"]
+    assert stats["peak_in_flight"] == 2
+    assert stats["queue"]["depth"] == 5
+    assert stats["queue"]["dropped"] == 193
+    release.set()
+    await asyncio.sleep(0.01)
+    # The freshest events survive the burst
+    assert running[2:] == list(range(195, 200))
+    await bus.stop()
+
+@pytest.mark.asyncio
+async def test_sync_handler_runs_off_loop_and_failures_are_counted():
+    bus = EventBus()
+    threads = []
+
+    def handler(data):
+        threads.append(threading.current_thread())
+        if data == "bad":
+            raise RuntimeError("boom")
+
+    bus.subscribe(RUGPULL_ALERT, handler, name="sync", policy=BLOCK)
+    await bus.publish(RUGPULL_ALERT, "ok")
+    await bus.publish(RUGPULL_ALERT, "bad")
+    for _ in range(100):
+        stats = bus.get_stats()["subscribers"]["sync"]
+        if stats["processed"] + stats["failed"] == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert stats["processed"] == 1 and stats["failed"] == 1
+    assert stats["executor"] == "thread_pool"
+    assert threading.main_thread() not in threads
+    assert bus.get_stats()["published"][RUGPULL_ALERT] == 2
+    await bus.stop()
+
+def test_unknown_event_type_is_rejected():
+    with pytest.raises(ValueError):
+        EventBus().subscribe("price_tick", lambda data: None)
+
+@pytest.mark.asyncio
+async def test_publish_after_stop_restarts_workers():
+    bus = EventBus()
+    received = []
+
+    async def handler(data):
+        received.append(data)
+
+    bus.subscribe(NEW_TOKEN, handler, name="h")
+    await bus.publish(NEW_TOKEN, 1)
+    await bus.stop()
+    assert bus.get_stats()["subscribers"]["h"]["queue"] is None
+
+    await bus.publish(NEW_TOKEN, 2)
+    await asyncio.sleep(0.01)
+    assert 2 in received
+    await bus.stop()
@@ -0,0 +1,69 @@
+import pytest
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+from services.exit_engine import ExitEngine
+
+@pytest.fixture
+def engine():
+    auto_trader = MagicMock(trading_enabled=True, owned_tokens={"a": {}, "b": {}})
+    auto_trader.is_position_busy = MagicMock(return_value=False)
+    auto_trader.evaluate_position = AsyncMock(return_value=None)
+    data_fetcher = MagicMock(get_prices=AsyncMock(return_value={"a": 1.0, "b": 2.0}))
+    return ExitEngine(auto_trader, data_fetcher, poll_interval=0.01, nudge_interval=0.01)
+
+@pytest.mark.asyncio
+async def test_poll_evaluates_changed_prices_only(engine):
+    await engine._apply_prices({"a": 1.0, "b": 2.0})
+    await asyncio.sleep(0)
+    await engine._apply_prices({"a": 1.0, "b": 2.5})
+    await asyncio.sleep(0)
+
+    evaluated = [call.args[:2] for call in engine.auto_trader.evaluate_position.await_args_list]
+    assert evaluated == [("a", 1.0), ("b", 2.0), ("b", 2.5)]
+    assert engine.get_stats()["tick_to_decision"]["count"] == 3
+
+@pytest.mark.asyncio
+async def test_slow_exit_does_not_block_other_positions(engine):
+    release = asyncio.Event()
+
+    async def evaluate(token_address, price, wait=True):
+        if token_address == "a":
+            await release.wait()
+            return "stop_loss"
+        return None
+
+    engine.auto_trader.evaluate_position = AsyncMock(side_effect=evaluate)
+    await engine._apply_prices({"a": 0.5, "b": 2.0})
+    await asyncio.sleep(0)
+    await engine._apply_prices({"a": 0.4, "b": 1.9}) # "a" is still selling
+    await asyncio.sleep(0)
+
+    stats = engine.get_stats()
+    assert stats["skipped_busy"] == 1 and stats["evaluations"] == 3
+    release.set()
+    await asyncio.sleep(0.01)
+    assert engine.get_stats()["exits"] == 1
+
+@pytest.mark.asyncio
+async def test_nudge_reads_fresh_price(engine):
+    await engine.start()
+    await asyncio.sleep(0.005)
+    engine.nudge("a")
+    await asyncio.sleep(0.05)
+    await engine.stop()
+
+    # Polls bypass the price cache too, so its TTL never slows the tick
+    assert all(call.kwargs.get("fresh") for call in engine.data_fetcher_service.get_prices.await_args_list)
+    assert engine.get_stats()["polls"] >= 1
+
+@pytest.mark.asyncio
+async def test_failed_exit_is_retried_at_the_same_price(engine):
+    engine.auto_trader.evaluate_position = AsyncMock(side_effect=[RuntimeError("stop_loss sell failed"), "stop_loss"])
+    await engine._apply_prices({"a": 0.5})
+    await asyncio.sleep(0)
+    await engine._apply_prices({"a": 0.5})
+    await asyncio.sleep(0)
+
+    assert engine.auto_trader.evaluate_position.await_count == 2
+    stats = engine.get_stats()
+    assert stats["errors"] == 1 and stats["exits"] == 1
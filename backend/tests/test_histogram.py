@@ -0,0 +1,20 @@
+import json
+from utils.histogram import LatencyHistogram
+
+def test_percentiles_use_bucket_upper_bounds():
+    histogram = LatencyHistogram([10, 100])
+    for seconds in (0.005, 0.006, 0.05):
+        histogram.record(seconds)
+
+    stats = histogram.get_stats()
+    assert stats["p50_ms"] == 10 and stats["p90_ms"] == 100
+    assert stats["buckets"] == {"<=10": 2, "<=100": 1, ">100": 0}
+
+def test_overflow_percentiles_stay_valid_json():
+    histogram = LatencyHistogram([10, 100])
+    for _ in range(3):
+        histogram.record(12.0) # Far past the top bucket
+
+    stats = histogram.get_stats()
+    assert stats["p50_ms"] is None and stats["buckets"][">100"] == 3
+    json.dumps(stats, allow_nan=False)
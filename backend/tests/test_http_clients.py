@@ -0,0 +1,58 @@
+import pytest
+import asyncio
+import httpx
+from utils import http_clients as http_clients_module
+from utils.http_clients import HttpClientRegistry, _MeteredTransport
+from utils.rate_limiter import UpstreamRateLimiter
+
+POOLS = {
+    "birdeye": {"base_url": "https://public-api.birdeye.so/public", "max_connections": 4},
+    "jito": {"base_url": "https://mainnet.block-engine.jito.wtf", "max_connections": 2},
+}
+
+def test_client_is_shared_per_host():
+    registry = HttpClientRegistry(POOLS)
+    overview = registry.client_for("https://public-api.birdeye.so/public/token_overview?address=a")
+    security = registry.client_for("https://public-api.birdeye.so/public/token_security?address=a")
+    jito = registry.client_for("https://mainnet.block-engine.jito.wtf/api/v1/bundles")
+    other = registry.client_for("https://example.com/")
+
+    assert overview is security
+    assert overview is not jito
+    assert other is registry.client_for("https://another.example.org/")
+    assert set(registry.get_stats()) == {"birdeye", "jito", "default"}
+
+@pytest.mark.asyncio
+async def test_metered_transport_tracks_requests():
+    transport = _MeteredTransport(httpx.MockTransport(lambda request: httpx.Response(200)))
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("https://public-api.birdeye.so/public")
+        await client.get("https://public-api.birdeye.so/public")
+
+    assert transport.requests == 2
+    assert transport.in_flight == 0
+    assert transport.peak_in_flight == 1
+    assert transport.last_used is not None
+
+@pytest.mark.asyncio
+async def test_prewarm_is_rate_limited_and_stays_on_the_home_loop(monkeypatch):
+    registry = HttpClientRegistry(POOLS)
+    limiter = UpstreamRateLimiter({"jito": {"hosts": ["mainnet.block-engine.jito.wtf"], "rate": 10, "burst": 10,
+                                            "max_concurrency": 2}})
+    monkeypatch.setattr(http_clients_module, "rate_limiter", limiter)
+    mock = httpx.MockTransport(lambda request: httpx.Response(405))
+    monkeypatch.setattr(httpx, "AsyncHTTPTransport", lambda **kwargs: mock)
+
+    await registry.start()
+    home_client = registry.client_for("https://mainnet.block-engine.jito.wtf")
+    assert limiter.get_stats()["jito"]["admitted"] == 1
+    assert registry.get_stats()["jito"]["requests"] == 1
+
+    # Another loop (e.g. a Flask request) never receives the pre-warmed pool
+    other_loop_client = await asyncio.to_thread(
+        asyncio.run, _client_on_new_loop(registry, "https://mainnet.block-engine.jito.wtf"))
+    assert other_loop_client is not home_client
+    await registry.aclose()
+
+async def _client_on_new_loop(registry, url):
+    return registry.client_for(url)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from utils.ohlcv_store import OHLCVSeries
+from utils.indicators import OHLCVBatch, compute_indicators, ema, screen_mask
+
+def _series(closes, volumes=None):
+    series = OHLCVSeries()
+    volumes = volumes or [10] * len(closes)
+    series.merge(range(len(closes)), closes, [c + 1 for c in closes], [c - 1 for c in closes], closes, volumes)
+    return series
+
+def test_batch_right_aligns_and_pads_short_series():
+    batch = OHLCVBatch([_series([1.0, 2.0, 3.0]), _series([5.0]), None], bars=3)
+
+    assert batch.close[0].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(batch.close[1, :2]).all() and batch.close[1, 2] == 5.0
+    assert np.isnan(batch.close[2]).all()
+    assert batch.lengths.tolist() == [3, 1, 0]
+
+def test_indicators_match_per_token_computation():
+    rising = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    falling = list(reversed(rising))
+    batch = OHLCVBatch([_series(rising, [1, 2, 1, 2, 1, 2, 1, 9]), _series(falling)], bars=8)
+    indicators = compute_indicators(batch, momentum_period=4)
+
+    assert indicators["vwap"][1] == pytest.approx(np.mean(falling))
+    assert indicators["rsi"].tolist() == [100.0, 0.0]
+    assert indicators["momentum"][0] == pytest.approx(8.0 / 4.0 - 1)
+    assert indicators["volume_zscore"][0] > 3
+    assert indicators["atr"][1] == pytest.approx(2.0)
+    # Batched EMA equals a single-row EMA
+    assert ema(batch.close, 3)[0, -1] == pytest.approx(ema(np.array([rising]), 3)[0, -1])
+
+def test_screen_mask_passes_rows_without_history():
+    prices = np.array([10.0, 10.0, 10.0])
+    indicators = {"vwap": np.array([5.0, 9.0, np.nan]), "rsi": np.array([50.0, 90.0, np.nan])}
+
+    assert screen_mask(prices, indicators, {"max_vwap_ratio": 1.5}).tolist() == [False, True, True]
+    assert screen_mask(prices, indicators, {"max_vwap_ratio": 1.5, "max_rsi": 80}).tolist() == [False, False, True]
+    assert screen_mask(prices, indicators, {}).all()
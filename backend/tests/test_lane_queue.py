@@ -0,0 +1,35 @@
+import pytest
+import asyncio
+from utils.lane_queue import LaneQueue, BLOCK, DROP_OLDEST
+
+@pytest.mark.asyncio
+async def test_higher_lane_is_served_first():
+    queue = LaneQueue({"launch": (10, BLOCK), "events": (10, DROP_OLDEST)})
+    await queue.put("events", "e1")
+    await queue.put("launch", "l1")
+
+    assert await queue.get() == ("launch", "l1")
+    assert await queue.get() == ("events", "e1")
+
+@pytest.mark.asyncio
+async def test_drop_oldest_lane_discards_and_counts():
+    queue = LaneQueue({"events": (2, DROP_OLDEST)})
+    for item in ("a", "b", "c"):
+        await queue.put("events", item)
+
+    assert queue.get_stats()["events"]["dropped"] == 1
+    assert [await queue.get(), await queue.get()] == [("events", "b"), ("events", "c")]
+
+@pytest.mark.asyncio
+async def test_block_lane_applies_backpressure_without_dropping():
+    queue = LaneQueue({"launch": (1, BLOCK)})
+    await queue.put("launch", "a")
+    producer = asyncio.create_task(queue.put("launch", "b"))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+
+    assert await queue.get() == ("launch", "a")
+    await asyncio.wait_for(producer, 1)
+    assert await queue.get() == ("launch", "b")
+    stats = queue.get_stats()["launch"]
+    assert stats["dropped"] == 0 and stats["blocked_puts"] == 1
@@ -0,0 +1,22 @@
+from utils.log_classifier import (classify_logs, PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID,
+                                  PUMP_CREATE, RAYDIUM_INIT, MINT_INIT, LIQUIDITY_WITHDRAW, TOKEN_BURN, ACCOUNT_CLOSED)
+
+def test_launch_kinds():
+    assert classify_logs([f"Program {PUMP_FUN_PROGRAM_ID} invoke [1]", "Program log: Instruction: Create"]).launch_kind == PUMP_CREATE
+    assert classify_logs([f"Program {RAYDIUM_LIQUIDITY_POOL_V4_ID} invoke [1]", "Program log: Instruction: Initialize2"]).launch_kind == RAYDIUM_INIT
+    assert classify_logs(["Program log: Instruction: InitializeMint2"]).launch_kind == MINT_INIT
+    # Create without the Pump.fun program is not a Pump.fun launch
+    assert classify_logs(["Program log: Instruction: Create"]).launch_kind is None
+
+def test_rug_reason_uses_first_matching_line_and_burn_excludes_mint():
+    result = classify_logs(["Program log: Instruction: Transfer", "Program log: Instruction: Burn", "Program log: close account"])
+    assert result.rug_reason == TOKEN_BURN
+    assert result.rug_log == "Program log: Instruction: Burn"
+
+    assert classify_logs(["Program log: BurnMint", "Program log: Close Account"]).rug_reason == ACCOUNT_CLOSED
+    assert classify_logs(["Program log: Withdraw Liquidity and burn"]).rug_reason == LIQUIDITY_WITHDRAW
+
+def test_unrelated_logs_have_no_labels():
+    result = classify_logs(["Program log: Instruction: TransferChecked"])
+    assert result.labels == frozenset() and result.launch_kind is None and result.rug_reason is None
+    assert classify_logs([]).labels == frozenset()
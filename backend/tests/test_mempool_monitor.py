@@ -0,0 +1,292 @@
+import pytest
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock, AsyncMock
+from solders.signature import Signature
+from solders.rpc.responses import parse_websocket_message
+from services.mempool_monitor import MempoolMonitorService, PUMP_FUN_PROGRAM_ID
+from services.event_bus import EventBus, HELD_RUGPULL_ALERT
+from utils.lane_queue import BLOCK
+
+@pytest.fixture
+def monitor():
+    service = MempoolMonitorService(event_bus=EventBus())
+    service._solana_client = MagicMock()
+    service._solana_client.get_transaction = AsyncMock(return_value=MagicMock(value=None))
+    return service
+
+TRANSFER_LOGS = [
+    "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5mW invoke [1]",
+    "Program log: Instruction: Transfer",
+]
+PUMP_CREATE_LOGS = [
+    f"Program {PUMP_FUN_PROGRAM_ID} invoke [1]",
+    "Program log: Instruction: Create",
+]
+
+@pytest.mark.asyncio
+async def test_non_candidate_logs_never_fetch_transaction(monitor):
+    for i in range(5):
+        await monitor._process_mempool_event(f"sig{i}", TRANSFER_LOGS)
+
+    monitor.solana_client.get_transaction.assert_not_called()
+    assert monitor.get_stats()["dropped"]["not_candidate"] == 5
+
+@pytest.mark.asyncio
+async def test_launch_candidate_fetches_transaction_once(monitor):
+    await monitor._process_mempool_event("1111111111111111111111111111111111111111111111111111111111111111", PUMP_CREATE_LOGS)
+    await asyncio.sleep(0)
+
+    assert monitor.solana_client.get_transaction.await_count == 1
+    stats = monitor.get_stats()
+    assert stats["launch_candidates"] == 1
+    assert stats["dropped"]["tx_not_found"] == 1
+
+@pytest.mark.asyncio
+async def test_reader_queues_by_lane_and_workers_drain(monitor, monkeypatch):
+    monkeypatch.setattr("services.mempool_monitor.MEMPOOL_WORKERS", 2)
+    monitor._monitor_transactions = AsyncMock()
+    await monitor.start_monitoring()
+
+    await monitor._enqueue_event("sig", TRANSFER_LOGS)
+    await monitor._enqueue_event("1111111111111111111111111111111111111111111111111111111111111111", PUMP_CREATE_LOGS)
+    await asyncio.sleep(0.01)
+
+    stats = monitor.get_stats()
+    assert stats["logs_received"] == 2
+    assert stats["queue"]["launch"]["dequeued"] == 1
+    assert stats["queue"]["events"]["dequeued"] == 1
+    assert monitor.solana_client.get_transaction.await_count == 1
+    await monitor.stop_monitoring()
+    assert stats["workers"] == 2 and monitor.worker_tasks == []
+
+@pytest.mark.asyncio
+async def test_duplicate_signatures_and_mints_are_dropped(monitor):
+    monitor.event_queue = MagicMock(put=AsyncMock())
+    for _ in range(3):
+        await monitor._enqueue_event("sig", PUMP_CREATE_LOGS)
+    assert monitor.event_queue.put.await_count == 1
+
+    await monitor._emit_new_token("mint")
+    await monitor._emit_new_token("mint")
+    stats = monitor.get_stats()
+    assert stats["dropped"]["duplicate_signature"] == 2
+    assert stats["dropped"]["duplicate_mint"] == 1
+    assert stats["new_tokens"] == 1
+
+@pytest.mark.asyncio
+async def test_first_endpoint_to_deliver_wins(monitor):
+    monitor.event_queue = MagicMock(put=AsyncMock())
+    for url in ("wss://a", "wss://b"):
+        monitor._endpoint_stats[url] = monitor._new_endpoint_stats()
+
+    await monitor._enqueue_event("sig1", TRANSFER_LOGS, source="wss://a")
+    await monitor._enqueue_event("sig1", TRANSFER_LOGS, source="wss://b")
+    await monitor._enqueue_event("sig2", TRANSFER_LOGS, source="wss://b")
+
+    assert monitor.event_queue.put.await_count == 2
+    endpoints = monitor.get_stats()["endpoints"]
+    assert endpoints["wss://a"]["first_arrivals"] == 1
+    assert endpoints["wss://b"]["first_arrivals"] == 1
+    assert endpoints["wss://b"]["events"] == 2
+    assert endpoints["wss://b"]["lag_behind_first"]["count"] == 1
+    assert endpoints["wss://a"]["lag_behind_first"]["count"] == 0
+
+def _signature_info(signature, slot, err=None, block_time=None):
+    return MagicMock(signature=signature, slot=slot, err=err, block_time=block_time)
+
+@pytest.mark.asyncio
+async def test_backfill_replays_gap_until_last_slot(monitor, monkeypatch):
+    monkeypatch.setattr("services.mempool_monitor.MEMPOOL_BACKFILL_PAGE_SIZE", 2)
+    monitor.is_running = True
+    monitor._backfill_bucket = MagicMock(try_acquire=MagicMock(return_value=0))
+    monitor.event_queue = MagicMock(put=AsyncMock())
+    old, seen, failed, new = (str(Signature.new_unique()) for _ in range(4))
+    monitor._seen_signatures.check_and_add(seen)
+    pages = [
+        MagicMock(value=[_signature_info(new, 105), _signature_info(seen, 104)]),
+        MagicMock(value=[_signature_info(failed, 103, err="failed"), _signature_info(old, 101)]),
+        MagicMock(value=[_signature_info(str(Signature.new_unique()), 99)]),
+    ]
+    monitor._solana_client.get_signatures_for_address = AsyncMock(side_effect=pages + [MagicMock(value=[])])
+    transaction = MagicMock()
+    transaction.value.transaction.meta.log_messages = PUMP_CREATE_LOGS
+    monitor._solana_client.get_transaction = AsyncMock(return_value=transaction)
+
+    await monitor._backfill_gap(100)
+
+    stats = monitor.get_stats()["backfill"]
+    assert stats["signatures"] == 3
+    assert stats["already_seen"] == 1
+    assert stats["replayed"] == 2
+    assert monitor.solana_client.get_transaction.await_count == 2
+    # Replayed oldest first and the newest replayed slot becomes the resume point
+    replayed = [call.args[1][0] for call in monitor.event_queue.put.await_args_list]
+    assert replayed == [old, new]
+    assert monitor.last_slot == 105
+    # Queued with the fetched transaction so the worker decodes it without a refetch
+    assert all(call.args[1][3] is transaction.value.transaction for call in monitor.event_queue.put.await_args_list)
+
+@pytest.mark.asyncio
+async def test_backfill_skips_stale_gap_transactions(monitor, monkeypatch):
+    monkeypatch.setattr("services.mempool_monitor.MEMPOOL_BACKFILL_MAX_AGE", 60)
+    monitor.is_running = True
+    monitor._backfill_bucket = MagicMock(try_acquire=MagicMock(return_value=0))
+    monitor.event_queue = MagicMock(put=AsyncMock())
+    stale, fresh = (str(Signature.new_unique()) for _ in range(2))
+    now = int(time.time())
+    monitor._solana_client.get_signatures_for_address = AsyncMock(side_effect=[
+        MagicMock(value=[_signature_info(fresh, 102, block_time=now), _signature_info(stale, 101, block_time=now - 600)]),
+        MagicMock(value=[]), MagicMock(value=[]),
+    ])
+    transaction = MagicMock()
+    transaction.value.transaction.meta.log_messages = PUMP_CREATE_LOGS
+    monitor._solana_client.get_transaction = AsyncMock(return_value=transaction)
+
+    await monitor._backfill_gap(100)
+
+    assert monitor.get_stats()["backfill"]["stale"] == 1
+    assert monitor.solana_client.get_transaction.await_count == 1
+    assert [call.args[1][0] for call in monitor.event_queue.put.await_args_list] == [fresh]
+
+@pytest.mark.asyncio
+async def test_prefetched_launch_is_not_fetched_again(monitor):
+    transaction = MagicMock()
+    transaction.meta.pre_balances = [0]
+    transaction.meta.post_balances = [0]
+    await monitor._process_mempool_event("1111111111111111111111111111111111111111111111111111111111111111",
+                                         PUMP_CREATE_LOGS, transaction=transaction)
+
+    monitor.solana_client.get_transaction.assert_not_called()
+    assert monitor.get_stats()["dropped"]["small_sol_transfer"] == 1
+
+@pytest.mark.asyncio
+async def test_backfill_starts_only_when_every_endpoint_was_down(monitor):
+    monitor._backfill_gap = AsyncMock()
+    for url in ("wss://a", "wss://b"):
+        monitor._endpoint_stats[url] = monitor._new_endpoint_stats()
+
+    monitor._maybe_start_backfill("wss://a")
+    assert monitor.backfill_task is None # Nothing processed yet
+
+    monitor.last_slot = 50
+    monitor._endpoint_stats["wss://b"]["connected"] = True
+    monitor._maybe_start_backfill("wss://a")
+    assert monitor.backfill_task is None
+
+    monitor._endpoint_stats["wss://b"]["connected"] = False
+    monitor._maybe_start_backfill("wss://a")
+    await monitor.backfill_task
+    monitor._backfill_gap.assert_awaited_once_with(50)
+
+HELD_MINT = "So11111111111111111111111111111111111111112"
+HELD_POOL = "58oQChx4yWmvKdwLLZzBi4ChoCc2fqCUWBkwMihLYQo2"
+BURN_LOGS = [
+    "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5mW invoke [1]",
+    "Program log: Instruction: Burn",
+]
+WITHDRAW_LOGS = ["Program log: Withdraw liquidity"]
+
+@pytest.mark.asyncio
+async def test_held_mint_alerts_carry_token_address(monitor):
+    monitor.event_bus.publish = AsyncMock()
+    monitor.set_held_positions({HELD_MINT: [HELD_POOL]})
+
+    # A holder burning tokens is not a rug; the same burn on the pool account is
+    await monitor._handle_held_logs(HELD_MINT, "sig1", BURN_LOGS)
+    assert monitor.event_bus.publish.await_count == 0
+    await monitor._handle_held_logs(HELD_POOL, "sig2", BURN_LOGS)
+    await monitor._handle_held_logs(HELD_MINT, "sig3", WITHDRAW_LOGS)
+    await monitor._handle_held_logs(HELD_POOL, "sig3", WITHDRAW_LOGS) # Same tx via the pool
+
+    alerts = [call.args[1] for call in monitor.event_bus.publish.await_args_list]
+    assert [(alert["signature"], alert["token_address"]) for alert in alerts] == [("sig2", HELD_MINT), ("sig3", HELD_MINT)]
+    assert {call.args[0] for call in monitor.event_bus.publish.await_args_list} == {HELD_RUGPULL_ALERT}
+    assert alerts[1]["reason"] == "Liquidity Withdrawal"
+    held = monitor.get_stats()["held"]
+    assert held["mints"] == 1 and held["accounts"] == 2 and held["alerts"] == 2
+
+def test_held_set_changes_bump_version(monitor):
+    monitor.set_held_positions({HELD_MINT: []})
+    version = monitor._held_version
+    monitor.set_held_positions({HELD_MINT: []})
+    assert monitor._held_version == version
+    monitor.set_held_positions({})
+    assert monitor._held_version == version + 1
+
+class ScriptedSocket:
+    """
+    Stands in for the solana-py websocket: numbers requests like it and replays `replies`
+    (request id -> raw messages received after that request is sent).
+    """
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.sent_subscriptions = {}
+        self.unsubscribed = []
+        self.inbox = []
+
+    def _send(self, request):
+        request_id = len(self.sent_subscriptions) + len(self.unsubscribed) + 1
+        self.sent_subscriptions[request_id] = request
+        self.inbox.extend(self.replies.get(request_id, []))
+
+    async def logs_subscribe(self, filter_, commitment=None):
+        self._send(filter_)
+
+    async def logs_unsubscribe(self, subscription):
+        self.unsubscribed.append(subscription)
+
+    async def recv(self):
+        return parse_websocket_message(self.inbox.pop(0))
+
+def _confirmation(request_id, subscription):
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "result": subscription})
+
+def _logs_notification(subscription, signature, logs):
+    return json.dumps({"jsonrpc": "2.0", "method": "logsNotification", "params": {
+        "subscription": subscription,
+        "result": {"context": {"slot": 7}, "value": {"signature": signature, "err": None, "logs": logs}}
+    }})
+
+@pytest.mark.asyncio
+async def test_held_subscriptions_match_confirmations_by_request_id(monitor):
+    monitor.event_bus.publish = AsyncMock()
+    monitor.set_held_positions({HELD_MINT: [HELD_POOL]})
+    signature = str(Signature.new_unique())
+    ws = ScriptedSocket({
+        1: [_confirmation(1, 10)],
+        # A notification for the first subscription lands before the second confirmation
+        2: [_logs_notification(10, signature, WITHDRAW_LOGS), _confirmation(2, 11)],
+    })
+
+    added = await monitor._held_subscriptions.sync(ws, list(monitor._held_accounts))
+
+    assert added == [HELD_MINT, HELD_POOL]
+    assert monitor._held_subscriptions.by_subscription == {10: HELD_MINT, 11: HELD_POOL}
+    alerts = [call.args[1] for call in monitor.event_bus.publish.await_args_list]
+    assert [(alert["signature"], alert["token_address"]) for alert in alerts] == [(signature, HELD_MINT)]
+
+    # Dropping the mint's own subscription leaves the pool's untouched
+    assert await monitor._held_subscriptions.sync(ws, [HELD_POOL]) == []
+    assert ws.unsubscribed == [10]
+    assert monitor._held_subscriptions.by_key == {HELD_POOL: 11}
+
+@pytest.mark.asyncio
+async def test_unresolved_alerts_never_block_on_the_held_alert_queue(monitor):
+    release = asyncio.Event()
+
+    async def emergency_sell(alert):
+        await release.wait()
+
+    monitor.on_held_rugpull(emergency_sell, name="held", policy=BLOCK, max_queue=1, concurrency=1)
+    # Mempool-wide burns and closes are not ours: a busy emergency-exit subscriber never sees them
+    for i in range(50):
+        await asyncio.wait_for(monitor._process_rugpull_indicators(f"sig{i}", BURN_LOGS), timeout=0.1)
+
+    stats = monitor.event_bus.get_stats()
+    assert stats["published"]["rugpull_alert"] == 50
+    assert stats["subscribers"]["held"]["queue"]["depth"] == 0
+    release.set()
+    await monitor.event_bus.stop()
@@ -0,0 +1,45 @@
+import pytest
+from utils.ohlcv_store import OHLCVSeries, OHLCVStore, interval_seconds
+
+def test_interval_seconds():
+    assert interval_seconds("15m") == 900
+    assert interval_seconds("1H") == 3600
+    assert interval_seconds("1d") == 86400
+    assert interval_seconds("1m") == 60
+    assert interval_seconds("1M") == 30 * 86400 # Month, not minute
+    with pytest.raises(ValueError):
+        interval_seconds("weekly")
+
+def test_merge_replaces_overlapping_bars_and_trims():
+    series = OHLCVSeries(max_bars=3)
+    series.merge([10, 20], [1, 2], [1, 2], [1, 2], [1.0, 2.0], [5, 5])
+    series.merge([20, 30, 40], [2, 3, 4], [2, 3, 4], [2, 3, 4], [2.5, 3.0, 4.0], [5, 5, 5])
+
+    assert series.timestamps.tolist() == [20, 30, 40]
+    assert series.close.tolist() == [2.5, 3.0, 4.0]
+    assert series.last_timestamp == 40
+
+def test_tail_vwap_and_records():
+    series = OHLCVSeries()
+    series.merge([1, 2, 3], [1, 1, 1], [1, 1, 1], [1, 1, 1], [1.0, 2.0, 4.0], [0, 10, 30])
+
+    assert series.tail(2).vwap() == pytest.approx((2.0 * 10 + 4.0 * 30) / 40)
+    assert series.tail(1).to_records()[0]["price"] == 4.0
+    # Bars older than the window are left out even when they fit in `limit`
+    assert series.tail(3, time_from=2).close.tolist() == [2.0, 4.0]
+    # No volume falls back to the last close
+    empty_volume = OHLCVSeries()
+    empty_volume.merge([1], [1], [1], [1], [5.0], [0])
+    assert empty_volume.vwap() == 5.0
+
+def test_store_covers_and_evicts_least_recently_used():
+    store = OHLCVStore(max_series=2)
+    first = store.series("a", "1h")
+    first.mark_fetched(100)
+    assert first.covers(150) and not first.covers(50)
+
+    store.series("b", "1h")
+    store.get("a", "1h")
+    store.series("c", "1h")
+    assert store.get("b", "1h") is None
+    assert store.get("a", "1h") is first
@@ -0,0 +1,32 @@
+import struct
+from solders.pubkey import Pubkey
+from utils.pool_decoder import (
+    RAYDIUM_AMM_SIZE, RAYDIUM_COIN_VAULT_OFFSET, RAYDIUM_PC_VAULT_OFFSET, RAYDIUM_COIN_MINT_OFFSET, RAYDIUM_PC_MINT_OFFSET,
+    bonding_curve_address, decode_bonding_curve, decode_raydium_pool, decode_token_amount
+)
+
+WSOL = "So11111111111111111111111111111111111111112"
+
+def test_decode_raydium_pool_reads_vaults_and_quote_side():
+    coin_vault, pc_vault, coin_mint = (Pubkey.new_unique() for _ in range(3))
+    data = bytearray(RAYDIUM_AMM_SIZE)
+    for offset, key in ((RAYDIUM_COIN_VAULT_OFFSET, coin_vault), (RAYDIUM_PC_VAULT_OFFSET, pc_vault),
+                        (RAYDIUM_COIN_MINT_OFFSET, coin_mint), (RAYDIUM_PC_MINT_OFFSET, Pubkey.from_string(WSOL))):
+        data[offset:offset + 32] = bytes(key)
+
+    pool = decode_raydium_pool(bytes(data))
+    assert pool.coin_mint == str(coin_mint) and pool.pc_mint == WSOL
+    assert pool.quote_vault(str(coin_mint)) == str(pc_vault)
+    assert decode_raydium_pool(bytes(100)) is None
+
+def test_decode_token_amount_and_bonding_curve():
+    token_account = bytes(64) + struct.pack("<Q", 123456789) + bytes(93)
+    assert decode_token_amount(token_account) == 123456789
+
+    curve = decode_bonding_curve(bytes(8) + struct.pack("<5Q?", 1, 2, 3, 4_000_000_000, 5, False))
+    assert curve.real_sol_reserves == 4_000_000_000 and curve.complete is False
+
+def test_bonding_curve_address_is_deterministic_pda():
+    mint = str(Pubkey.new_unique())
+    assert bonding_curve_address(mint) == bonding_curve_address(mint)
+    assert not Pubkey.from_string(bonding_curve_address(mint)).is_on_curve()
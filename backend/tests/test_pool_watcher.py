@@ -0,0 +1,116 @@
+import pytest
+import json
+import base64
+import struct
+from unittest.mock import AsyncMock, MagicMock
+from solders.rpc.responses import parse_websocket_message
+from services.event_bus import EventBus, LIQUIDITY_DROP
+from services.pool_watcher import PoolWatcherService, BONDING_CURVE, QUOTE_VAULT
+
+MINT = "So11111111111111111111111111111111111111112"
+CURVE = "11111111111111111111111111111111"
+VAULT = "SysvarRent111111111111111111111111111111111"
+
+def _curve(real_sol, complete=False):
+    return bytes(8) + struct.pack("<5Q?", 0, 0, 0, real_sol, 0, complete)
+
+def _token_account(amount):
+    return bytes(64) + struct.pack("<Q", amount) + bytes(93)
+
+@pytest.fixture
+def watcher():
+    service = PoolWatcherService(event_bus=EventBus(), threshold=0.3)
+    service.event_bus.publish = AsyncMock()
+    service._watches = {CURVE: (MINT, BONDING_CURVE), VAULT: (MINT, QUOTE_VAULT)}
+    return service
+
+@pytest.mark.asyncio
+async def test_liquidity_drop_fires_once_past_threshold(watcher):
+    for amount, slot in ((100, 1), (120, 2), (96, 4)): # 20% below the 120 of two slots ago: not yet
+        await watcher._on_account_update(VAULT, _token_account(amount), slot)
+    watcher.event_bus.publish.assert_not_awaited()
+
+    await watcher._on_account_update(VAULT, _token_account(84), slot=6)
+    await watcher._on_account_update(VAULT, _token_account(10), slot=7)
+
+    watcher.event_bus.publish.assert_awaited_once()
+    event_type, data = watcher.event_bus.publish.await_args.args
+    assert event_type == LIQUIDITY_DROP
+    assert data["token_address"] == MINT and data["drop_percentage"] == 30.0 and data["slot"] == 6
+    assert data["reference_reserve"] == 120
+
+@pytest.mark.asyncio
+async def test_gradual_sells_do_not_alert(watcher):
+    amount = 1_000
+    for slot in range(0, 400, 40): # 10% sold every 40 slots: 65% below the peak in the end
+        await watcher._on_account_update(VAULT, _token_account(amount), slot)
+        amount = amount * 9 // 10
+
+    watcher.event_bus.publish.assert_not_awaited()
+    assert watcher.get_stats()["pools"][VAULT]["peak_reserve"] == 1_000
+
+@pytest.mark.asyncio
+async def test_bonding_curve_drains_only_nudge_listeners(watcher):
+    nudged = []
+    watcher.on_reserve_update(nudged.append)
+    await watcher._on_account_update(CURVE, _curve(80_000_000_000), slot=1)
+    await watcher._on_account_update(CURVE, _curve(8_000_000_000), slot=2)
+
+    watcher.event_bus.publish.assert_not_awaited()
+    assert nudged == [MINT, MINT]
+
+@pytest.mark.asyncio
+async def test_completed_bonding_curve_is_a_migration_not_a_rug(watcher):
+    await watcher._on_account_update(CURVE, _curve(80_000_000_000))
+    await watcher._on_account_update(CURVE, _curve(0, complete=True))
+
+    watcher.event_bus.publish.assert_not_awaited()
+    assert watcher.get_stats()["migrations"] == 1
+
+@pytest.mark.asyncio
+async def test_seed_reads_current_reserves_before_streaming(watcher):
+    watcher._solana_client = MagicMock()
+    watcher._solana_client.get_multiple_accounts = AsyncMock(return_value=MagicMock(
+        value=[MagicMock(data=_curve(50)), MagicMock(data=_token_account(200))], context=MagicMock(slot=7)
+    ))
+    await watcher._seed_reserves()
+    # A rug landing as the first streamed update is measured against the seeded peak
+    await watcher._on_account_update(VAULT, _token_account(20))
+
+    assert watcher.event_bus.publish.await_count == 1
+    assert watcher.get_stats()["pools"][CURVE]["reserve"] == 50
+
+class ScriptedSocket:
+    def __init__(self, replies):
+        self.replies = replies
+        self.sent_subscriptions = {}
+        self.inbox = []
+
+    async def account_subscribe(self, pubkey, commitment=None, encoding=None):
+        request_id = len(self.sent_subscriptions) + 1
+        self.sent_subscriptions[request_id] = pubkey
+        self.inbox.extend(self.replies.get(request_id, []))
+
+    async def recv(self):
+        return parse_websocket_message(self.inbox.pop(0))
+
+def _account_notification(subscription, data, slot):
+    return json.dumps({"jsonrpc": "2.0", "method": "accountNotification", "params": {
+        "subscription": subscription,
+        "result": {"context": {"slot": slot}, "value": {
+            "lamports": 1, "data": [base64.b64encode(data).decode(), "base64"], "owner": CURVE,
+            "executable": False, "rentEpoch": 0, "space": len(data)
+        }}
+    }})
+
+@pytest.mark.asyncio
+async def test_update_interleaved_with_a_confirmation_is_applied(watcher):
+    ws = ScriptedSocket({
+        1: [json.dumps({"jsonrpc": "2.0", "id": 1, "result": 10})],
+        2: [_account_notification(10, _curve(50), 9), json.dumps({"jsonrpc": "2.0", "id": 2, "result": 11})],
+    })
+
+    assert await watcher._subscriptions.sync(ws, [CURVE, VAULT]) == [CURVE, VAULT]
+
+    assert watcher._subscriptions.by_subscription == {10: CURVE, 11: VAULT}
+    assert watcher.get_stats()["pools"][CURVE]["reserve"] == 50 and watcher.get_stats()["pools"][CURVE]["slot"] == 9
@@ -0,0 +1,55 @@
+import pytest
+import asyncio
+from utils.rate_limiter import HostLimiter, TokenBucket, PRIORITY_TRADE, PRIORITY_BACKGROUND
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_rate_and_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+
+@pytest.mark.asyncio
+async def test_trade_lane_is_admitted_before_background():
+    limiter = HostLimiter("test", rate=1000, burst=1000, max_concurrency=1)
+    order = []
+
+    async def request(name, priority):
+        async with limiter.slot(priority) as slot:
+            order.append(name)
+            await asyncio.sleep(0.01)
+            slot.record(200)
+
+    blocker = asyncio.create_task(request("first", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    background = asyncio.create_task(request("background", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    trade = asyncio.create_task(request("trade", PRIORITY_TRADE))
+    await asyncio.gather(blocker, background, trade)
+
+    assert order == ["first", "trade", "background"]
+
+@pytest.mark.asyncio
+async def test_429_halves_concurrency_and_success_recovers():
+    limiter = HostLimiter("test", rate=1000, burst=1000, max_concurrency=8)
+
+    async with limiter.slot() as slot:
+        slot.record(429)
+    assert limiter.get_stats()["concurrency_limit"] == 4
+    assert limiter.get_stats()["throttled_429"] == 1
+
+    for _ in range(10):
+        async with limiter.slot() as slot:
+            slot.record(200)
+    assert 4 < limiter.get_stats()["concurrency_limit"] <= 8
+    assert limiter.get_stats()["in_flight"] == 0
@@ -0,0 +1,26 @@
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from flask import Flask
+from routes.tokens import tokens_bp
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(tokens_bp)
+    token_table = MagicMock(select=MagicMock(return_value=[{"address": "mint1"}]))
+    app.services = {'data_fetcher': MagicMock(
+        get_token_table=AsyncMock(return_value=token_table),
+        get_token_snapshot=MagicMock(return_value={'age_seconds': 0})
+    )}
+    return app.test_client()
+
+@pytest.mark.parametrize("limit", ["abc", "-1", "2.5"])
+def test_invalid_limit_is_rejected(client, limit):
+    response = client.get(f'/api/tokens/?limit={limit}')
+    assert response.status_code == 400
+
+def test_valid_limit_is_passed_to_the_table(client):
+    response = client.get('/api/tokens/?limit=1')
+    assert response.status_code == 200
+    token_table = client.application.services['data_fetcher'].get_token_table.return_value
+    assert token_table.select.call_args.kwargs['limit'] == 1
@@ -0,0 +1,57 @@
+from utils.seen_set import RotatingSeenSet
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_duplicates_within_window_are_detected():
+    clock = FakeClock()
+    seen = RotatingSeenSet(window=10, clock=clock)
+
+    assert seen.check_and_add("sig") is False
+    clock.now = 9
+    assert seen.check_and_add("sig") is True
+    assert seen.first_seen("sig") == 0
+    assert seen.get_stats()["duplicates"] == 1
+
+def test_keys_expire_after_two_generations():
+    clock = FakeClock()
+    seen = RotatingSeenSet(window=10, clock=clock)
+    seen.check_and_add("sig")
+
+    clock.now = 15
+    seen.check_and_add("other")
+    assert "sig" in seen # Still held by the previous generation
+    clock.now = 25
+    seen.check_and_add("other2")
+    assert "sig" not in seen
+    assert seen.get_stats()["rotations"] == 2
+
+def test_idle_gap_forgets_both_generations():
+    clock = FakeClock()
+    seen = RotatingSeenSet(window=10, clock=clock)
+    seen.check_and_add("sig")
+
+    # Nothing arrives for more than two windows: "sig" must not be kept as the previous generation
+    clock.now = 30
+    assert seen.check_and_add("sig") is False
+    assert seen.first_seen("sig") == 30
+
+def test_size_bound_forces_rotation():
+    seen = RotatingSeenSet(window=1000, max_entries=2, clock=FakeClock())
+    for key in ("a", "b", "c", "d", "e"):
+        seen.check_and_add(key)
+    assert len(seen) <= 4
+
+def test_first_arrival_keeps_its_source_and_time():
+    clock = FakeClock()
+    seen = RotatingSeenSet(window=10, clock=clock)
+    clock.now = 3
+    assert seen.check_and_add("sig", "wss://a") is False
+    clock.now = 4
+    assert seen.check_and_add("sig", "wss://b") is True
+    assert seen.first_source("sig") == "wss://a"
+    assert seen.first_seen("sig") == 3
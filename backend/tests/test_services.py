@@ -1,16 +1,31 @@
 import pytest
 import json
+import asyncio
 from services.ai_analysis import AIAnalysisService
+from services import data_fetcher as data_fetcher_module
 from services.data_fetcher import DataFetcherService
+from utils.cache import TTLCache
+from utils.ohlcv_store import OHLCVSeries
 from unittest.mock import MagicMock, AsyncMock
 
 @pytest.fixture
 def ai_service():
     return AIAnalysisService()
 
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
 @pytest.fixture
-def data_fetcher():
-    return DataFetcherService()
+def data_fetcher(clock):
+    return DataFetcherService(cache=TTLCache(ttls={"token_list": 60}, clock=clock))
 
 def test_parse_llm_analysis_json(ai_service):
     json_content = """
@@ -45,15 +60,229 @@ def test_parse_llm_analysis_markdown_json(ai_service):
     assert result["sentiment"] == "Bearish"
     assert result["probability_score"] == 20
 
-def test_data_fetcher_cache(data_fetcher):
+def test_data_fetcher_cache(data_fetcher, clock):
     key = "test_key"
     data = {"test": "data"}
-    data_fetcher._save_to_cache(key, data)
+    data_fetcher.cache.set("token_list", key, data)
 
     # Cache hit
-    assert data_fetcher._get_from_cache(key) == data
+    assert data_fetcher.cache.get("token_list", key) == data
+
+    # Cache expiration (advance the monotonic clock past the namespace TTL)
+    clock.now += 100
+    assert data_fetcher.cache.get("token_list", key) is None
+
+@pytest.mark.asyncio
+async def test_get_token_by_address_coalesces_concurrent_misses(data_fetcher):
+    calls = 0
+
+    async def slow_overview(token_address):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"address": token_address, "price": 1.0}
+
+    data_fetcher._fetch_token_overview = slow_overview
+    data_fetcher._fetch_token_security = AsyncMock(return_value=None)
+    data_fetcher.get_ohlcv = AsyncMock(return_value=None)
+    # A deadline caller joins the same overview load
+    results = await asyncio.gather(*[data_fetcher.get_token_by_address("mint") for _ in range(4)],
+                                   data_fetcher.get_token_by_address("mint", deadline=1.0))
+
+    assert calls == 1
+    assert all(r["address"] == "mint" and r["price"] == 1.0 for r in results)
+    stats = data_fetcher.get_stats()["token_lookups"]
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+    assert stats["deadline_loads"] == 1
+
+def _stub_enrichment(data_fetcher, security_delay=0.0, history_delay=0.0):
+    async def overview(token_address):
+        await asyncio.sleep(0.05)
+        return {"address": token_address, "price": 2.0, "top_holder_percentage": 0, "dev_wallet_active": False}
+
+    async def security(token_address):
+        await asyncio.sleep(security_delay)
+        return {"top10HolderPercent": 12.5, "creatorHasFullControl": False, "ownerRenounced": True}
+
+    async def history(token_address, interval='1h', limit=24):
+        await asyncio.sleep(history_delay)
+        series = OHLCVSeries()
+        series.merge([1, 2], [1.0, 3.0], [1.0, 3.0], [1.0, 3.0], [1.0, 3.0], [10, 10])
+        return series
+
+    data_fetcher._fetch_token_overview = overview
+    data_fetcher._fetch_token_security = security
+    data_fetcher.get_ohlcv = history
+
+@pytest.mark.asyncio
+async def test_get_token_by_address_enriches_concurrently(data_fetcher):
+    _stub_enrichment(data_fetcher, security_delay=0.05, history_delay=0.05)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    token = await data_fetcher.get_token_by_address("mint")
+
+    assert loop.time() - started < 0.12 # Serial overview + security + history would take 0.15s
+    assert token["top_holder_percentage"] == 12.5
+    assert token["vwap_24h"] == 2.0
+    assert token["enrichment"]["complete"] is True
+    assert data_fetcher.cache.get("token_overview", "mint") is token
+
+@pytest.mark.asyncio
+async def test_get_token_by_address_deadline_returns_partial_token(data_fetcher):
+    _stub_enrichment(data_fetcher, security_delay=0.0, history_delay=1.0)
+
+    token = await data_fetcher.get_token_by_address("mint", deadline=0.1)
+
+    assert token["price"] == 2.0
+    assert token["top_holder_percentage"] == 12.5
+    assert token["vwap_24h"] is None
+    assert token["enrichment"]["complete"] is False
+    assert token["enrichment"]["fields"]["security"]["complete"] is True
+    assert token["enrichment"]["fields"]["vwap_24h"]["complete"] is False
+    # Partial tokens are not cached
+    assert data_fetcher.cache.get("token_overview", "mint") is None
+
+@pytest.mark.asyncio
+async def test_fetch_real_time_data_merges_without_slow_source(data_fetcher, clock, monkeypatch):
+    monkeypatch.setitem(data_fetcher_module.TOKEN_LIST_SOURCE_TIMEOUTS, "birdeye", 0.05)
+
+    async def dexscreener():
+        return [{"address": "a", "price": 1.0}]
+
+    async def birdeye():
+        await asyncio.sleep(1)
+        return [{"address": "b", "price": 2.0}]
+
+    data_fetcher._fetch_from_dexscreener = dexscreener
+    data_fetcher._fetch_from_birdeye = birdeye
+
+    tokens = await data_fetcher.fetch_real_time_data()
+    assert tokens == [{"address": "a", "price": 1.0}]
+    # Partial lists expire sooner than the token_list TTL
+    clock.now += data_fetcher_module.TOKEN_LIST_PARTIAL_TTL + 1
+    assert data_fetcher.cache.get("token_list", "real_time_data") is None
+
+@pytest.mark.asyncio
+async def test_token_snapshot_serves_last_good_list(data_fetcher):
+    responses = [([{"address": "a"}], False), ([], True)]
+
+    async def fetch_token_list():
+        return responses.pop(0)
+
+    data_fetcher._fetch_token_list = fetch_token_list
+    # The refresher is running but has no snapshot yet: callers get a real-time fetch, not []
+    data_fetcher.refresh_task = MagicMock()
+    data_fetcher.fetch_real_time_data = AsyncMock(return_value=[{"address": "live"}])
+    assert await data_fetcher.get_all_tokens() == [{"address": "live"}]
+
+    assert await data_fetcher.refresh_token_snapshot() is True
+    # An empty refresh keeps the last good snapshot
+    assert await data_fetcher.refresh_token_snapshot() is False
+
+    snapshot = data_fetcher.get_token_snapshot()
+    assert snapshot["tokens"] == [{"address": "a"}]
+    assert snapshot["age_seconds"] >= 0
+    assert await data_fetcher.get_all_tokens() == [{"address": "a"}]
+
+@pytest.mark.asyncio
+async def test_get_prices_batches_and_falls_back_to_jupiter(data_fetcher, monkeypatch):
+    monkeypatch.setattr(data_fetcher_module, "BIRDEYE_API_KEY", "key")
+    monkeypatch.setattr(data_fetcher_module, "PRICE_BATCH_SIZE", 2)
+    requested = []
+
+    async def request(method, url, **kwargs):
+        requested.append(url)
+        response = MagicMock()
+        if "multi_price" in url:
+            response.json.return_value = {"data": {"a": {"value": 1.5}, "b": None, "c": {"value": 3.0}}}
+        else:
+            response.json.return_value = {"data": {"b": {"price": "2.5"}}}
+        return response
+
+    data_fetcher._request_with_retry = request
+    prices = await data_fetcher.get_prices(["a", "b", "a", "c"])
+
+    assert prices == {"a": 1.5, "b": 2.5, "c": 3.0}
+    # Two Birdeye batches, plus one Jupiter call for the mint Birdeye could not price
+    assert sum("multi_price" in url for url in requested) == 2
+    assert sum("ids=b" in url for url in requested) == 1
+
+@pytest.mark.asyncio
+async def test_get_price_uses_price_cache_without_enrichment(data_fetcher, clock):
+    fetched = []
+
+    async def fetch_prices_batch(mints):
+        fetched.append(list(mints))
+        return {mint: 1.0 for mint in mints}
+
+    data_fetcher._fetch_prices_batch = fetch_prices_batch
+    data_fetcher.get_token_by_address = AsyncMock()
+
+    assert await data_fetcher.get_price("a") == 1.0
+    assert await data_fetcher.get_prices(["a", "b"]) == {"a": 1.0, "b": 1.0}
+    # Only the uncached mint is requested again
+    assert fetched == [["a"], ["b"]]
+    data_fetcher.get_token_by_address.assert_not_called()
+
+    clock.now += data_fetcher.cache.ttl_for("price") + 1
+    await data_fetcher.get_price("a")
+    assert fetched[-1] == ["a"]
+
+@pytest.mark.asyncio
+async def test_get_historical_prices_fetches_only_new_bars(data_fetcher, monkeypatch):
+    monkeypatch.setattr(data_fetcher_module, "BIRDEYE_API_KEY", "key")
+    monkeypatch.setattr(data_fetcher_module, "OHLCV_REFRESH_SECONDS", 0)
+    now = int(data_fetcher_module.datetime.now().timestamp())
+    bars = [{"unixTime": now - 7200, "o": 1, "h": 1, "l": 1, "c": 1.0, "v": 10},
+            {"unixTime": now - 3600, "o": 1, "h": 2, "l": 1, "c": 2.0, "v": 10}]
+    requested = []
+
+    async def request(method, url, **kwargs):
+        requested.append(url)
+        time_from = int(url.split("time_from=")[1].split("&")[0])
+        response = MagicMock()
+        response.json.return_value = {"success": True, "data": {"items": [bar for bar in bars if bar["unixTime"] >= time_from]}}
+        return response
+
+    data_fetcher._request_with_retry = request
+    history = await data_fetcher.get_historical_prices("mint", "1h", 24)
+    assert [point["price"] for point in history] == [1.0, 2.0]
+
+    # The last bar closes higher and a new bar arrives
+    bars[1] = dict(bars[1], c=3.0)
+    bars.append({"unixTime": now, "o": 3, "h": 3, "l": 3, "c": 3.0, "v": 20})
+    history = await data_fetcher.get_historical_prices("mint", "1h", 24)
+
+    assert [point["price"] for point in history] == [1.0, 3.0, 3.0]
+    assert f"time_from={now - 3600}&" in requested[-1]
+    assert data_fetcher.ohlcv_store.get_stats()["incremental_fetches"] == 1
+    assert (await data_fetcher.get_ohlcv("mint", "1h", 2)).vwap() == pytest.approx(3.0)
+
+@pytest.mark.asyncio
+async def test_token_table_filters_and_is_rebuilt_once_per_refresh(data_fetcher):
+    tokens = [
+        {"address": "a", "liquidity": 20000, "age_hours": 2, "volume_24h": 60000, "buy_sell_ratio": 1.5},
+        {"address": "b", "liquidity": 5000, "age_hours": 1, "volume_24h": 90000},
+        {"address": "c", "liquidity": 30000, "age_hours": 30, "volume_24h": 70000, "buy_sell_ratio": 0.5},
+    ]
+    responses = [(tokens, False), (tokens[:1], False)]
+
+    async def fetch_token_list():
+        return responses.pop(0)
+
+    data_fetcher._fetch_token_list = fetch_token_list
+    await data_fetcher.refresh_token_snapshot()
+
+    table = await data_fetcher.get_token_table()
+    criteria = {"liquidity": (10000, None), "age_hours": (None, 24), "buy_sell_ratio": (None, None)}
+    assert [token["address"] for token in table.select(criteria)] == ["a"]
+    assert table.select({"liquidity": (10000, None), "age_hours": (None, 24)}) is table.select(criteria)
+    assert [token["address"] for token in table.select({"buy_sell_ratio": (None, 1.0)})] == ["b", "c"]
+    assert table.get_stats()["query_hits"] == 2
+    assert await data_fetcher.get_token_table() is table
 
-    # Cache expiration (manual manipulation of timestamp)
-    val, ts = data_fetcher._cache[key]
-    data_fetcher._cache[key] = (val, ts - 100) # Expire it
-    assert data_fetcher._get_from_cache(key) is None
+    await data_fetcher.refresh_token_snapshot()
+    assert len(await data_fetcher.get_token_table()) == 1
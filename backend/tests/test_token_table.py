@@ -0,0 +1,44 @@
+import pytest
+from utils.token_table import TokenTable
+
+TOKENS = [
+    {"address": "a", "liquidity": 20000, "age_hours": 2, "volume_24h": 60000, "market_cap": 1e6},
+    {"address": "b", "liquidity": 5000, "age_hours": 1, "volume_24h": 90000, "market_cap": 2e5},
+    {"address": "c", "liquidity": 30000, "age_hours": 30, "volume_24h": 70000, "market_cap": 5e6},
+    {"address": "d", "liquidity": 12000, "age_hours": 5, "volume_24h": 10000},
+]
+
+def _addresses(tokens):
+    return [token["address"] for token in tokens]
+
+def test_range_rows_uses_inclusive_bounds():
+    table = TokenTable(TOKENS)
+    assert sorted(table.range_rows("liquidity", 12000, 20000).tolist()) == [0, 3]
+    assert sorted(table.range_rows("age_hours", None, 2).tolist()) == [0, 1]
+    with pytest.raises(ValueError):
+        table.range_rows("buy_sell_ratio", 0, 1)
+
+def test_top_n_with_range_filter():
+    table = TokenTable(TOKENS)
+    assert _addresses(table.top("volume_24h", 2, {"age_hours": (None, 6)})) == ["b", "a"]
+    assert _addresses(table.top("market_cap", 2, descending=False)) == ["d", "b"]
+    assert _addresses(table.select({"liquidity": (10000, None), "age_hours": (None, 24)})) == ["a", "d"]
+
+def test_select_matches_mask_for_mixed_criteria():
+    table = TokenTable(TOKENS)
+    criteria = {"liquidity": (6000, None), "volume_24h": (50000, None), "buy_sell_ratio": (None, 1)}
+    expected = [token for token, keep in zip(TOKENS, table.mask(criteria).tolist()) if keep]
+    assert table.select(criteria) == expected
+    with pytest.raises(ValueError):
+        table.select({}, sort="price")
+
+def test_descending_sort_keeps_ties_in_snapshot_order_and_coerces_junk():
+    tokens = [
+        {"address": "a", "liquidity": 100, "volume_24h": "n/a"},
+        {"address": "b", "liquidity": 300, "volume_24h": "42.5"},
+        {"address": "c", "liquidity": 100, "volume_24h": None},
+        {"address": "d", "liquidity": 100, "volume_24h": {"h24": 1}},
+    ]
+    table = TokenTable(tokens)
+    assert _addresses(table.top("liquidity", 4)) == ["b", "a", "c", "d"]
+    assert table.columns["volume_24h"].tolist() == [0.0, 42.5, 0.0, 0.0]
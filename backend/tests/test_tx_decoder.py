@@ -0,0 +1,36 @@
+import base64
+from solders.hash import Hash
+from solders.instruction import AccountMeta, Instruction
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
+from utils.tx_decoder import (decode_launch, decode_launch_from_bytes, PUMP_CREATE_DISCRIMINATOR,
+                              TOKEN_PROGRAM_ID, WSOL_MINT)
+from utils.log_classifier import PUMP_FUN_PROGRAM_ID, RAYDIUM_LIQUIDITY_POOL_V4_ID, PUMP_CREATE, RAYDIUM_INIT, MINT_INIT
+
+PAYER = Pubkey.new_unique()
+MINT = Pubkey.new_unique()
+
+def _transaction(program_id: str, data: bytes, accounts) -> VersionedTransaction:
+    instruction = Instruction(Pubkey.from_string(program_id), data, [AccountMeta(key, False, True) for key in accounts])
+    message = Message.new_with_blockhash([instruction], PAYER, Hash.default())
+    return VersionedTransaction.populate(message, [Signature.default()])
+
+def test_decodes_spl_initialize_mint2():
+    launch = decode_launch(_transaction(TOKEN_PROGRAM_ID, bytes([20, 6]), [MINT]))
+    assert (launch.mint, launch.deployer, launch.kind) == (str(MINT), str(PAYER), MINT_INIT)
+
+def test_decodes_pump_create_from_base64():
+    transaction = _transaction(PUMP_FUN_PROGRAM_ID, PUMP_CREATE_DISCRIMINATOR + b"\x04name", [MINT, Pubkey.new_unique()])
+    launch = decode_launch_from_bytes(base64.b64encode(bytes(transaction)).decode())
+    assert (launch.mint, launch.kind) == (str(MINT), PUMP_CREATE)
+
+def test_decodes_raydium_initialize2_skipping_wsol():
+    accounts = [Pubkey.new_unique() for _ in range(8)] + [Pubkey.from_string(WSOL_MINT), MINT] + [Pubkey.new_unique() for _ in range(8)]
+    launch = decode_launch(_transaction(RAYDIUM_LIQUIDITY_POOL_V4_ID, bytes([1, 254]), accounts))
+    assert (launch.mint, launch.kind) == (str(MINT), RAYDIUM_INIT)
+
+def test_ignores_other_instructions():
+    assert decode_launch(_transaction(TOKEN_PROGRAM_ID, bytes([3]), [MINT])) is None
+    assert decode_launch(_transaction(PUMP_FUN_PROGRAM_ID, b"\x00" * 8, [MINT])) is None